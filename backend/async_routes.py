@@ -0,0 +1,105 @@
+"""
+Async routes for DB_MODE=async.
+
+The hot, DB-bound read paths (topic list, keyset page and detail) have real
+`async def` handlers below. They await the same statements the sync handlers
+execute (routers.topics builds them as select()s) on the AsyncSession, so
+while the database works the event loop serves other requests.
+
+Every other route is mounted unchanged. Its sync handler keeps running in
+FastAPI's threadpool on the sync engine, so CPU-bound work (in-memory index
+builds, version diffs, TF-IDF rescoring, grade statistics) never blocks the
+event loop, and the threading locks that guard the in-memory indexes keep
+excluding concurrent requests.
+"""
+import inspect
+
+from fastapi import APIRouter, Depends
+from fastapi.routing import APIRoute
+
+import conditional
+import exam_stats
+import models
+from database_async import get_async_db
+from routers import topics
+
+# sync endpoint -> async replacement with the same parameters
+ASYNC_ENDPOINTS = {}
+
+
+def async_variant(sync_endpoint):
+    """Register an async handler that takes the sync endpoint's parameters, with an AsyncSession as db"""
+    def decorator(async_endpoint):
+        signature = inspect.signature(sync_endpoint)
+        async_endpoint.__signature__ = signature.replace(parameters=[
+            param.replace(default=Depends(get_async_db)) if name == "db" else param
+            for name, param in signature.parameters.items()
+        ])
+        ASYNC_ENDPOINTS[sync_endpoint] = async_endpoint
+        return async_endpoint
+    return decorator
+
+
+async def _category_scope(db, category, category_id):
+    if not category and category_id is None:
+        return None
+    ids = [] if category_id is not None else (await db.execute(topics.category_ids_by_name(category))).scalars().all()
+    return topics.category_scope(category, category_id, ids)
+
+
+@async_variant(topics.get_topics)
+async def get_topics(request, response, skip, limit, category, category_id, sort, min_frequency, db):
+    scope = await _category_scope(db, category, category_id)
+    validator = (await db.execute(topics.topic_list_validator(scope))).one()
+    exam_version = tuple((await db.execute(exam_stats.version_select())).one())
+    etag = topics.topic_list_etag(validator, exam_version, skip, limit, sort, min_frequency)
+    not_modified = conditional.check(request, response, etag)
+    if not_modified:
+        return not_modified
+    
+    return (await db.execute(topics.topic_list_select(scope, skip, limit, sort, min_frequency))).scalars().all()
+
+
+@async_variant(topics.get_topic_page)
+async def get_topic_page(cursor, limit, category, category_id, order, db):
+    scope = await _category_scope(db, category, category_id)
+    rows = (await db.execute(topics.topic_page_select(scope, cursor, limit, order))).scalars().all()
+    return topics.topic_page(rows, limit, order)
+
+
+@async_variant(topics.get_topic)
+async def get_topic(topic_id, request, response, db):
+    etag = topics.topic_etag(topic_id, (await db.execute(topics.topic_validator(topic_id))).first())
+    not_modified = conditional.check(request, response, etag)
+    if not_modified:
+        return not_modified
+    
+    stmt = topics.select_topics().where(models.Topic.id == topic_id)
+    return (await db.execute(stmt)).scalars().first()
+
+
+def asyncify_router(router: APIRouter) -> APIRouter:
+    """Copy of a router with the registered async handlers swapped in"""
+    async_router = APIRouter()
+    for route in router.routes:
+        if not isinstance(route, APIRoute) or route.endpoint not in ASYNC_ENDPOINTS:
+            async_router.routes.append(route)
+            continue
+
+        async_router.add_api_route(
+            route.path,
+            ASYNC_ENDPOINTS[route.endpoint],
+            response_model=route.response_model,
+            status_code=route.status_code,
+            tags=route.tags,
+            dependencies=route.dependencies,
+            summary=route.summary,
+            description=route.description,
+            response_description=route.response_description,
+            responses=route.responses,
+            methods=route.methods,
+            name=route.name,
+            include_in_schema=route.include_in_schema,
+            response_class=route.response_class,
+        )
+    return async_router
@@ -0,0 +1,199 @@
+"""
+Prefix / choseong (초성) trie for 두음 autocomplete.
+
+Mnemonics, their full text and keywords are inserted twice: once by their
+normalized text and once by their Hangul initial consonants, so both "비복변"
+and "ㅂㅂㅂ" find "비복변무순복". Every trie node keeps its best TOP_K
+suggestions precomputed, which makes a lookup a walk down len(query) nodes.
+Like search_index, the trie is a per-process LiveIndex, built in the background
+at startup and maintained by the topic write paths.
+"""
+import bisect
+import re
+
+from sqlalchemy.orm import Session, selectinload
+
+import models
+from live_index import LiveIndex
+
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+CHOSEONG_SET = set(CHOSEONG)
+HANGUL_BASE = 0xAC00
+HANGUL_END = 0xD7A3
+TOP_K = 20
+MAX_KEY_LENGTH = 40
+
+_WORD_SPLIT = re.compile(r"[\s,·/()\[\]]+")
+
+
+def to_choseong(text):
+    """'비복변무순복' -> 'ㅂㅂㅂㅁㅅㅂ' (non-Hangul characters are kept as-is)"""
+    chars = []
+    for ch in text:
+        code = ord(ch)
+        if HANGUL_BASE <= code <= HANGUL_END:
+            chars.append(CHOSEONG[(code - HANGUL_BASE) // 588])
+        else:
+            chars.append(ch)
+    return "".join(chars)
+
+
+def has_choseong(text):
+    return any(ch in CHOSEONG_SET for ch in text)
+
+
+def normalize_key(text):
+    return "".join((text or "").lower().split())[:MAX_KEY_LENGTH]
+
+
+class _Node:
+    __slots__ = ("children", "terminals", "top")
+
+    def __init__(self):
+        self.children = {}
+        self.terminals = []
+        self.top = []
+
+
+class _Trie:
+    def __init__(self):
+        self.root = _Node()
+
+    def insert(self, key, item):
+        node = self.root
+        for ch in key:
+            node = node.children.setdefault(ch, _Node())
+            self._offer(node, item)
+        node.terminals.append(item)
+
+    def remove(self, key, item):
+        path = [self.root]
+        for ch in key:
+            node = path[-1].children.get(ch)
+            if node is None:
+                return
+            path.append(node)
+        if item in path[-1].terminals:
+            path[-1].terminals.remove(item)
+
+        # 말단부터 올라오며 top 목록 재계산, 빈 노드 정리
+        for depth in range(len(key), 0, -1):
+            node = path[depth]
+            if not node.terminals and not node.children:
+                del path[depth - 1].children[key[depth - 1]]
+            elif item in node.top:
+                node.top = self._merge_top(node)
+
+    def lookup(self, prefix):
+        node = self.root
+        for ch in prefix:
+            node = node.children.get(ch)
+            if node is None:
+                return []
+        return node.top
+
+    @staticmethod
+    def _offer(node, item):
+        if item in node.top:
+            return
+        if len(node.top) < TOP_K or item < node.top[-1]:
+            bisect.insort(node.top, item)
+            del node.top[TOP_K:]
+
+    @staticmethod
+    def _merge_top(node):
+        items = set(node.terminals)
+        for child in node.children.values():
+            items.update(child.top)
+        return sorted(items)[:TOP_K]
+
+
+class AutocompleteIndex(LiveIndex):
+    KIND_ORDER = {"mnemonic": 0, "keyword": 1, "full_text": 2}
+
+    def __init__(self):
+        super().__init__()
+        self._text = _Trie()
+        self._choseong = _Trie()
+        # topic_id -> [(trie, key, item)] for removal
+        self._entries = {}
+
+    def _document(self, topic):
+        return topic.title, list(self._sources(topic))
+
+    def _load(self, db: Session):
+        topics = db.query(models.Topic).options(
+            selectinload(models.Topic.keywords),
+            selectinload(models.Topic.mnemonics),
+        ).yield_per(500)
+        for topic in topics:
+            self._add(topic.id, *self._document(topic))
+
+    def _replace(self, topic_id, document):
+        self._remove(topic_id)
+        if document is not None:
+            self._add(topic_id, *document)
+
+    def _reset(self):
+        self._text = _Trie()
+        self._choseong = _Trie()
+        self._entries.clear()
+
+    def suggest(self, q, limit=10):
+        query = normalize_key(q)
+        if not query:
+            return []
+        if has_choseong(query):
+            items = self._choseong.lookup(to_choseong(query))
+        else:
+            items = self._text.lookup(query)
+
+        suggestions = []
+        seen = set()
+        for _, _, text, kind, topic_id, topic_title in items:
+            if (text, topic_id) in seen:
+                continue
+            seen.add((text, topic_id))
+            suggestions.append({
+                "text": text,
+                "kind": kind,
+                "topic_id": topic_id,
+                "topic_title": topic_title,
+            })
+            if len(suggestions) >= limit:
+                break
+        return suggestions
+
+    def _sources(self, topic):
+        for mnemonic in topic.mnemonics:
+            if mnemonic.mnemonic:
+                yield "mnemonic", mnemonic.mnemonic, [mnemonic.mnemonic]
+            if mnemonic.full_text:
+                words = [w for w in _WORD_SPLIT.split(mnemonic.full_text) if w]
+                yield "full_text", mnemonic.full_text, [mnemonic.full_text] + words
+        for keyword in topic.keywords:
+            if keyword.keyword:
+                yield "keyword", keyword.keyword, [keyword.keyword]
+
+    def _add(self, topic_id, title, sources):
+        entries = []
+        for kind, text, keys in sources:
+            display = text.strip()
+            # 정렬 기준: 종류 -> 길이 -> 사전순
+            item = (
+                self.KIND_ORDER[kind], len(display), display, kind, topic_id, title
+            )
+            for key in dict.fromkeys(normalize_key(k) for k in keys):
+                if not key:
+                    continue
+                for trie, trie_key in ((self._text, key), (self._choseong, to_choseong(key))):
+                    trie.insert(trie_key, item)
+                    entries.append((trie, trie_key, item))
+        self._entries[topic_id] = entries
+
+    def _remove(self, topic_id):
+        for trie, key, item in self._entries.pop(topic_id, []):
+            trie.remove(key, item)
+
+
+autocomplete_index = AutocompleteIndex()
@@ -0,0 +1,114 @@
+"""
+Benchmark concurrent-request throughput of DB_MODE=sync vs DB_MODE=async
+
+Usage:
+    python bench_db_modes.py [--requests 2000] [--concurrency 32] [--path /api/topics/?limit=20]
+
+Uses DATABASE_URL when set (e.g. Supabase, where network latency is what
+async mode helps with); otherwise a temporary SQLite file seeded with topics.
+Each mode runs in its own interpreter because DB_MODE is read at import time.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def run_worker(args):
+    import httpx
+
+    import main
+    from database_config import SessionLocal, init_db
+    import models
+
+    init_db()
+    db = SessionLocal()
+    if args.seed and db.query(models.Topic).count() == 0:
+        db.add_all(
+            models.Topic(title=f"토픽 {i}", content="벤치마크 본문 " * 50)
+            for i in range(args.seed)
+        )
+        db.commit()
+    db.close()
+
+    async def bench():
+        transport = httpx.ASGITransport(app=main.app)
+        latencies = []
+        failures = []
+        semaphore = asyncio.Semaphore(args.concurrency)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            async def one():
+                async with semaphore:
+                    start = time.perf_counter()
+                    try:
+                        response = await client.get(args.path)
+                        response.raise_for_status()
+                    except Exception as e:  # 예: 풀 타임아웃
+                        failures.append(type(e).__name__)
+                        return
+                    latencies.append((time.perf_counter() - start) * 1000)
+
+            await one()  # warm-up
+            latencies.clear()
+            start = time.perf_counter()
+            await asyncio.gather(*(one() for _ in range(args.requests)))
+            elapsed = time.perf_counter() - start
+
+        latencies.sort()
+        return {
+            "mode": os.environ["DB_MODE"],
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "failures": len(failures),
+            "req_per_sec": round(len(latencies) / elapsed, 1),
+            "p50_ms": round(statistics.median(latencies), 2) if latencies else None,
+            "p95_ms": round(latencies[int(0.95 * (len(latencies) - 1))], 2) if latencies else None,
+        }
+
+    print(json.dumps(asyncio.run(bench())))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--path", default="/api/topics/?limit=20")
+    parser.add_argument("--seed", type=int, default=500, help="topics to create in an empty database")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args)
+        return
+
+    env = dict(os.environ)
+    tmpdir = None
+    if not env.get("DATABASE_URL"):
+        tmpdir = tempfile.mkdtemp()
+        env["DATABASE_URL"] = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+
+    results = []
+    for mode in ("sync", "async"):
+        env["DB_MODE"] = mode
+        output = subprocess.run(
+            [sys.executable, __file__, "--worker"] + sys.argv[1:],
+            env=env, capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    print(f"{'mode':<6} {'req/s':>10} {'p50 ms':>10} {'p95 ms':>10} {'failed':>8}")
+    for result in results:
+        print(
+            f"{result['mode']:<6} {result['req_per_sec']:>10} {result['p50_ms']!s:>10} "
+            f"{result['p95_ms']!s:>10} {result['failures']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Benchmark the related-topic index: full rebuild, lookups and incremental updates
+
+Usage:
+    python bench_related.py [--topics 10000] [--queries 1000] [--updates 200]
+
+Seeds a temporary SQLite database with synthetic topics (Zipf-distributed
+vocabulary, like real subnotes where a few terms are everywhere) through
+topic_import, then times related_index.ensure_built, related() lookups, the
+GET /api/topics/{id}/related endpoint and index_topic() after an edit. Recall
+compares the precomputed lists with an exhaustive cosine scan for a sample of
+topics (synthetic text has no real clusters, so this is a pessimistic bound).
+"""
+import argparse
+import heapq
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+
+def synthetic_topics(count, vocabulary_size=4000, words=120, seed=7):
+    rng = random.Random(seed)
+    syllables = "가나다라마바사아자차카타파하보안네트워크데이터관리시스템구조설계분석품질"
+    vocabulary = [
+        "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))) for _ in range(vocabulary_size)
+    ]
+    weights = [1 / (rank + 1) for rank in range(vocabulary_size)]
+    topics = []
+    for i in range(count):
+        body = rng.choices(vocabulary, weights, k=words)
+        topics.append({
+            "title": f"{body[0]} {body[1]} {i}",
+            "category": None,
+            "category_id": None,
+            "content": " ".join(body),
+            "keywords": rng.sample(body, 4),
+            "mnemonics": [],
+        })
+    return topics
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return (
+        round(statistics.median(samples), 3),
+        round(samples[int(0.99 * (len(samples) - 1))], 3),
+    )
+
+
+def exact_neighbours(index, topic_id, k):
+    """Exhaustive cosine over every topic sharing a term (what _score approximates)"""
+    vector = index._vectors[topic_id]
+    scores = {}
+    for term, weight in vector.items():
+        for other_id, other_weight in index._postings[term].items():
+            scores[other_id] = scores.get(other_id, 0.0) + weight * other_weight
+    scores.pop(topic_id, None)
+    return set(heapq.nlargest(k, scores, key=scores.get))
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--topics", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--updates", type=int, default=200)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp()
+    os.environ.setdefault("SLOW_QUERY_MS", "60000")  # 시드용 대량 INSERT 로그 생략
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    from fastapi.testclient import TestClient
+
+    import main as app_main
+    import topic_import
+    from database_config import SessionLocal, init_db
+    from related_index import related_index
+    from routers.topics import load_topic
+
+    init_db()
+    db = SessionLocal()
+    ids = topic_import.insert_topics(db, synthetic_topics(args.topics))
+    db.commit()
+
+    _, build_ms = timed(lambda: related_index.ensure_built(db))
+    rng = random.Random(1)
+    lookups = [timed(lambda: related_index.related(rng.choice(ids)))[1] for _ in range(args.queries)]
+    sample = rng.sample(ids, min(200, len(ids)))
+    found = sum(
+        len({other_id for other_id, _ in related_index.related(topic_id)} & exact_neighbours(related_index, topic_id, 10))
+        for topic_id in sample
+    )
+
+    client = TestClient(app_main.app)
+    endpoint = [
+        timed(lambda: client.get(f"/api/topics/{rng.choice(ids)}/related?limit=10").raise_for_status())[1]
+        for _ in range(min(args.queries, 200))
+    ]
+
+    updates = []
+    for topic_id in rng.sample(ids, args.updates):
+        topic = load_topic(db, topic_id)
+        topic.content = (topic.content or "") + " 추가 내용 보안 관리"
+        updates.append(timed(lambda: related_index.index_topic(topic))[1])
+        db.rollback()
+    db.close()
+
+    print(f"topics: {args.topics}")
+    print(f"rebuild: {build_ms / 1000:.2f} s")
+    print("lookup ms (p50, p99): %s, %s" % percentiles(lookups))
+    print(f"recall@10 vs exhaustive scan: {found / (10 * len(sample)):.2f}")
+    print("endpoint ms (p50, p99): %s, %s" % percentiles(endpoint))
+    print("incremental update ms (p50, p99): %s, %s" % percentiles(updates))
+
+
+if __name__ == "__main__":
+    main()
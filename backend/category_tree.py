@@ -0,0 +1,89 @@
+"""
+Materialized-path helpers for the category hierarchy.
+
+Each category stores the ids from the root down to itself as "/1/4/9/", so a
+whole subtree is a single prefix query on the indexed path column and the tree
+can be assembled in one pass over the rows.
+"""
+from sqlalchemy import String, and_, func, literal, select, update
+from sqlalchemy.orm import Session
+
+import models
+
+
+def child_path(parent_path, category_id):
+    return f"{parent_path or '/'}{category_id}/"
+
+
+def subtree_clause(db: Session, path):
+    """WHERE clause matching the category at `path` and all its descendants"""
+    column = models.Category.path
+    if db.get_bind().dialect.name == "postgresql":
+        # text_pattern_ops 인덱스를 타는 접두사 검색 (로케일 정렬과 무관)
+        return column.like(path + "%")
+    # '/'(0x2F) 다음 문자는 '0'(0x30) -> [path, path[:-1] + '0') 범위
+    return and_(column >= path, column < path[:-1] + "0")
+
+
+def subtree_ids(db: Session, category_id):
+    """Ids of a category and all its descendants, or None if it does not exist"""
+    path = db.execute(
+        select(models.Category.path).where(models.Category.id == category_id)
+    ).scalar()
+    if path is None:
+        return None
+    return list(db.execute(
+        select(models.Category.id).where(subtree_clause(db, path))
+    ).scalars())
+
+
+def move_subtree(db: Session, old_path, new_path):
+    """Rewrite the path prefix of a category and all its descendants in one UPDATE"""
+    db.execute(
+        update(models.Category)
+        .where(subtree_clause(db, old_path))
+        .values(path=literal(new_path, String).concat(func.substr(models.Category.path, len(old_path) + 1)))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def build_tree(categories):
+    """Nest categories (ordered as given) in a single pass"""
+    nodes = {
+        cat.id: {
+            "id": cat.id,
+            "name": cat.name,
+            "description": cat.description,
+            "parent_id": cat.parent_id,
+            "children": [],
+        }
+        for cat in categories
+    }
+    tree = []
+    for cat in categories:
+        if cat.parent_id is None:
+            tree.append(nodes[cat.id])
+        elif cat.parent_id in nodes:
+            nodes[cat.parent_id]["children"].append(nodes[cat.id])
+    return tree
+
+
+def backfill_paths(conn):
+    """Fill path for rows created before the column existed"""
+    rows = conn.execute(select(models.Category.id, models.Category.parent_id, models.Category.path)).all()
+    if all(row.path for row in rows):
+        return
+    parents = {row.id: row.parent_id for row in rows}
+
+    def path_of(category_id, seen=()):
+        parent_id = parents.get(category_id)
+        if parent_id is None or parent_id not in parents or parent_id in seen:
+            return child_path(None, category_id)
+        return child_path(path_of(parent_id, seen + (category_id,)), category_id)
+
+    for row in rows:
+        conn.execute(
+            update(models.Category).where(models.Category.id == row.id).values(path=path_of(row.id))
+        )
+    print(f"Migration: backfilled path for {len(rows)} categories")
+
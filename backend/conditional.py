@@ -0,0 +1,77 @@
+"""
+Conditional GET (ETag / Last-Modified -> 304 Not Modified).
+
+Read handlers derive a validator from a cheap query (updated_at, counts, max
+ids) or from an already cached value before loading full rows. When the
+client's If-None-Match / If-Modified-Since still matches, check() returns a
+304 response and the body is never loaded or serialized. Responses carry
+Cache-Control: no-cache so browsers keep the copy but always revalidate.
+"""
+import hashlib
+import json
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    """Weak ETag over any JSON-serializable parts (the compressed body differs per encoding)"""
+    data = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False).encode("utf-8")
+    return f'W/"{hashlib.sha1(data).hexdigest()[:20]}"'
+
+
+def _http_date(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)  # DB 시각은 UTC(naive)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+
+def _not_modified_since(header: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    # HTTP 날짜는 초 단위
+    return last_modified.replace(microsecond=0) <= since
+
+
+def check(
+    request: Request,
+    response: Response,
+    etag: str,
+    last_modified: Optional[datetime] = None
+) -> Optional[Response]:
+    """Return a 304 response if the client copy is current, else set the validators on `response`"""
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified is not None:
+        headers["Last-Modified"] = _http_date(last_modified)
+
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    # If-None-Match가 있으면 If-Modified-Since는 무시 (RFC 9110)
+    if if_none_match is not None:
+        fresh = _etag_matches(if_none_match, etag)
+    else:
+        fresh = (
+            if_modified_since is not None
+            and last_modified is not None
+            and _not_modified_since(if_modified_since, last_modified)
+        )
+    if fresh:
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,50 @@
+"""
+Async database engine (asyncpg for PostgreSQL, aiosqlite for SQLite).
+
+Selected with DB_MODE=async. The sync engine from database_config stays
+available for init_db, migrations and streaming exports.
+"""
+import os
+
+from dotenv import load_dotenv
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from pool_config import engine_options, pool_metrics
+
+load_dotenv()
+
+
+def to_async_url(url):
+    """postgresql:// -> postgresql+asyncpg://, sqlite:// -> sqlite+aiosqlite://"""
+    url = make_url(url.replace("postgres://", "postgresql://", 1))
+    backend = url.get_backend_name()
+    if backend == "postgresql":
+        url = url.set(drivername="postgresql+asyncpg")
+        # asyncpg는 sslmode 대신 ssl 파라미터 사용
+        if "sslmode" in url.query:
+            url = url.update_query_dict({"ssl": url.query["sslmode"]}).difference_update_query(["sslmode"])
+    elif backend == "sqlite":
+        url = url.set(drivername="sqlite+aiosqlite")
+    else:
+        raise ValueError(f"No async driver configured for {url.drivername}")
+    return url
+
+
+DATABASE_URL = os.getenv("DATABASE_URL") or os.getenv("SUPABASE_DB_URL") or "sqlite:///./north_pe.db"
+ASYNC_DATABASE_URL = to_async_url(DATABASE_URL)
+
+if ASYNC_DATABASE_URL.get_backend_name() == "sqlite":
+    async_engine = create_async_engine(ASYNC_DATABASE_URL)
+else:
+    _, _pool_options = engine_options(ASYNC_DATABASE_URL, is_async=True)
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, **_pool_options)
+    pool_metrics.register("async", async_engine.sync_engine)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def get_async_db():
+    """Dependency to get an async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -19,4 +19,10 @@ else:
         """Dummy test connection for SQLite"""
         return True
 
-__all__ = ['get_db', 'engine', 'SessionLocal', 'Base', 'init_db', 'test_connection']
\ No newline at end of file
+# sync: 스레드풀에서 동작하는 기존 라우터, async: AsyncSession 기반 라우터
+DB_MODE = os.getenv("DB_MODE", "sync").lower()
+if DB_MODE == "async":
+    from database_async import async_engine, AsyncSessionLocal, get_async_db
+    print("Database mode: async")
+
+__all__ = ['get_db', 'engine', 'SessionLocal', 'Base', 'init_db', 'test_connection', 'DB_MODE']
\ No newline at end of file
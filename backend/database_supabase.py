@@ -3,9 +3,10 @@ Supabase database connection module
 """
 import os
 from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
+from models import Base
+from pool_config import engine_options, pool_metrics
 
 # Load environment variables
 load_dotenv()
@@ -21,18 +22,19 @@ if not DATABASE_URL:
         raise ValueError("No database URL found. Please set DATABASE_URL or SUPABASE_DB_URL in .env file")
 
 # Create engine for PostgreSQL
+# Pool mode (direct / session / transaction pooler) and sizes come from pool_config;
+# defaults keep pool_size=2, max_overflow=5 for the Supabase free tier
+POOL_MODE, _pool_options = engine_options(DATABASE_URL)
 engine = create_engine(
     DATABASE_URL,
-    pool_pre_ping=True,  # Verify connections before using them
-    pool_size=2,         # Number of connections to maintain in pool (reduced for Supabase free tier)
-    max_overflow=5,      # Maximum overflow connections (reduced for Supabase free tier)
-    echo=False           # Set to True for SQL query logging
+    echo=False,          # Set to True for SQL query logging
+    **_pool_options
 )
+pool_metrics.register("sync", engine)
+print(f"Database pool mode: {POOL_MODE}")
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-Base = declarative_base()
-
 def get_db():
     """Dependency to get database session"""
     db = SessionLocal()
@@ -47,12 +49,17 @@ def init_db():
         # Import all models to ensure they're registered
         from models import (
             Topic, TopicVersion, Keyword, Mnemonic,
-            ExamHistory, Assignment, Submission,
+            ExamHistory, TopicExamStats, CategoryExamStats, Assignment, Submission,
             Category, Template, WeeklyExam, ExamQuestion
         )
 
+        from migrations import upgrade_schema
+        from search_backend import install_search_backend
+
         # Create all tables
         Base.metadata.create_all(bind=engine)
+        upgrade_schema(engine)
+        install_search_backend(engine)
         print("Database initialized successfully!")
         return True
     except Exception as e:
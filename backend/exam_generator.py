@@ -0,0 +1,135 @@
+"""
+Draft weekly mock exams (주간 모의고사 자동 출제) for a category subtree.
+
+Each category has a precomputed candidate pool - [topic_id, title, weight] for
+its own topics - kept in read_cache under POOL_NAMESPACE, so generating an exam
+reads no topics or exam history: it merges the pools of the subtree, drops
+topics the current cohort used in the last few weeks and draws without replacement with the
+Efraimidis-Spirakis method (key = random() ** (1 / weight), take the largest),
+which is one pass over the candidates.
+
+A topic's weight grows with how often it was asked (topic_exam_stats) and with
+how recent its last round is; never-asked topics keep BASE_WEIGHT so new
+material still shows up. The heaviest picks become the session 2 essays, the
+rest the session 1 short answers. Topic writes and exam history writes
+invalidate the pools (invalidate_pools).
+
+Week numbers restart with every cohort (기수) and cloned exams keep their
+topic_id, so "recently used" is scoped by created_at as well: only exams
+created within the last `avoid_weeks` weeks belong to the current cohort.
+"""
+import heapq
+import math
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import func
+
+import category_tree
+import models
+from read_cache import read_cache
+from weekly_exam_writer import SESSION_QUESTIONS
+
+POOL_NAMESPACE = "exam_pools"
+BASE_WEIGHT = 0.5
+RECENCY_ROUNDS = 10  # 이 회차 수만큼 지나면 최근성 가중치가 절반
+DEFAULT_AVOID_WEEKS = 4
+
+SHORT_ANSWER_TEMPLATE = "{title}"
+ESSAY_TEMPLATE = "{title}에 대하여 설명하시오."
+
+
+class NotEnoughTopics(Exception):
+    pass
+
+
+def topic_weight(exam_count, last_round_number, latest_round):
+    if not exam_count:
+        return BASE_WEIGHT
+    recency = 0.0
+    if last_round_number is not None and latest_round is not None:
+        recency = RECENCY_ROUNDS / (RECENCY_ROUNDS + max(latest_round - last_round_number, 0))
+    return BASE_WEIGHT + exam_count * (1 + recency)
+
+
+def invalidate_pools():
+    """Drop every cached pool; call after topic or exam history writes"""
+    read_cache.invalidate(POOL_NAMESPACE)
+
+
+def category_pool(db, category_id):
+    """Cached [[topic_id, title, weight]] of the topics directly in a category"""
+    def load():
+        latest_round = db.query(func.max(models.TopicExamStats.last_round_number)).scalar()
+        rows = db.query(
+            models.Topic.id, models.Topic.title,
+            models.TopicExamStats.exam_count, models.TopicExamStats.last_round_number
+        ).outerjoin(
+            models.TopicExamStats, models.TopicExamStats.topic_id == models.Topic.id
+        ).filter(models.Topic.category_id == category_id).all()
+        return [
+            [row.id, row.title, topic_weight(row.exam_count, row.last_round_number, latest_round)]
+            for row in rows
+        ]
+    return read_cache.get_or_load(POOL_NAMESPACE, f"category:{category_id}", load)
+
+
+def recent_topic_ids(db, week_number, avoid_weeks):
+    """Topics used by this cohort's exams of the last `avoid_weeks` weeks, the drafted week included"""
+    if avoid_weeks <= 0:
+        return set()
+    created_after = datetime.utcnow() - timedelta(weeks=avoid_weeks)
+    rows = db.query(models.ExamQuestion.topic_id).join(
+        models.WeeklyExam, models.WeeklyExam.id == models.ExamQuestion.weekly_exam_id
+    ).filter(
+        models.WeeklyExam.week_number.between(week_number - avoid_weeks + 1, week_number),
+        models.WeeklyExam.created_at >= created_after,
+        models.ExamQuestion.topic_id.isnot(None)
+    ).distinct()
+    return {row.topic_id for row in rows}
+
+
+def _draw(candidates, count, rng):
+    """Weighted sample without replacement, heaviest first"""
+    keyed = heapq.nlargest(
+        count, candidates, key=lambda candidate: math.log(rng.random() or 1e-12) / candidate[2]
+    )
+    return sorted(keyed, key=lambda candidate: -candidate[2])
+
+
+def generate_questions(db, category_id, week_number, avoid_weeks=DEFAULT_AVOID_WEEKS, seed=None):
+    """Question dicts for weekly_exam_writer.insert_exams; raises NotEnoughTopics"""
+    category_ids = category_tree.subtree_ids(db, category_id) or []
+    candidates = {}
+    for subtree_category_id in category_ids:
+        for candidate in category_pool(db, subtree_category_id):
+            candidates[candidate[0]] = candidate
+
+    needed = sum(SESSION_QUESTIONS.values())
+    if len(candidates) < needed:
+        raise NotEnoughTopics(f"{needed} topics are needed, the category has {len(candidates)}")
+
+    rng = random.Random(seed)
+    recent = recent_topic_ids(db, week_number, avoid_weeks)
+    fresh = [candidate for topic_id, candidate in candidates.items() if topic_id not in recent]
+    picked = _draw(fresh, needed, rng)
+    if len(picked) < needed:
+        # 최근 출제 토픽을 빼면 부족할 때만 다시 허용
+        reused = [candidate for topic_id, candidate in candidates.items() if topic_id in recent]
+        picked += _draw(reused, needed - len(picked), rng)
+
+    essays, short_answers = picked[:SESSION_QUESTIONS[2]], picked[SESSION_QUESTIONS[2]:]
+    questions = []
+    for session, question_type, template, chosen in (
+        (1, models.QuestionType.SHORT_ANSWER.value, SHORT_ANSWER_TEMPLATE, short_answers),
+        (2, models.QuestionType.ESSAY.value, ESSAY_TEMPLATE, essays),
+    ):
+        for number, (topic_id, title, _) in enumerate(chosen, start=1):
+            questions.append({
+                "session": session,
+                "question_number": number,
+                "question_text": template.format(title=title),
+                "question_type": question_type,
+                "topic_id": topic_id,
+            })
+    return questions
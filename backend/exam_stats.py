@@ -0,0 +1,202 @@
+"""
+Incrementally maintained 출제 빈도 (exam frequency) aggregates.
+
+topic_exam_stats holds, per topic, how often it was asked, the score sum/count
+for the average and the most recent exam round; category_exam_stats holds the
+same per category plus the number of distinct topics asked. Writes to
+exam_history go through record() / recompute_topics(), which apply the change
+to both tables in the caller's transaction, so frequency rankings and filters
+never scan exam_history.
+
+record() only adds deltas with an atomic upsert (INSERT ... ON CONFLICT DO
+UPDATE, supported by SQLite and PostgreSQL), so concurrent writers cannot lose
+increments. Whether a topic is asked for the first time - which bumps its
+category's topic_count - is read from the topic upsert's RETURNING row, not
+from an earlier SELECT that a concurrent writer could invalidate. Deleting
+history entries recomputes only the affected topics from their own history
+rows (idx_exam_history_topic_id). When topics move between categories the
+category rows are recomputed from topic_exam_stats.
+
+Rounds are ordered by the first number in the label ("131회" -> 131); labels
+without a number never replace a numbered last round.
+"""
+import re
+from datetime import datetime
+
+from sqlalchemy import case, delete, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+import models
+
+_ROUND_NUMBER = re.compile(r"\d+")
+
+
+def round_number(exam_round):
+    match = _ROUND_NUMBER.search(exam_round or "")
+    return int(match.group()) if match else None
+
+
+def version_select():
+    """(row count, last change) of topic_exam_stats - a cheap validator for ETags"""
+    return select(func.count(models.TopicExamStats.topic_id), func.max(models.TopicExamStats.updated_at))
+
+
+def version(db: Session):
+    return tuple(db.execute(version_select()).one())
+
+
+def average(score_sum, score_count):
+    return round(score_sum / score_count, 2) if score_count else None
+
+
+def _is_later(number, current_number):
+    return (number if number is not None else -1) >= (current_number if current_number is not None else -1)
+
+
+def _add(totals, key, exam_round, score, count=1):
+    entry = totals.setdefault(key, {
+        "exam_count": 0, "score_count": 0, "score_sum": 0.0, "last_round": None, "last_round_number": None,
+    })
+    entry["exam_count"] += count
+    if score is not None:
+        entry["score_count"] += 1
+        entry["score_sum"] += score
+    number = round_number(exam_round)
+    if _is_later(number, entry["last_round_number"]):
+        entry["last_round"], entry["last_round_number"] = exam_round, number
+    return entry
+
+
+def _upsert(db: Session, model, key, rows, returning=()):
+    """Add the rows' counts to existing aggregate rows, inserting missing ones; returns the `returning` columns"""
+    if not rows:
+        return []
+    dialect_insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    statement = dialect_insert(model)
+    new = statement.excluded
+    later = func.coalesce(new.last_round_number, -1) >= func.coalesce(model.last_round_number, -1)
+    updates = {
+        "exam_count": model.exam_count + new.exam_count,
+        "score_count": model.score_count + new.score_count,
+        "score_sum": model.score_sum + new.score_sum,
+        "last_round": case((later, new.last_round), else_=model.last_round),
+        "last_round_number": case((later, new.last_round_number), else_=model.last_round_number),
+        "updated_at": new.updated_at,
+    }
+    if model is models.CategoryExamStats:
+        updates["topic_count"] = model.topic_count + new.topic_count
+    statement = statement.on_conflict_do_update(index_elements=[key], set_=updates)
+    if not returning:
+        db.execute(statement, rows)
+        return []
+    return db.execute(statement.returning(*returning), rows).all()
+
+
+def record(db: Session, entries):
+    """Apply newly written exam_history rows (objects with topic_id, exam_round, score)"""
+    per_topic = {}
+    for entry in entries:
+        _add(per_topic, entry.topic_id, entry.exam_round, entry.score)
+    if not per_topic:
+        return
+
+    now = datetime.utcnow()
+    # 갱신 후 exam_count가 이번 증가분과 같으면 이 트랜잭션이 행을 처음 만든 것
+    stats = models.TopicExamStats
+    first_asked = {
+        row.topic_id for row in _upsert(db, stats, "topic_id", [
+            {"topic_id": topic_id, **totals, "updated_at": now} for topic_id, totals in sorted(per_topic.items())
+        ], returning=(stats.topic_id, stats.exam_count))
+        if row.exam_count == per_topic[row.topic_id]["exam_count"]
+    }
+    categories = dict(db.execute(
+        select(models.Topic.id, models.Topic.category_id).where(models.Topic.id.in_(list(per_topic)))
+    ).all())
+
+    per_category = {}
+    for topic_id, totals in per_topic.items():
+        category_id = categories.get(topic_id)
+        if category_id is None:
+            continue
+        entry = per_category.setdefault(category_id, {
+            "exam_count": 0, "score_count": 0, "score_sum": 0.0, "last_round": None,
+            "last_round_number": None, "topic_count": 0,
+        })
+        entry["exam_count"] += totals["exam_count"]
+        entry["score_count"] += totals["score_count"]
+        entry["score_sum"] += totals["score_sum"]
+        if _is_later(totals["last_round_number"], entry["last_round_number"]):
+            entry["last_round"], entry["last_round_number"] = totals["last_round"], totals["last_round_number"]
+        if topic_id in first_asked:
+            entry["topic_count"] += 1
+
+    _upsert(db, models.CategoryExamStats, "category_id", [
+        {"category_id": category_id, **totals, "updated_at": now}
+        for category_id, totals in sorted(per_category.items())
+    ])
+
+
+def recompute_topics(db: Session, topic_ids):
+    """Rebuild the rows of some topics from their history, e.g. after history entries were removed"""
+    topic_ids = sorted({topic_id for topic_id in topic_ids if topic_id is not None})
+    if not topic_ids:
+        return
+    per_topic = {}
+    for row in db.execute(
+        select(models.ExamHistory.topic_id, models.ExamHistory.exam_round, models.ExamHistory.score)
+        .where(models.ExamHistory.topic_id.in_(topic_ids))
+    ):
+        _add(per_topic, row.topic_id, row.exam_round, row.score)
+
+    db.execute(delete(models.TopicExamStats).where(models.TopicExamStats.topic_id.in_(topic_ids)))
+    now = datetime.utcnow()
+    if per_topic:
+        db.execute(models.TopicExamStats.__table__.insert(), [
+            {"topic_id": topic_id, **totals, "updated_at": now} for topic_id, totals in per_topic.items()
+        ])
+    refresh_categories(db, db.execute(
+        select(models.Topic.category_id).where(models.Topic.id.in_(topic_ids))
+    ).scalars())
+
+
+def refresh_categories(db: Session, category_ids):
+    """Recompute category rows from topic_exam_stats, e.g. after topics changed category"""
+    category_ids = sorted({category_id for category_id in category_ids if category_id is not None})
+    if not category_ids:
+        return
+    per_category = {}
+    stats = models.TopicExamStats
+    for row in db.execute(
+        select(models.Topic.category_id, stats.exam_count, stats.score_count, stats.score_sum, stats.last_round)
+        .join(models.Topic, models.Topic.id == stats.topic_id)
+        .where(models.Topic.category_id.in_(category_ids))
+    ):
+        entry = _add(per_category, row.category_id, row.last_round, None, count=row.exam_count)
+        entry["score_count"] += row.score_count
+        entry["score_sum"] += row.score_sum
+        entry["topic_count"] = entry.get("topic_count", 0) + 1
+
+    db.execute(delete(models.CategoryExamStats).where(models.CategoryExamStats.category_id.in_(category_ids)))
+    now = datetime.utcnow()
+    if per_category:
+        db.execute(models.CategoryExamStats.__table__.insert(), [
+            {"category_id": category_id, **totals, "updated_at": now}
+            for category_id, totals in per_category.items()
+        ])
+
+
+def forget_topic(db: Session, topic_id, category_id):
+    """Drop a deleted topic's row and take it out of its category"""
+    db.execute(delete(models.TopicExamStats).where(models.TopicExamStats.topic_id == topic_id))
+    refresh_categories(db, [category_id])
+
+
+def rebuild(db: Session):
+    """Recompute both tables from the full exam_history (startup backfill / manual repair)"""
+    db.execute(delete(models.CategoryExamStats))
+    db.execute(delete(models.TopicExamStats))
+    record(db, db.execute(
+        select(models.ExamHistory.topic_id, models.ExamHistory.exam_round, models.ExamHistory.score)
+        .where(models.ExamHistory.topic_id.isnot(None))
+    ).all())
@@ -0,0 +1,149 @@
+"""
+Per-request SQL instrumentation.
+
+Engine events count and time every statement into a per-request context; the
+middleware in main.py opens that context, adds a Server-Timing header, logs
+statements slower than SLOW_QUERY_MS and feeds per-route histograms that
+/debug/metrics reports as p50/p95/p99, together with the slowest statement
+each route has run.
+"""
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+logger = logging.getLogger("north_pe.sql")
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+HISTOGRAM_SAMPLES = int(os.getenv("METRICS_SAMPLES_PER_ROUTE", "1000"))
+
+
+class RequestStats:
+    __slots__ = ("statements", "db_time", "slowest_time", "slowest_statement")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_statement = None
+
+    def record(self, statement, elapsed):
+        self.statements += 1
+        self.db_time += elapsed
+        if elapsed > self.slowest_time:
+            self.slowest_time = elapsed
+            self.slowest_statement = statement
+
+
+_current = ContextVar("request_sql_stats", default=None)
+
+
+def start_request():
+    stats = RequestStats()
+    return stats, _current.set(stats)
+
+
+def end_request(token):
+    _current.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _one_line(statement):
+    return " ".join(statement.split())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+    if elapsed * 1000 >= SLOW_QUERY_MS:
+        logger.warning("Slow query (%.1f ms): %s", elapsed * 1000, _one_line(statement))
+
+
+def instrument_engine(engine):
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class RouteMetrics:
+    """Keeps the last HISTOGRAM_SAMPLES observations per route"""
+
+    def __init__(self, samples=HISTOGRAM_SAMPLES):
+        self._lock = threading.Lock()
+        self._samples = defaultdict(lambda: {
+            "total_ms": deque(maxlen=samples),
+            "db_ms": deque(maxlen=samples),
+            "statements": deque(maxlen=samples),
+        })
+        self._counts = defaultdict(int)
+        self._slowest = {}  # route -> (seconds, statement)
+
+    def observe(self, route, total_ms, stats):
+        with self._lock:
+            samples = self._samples[route]
+            samples["total_ms"].append(total_ms)
+            samples["db_ms"].append(stats.db_time * 1000)
+            samples["statements"].append(stats.statements)
+            self._counts[route] += 1
+            slowest = self._slowest.get(route)
+            if stats.slowest_statement is not None and (slowest is None or stats.slowest_time > slowest[0]):
+                self._slowest[route] = (stats.slowest_time, stats.slowest_statement)
+
+    def snapshot(self):
+        with self._lock:
+            routes = {
+                route: (
+                    self._counts[route],
+                    {name: sorted(values) for name, values in samples.items()},
+                    self._slowest.get(route),
+                )
+                for route, samples in self._samples.items()
+            }
+
+        report = {}
+        for route, (count, samples, slowest) in routes.items():
+            report[route] = {"requests": count}
+            for name, values in samples.items():
+                report[route][name] = {
+                    "p50": _percentile(values, 0.50),
+                    "p95": _percentile(values, 0.95),
+                    "p99": _percentile(values, 0.99),
+                    "max": values[-1] if values else None,
+                }
+            if slowest is not None:
+                report[route]["slowest_statement"] = {"ms": slowest[0] * 1000, "sql": _one_line(slowest[1])}
+        return report
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+            self._slowest.clear()
+
+
+route_metrics = RouteMetrics()
+
+
+def server_timing_header(total_ms, stats):
+    return (
+        f'db;dur={stats.db_time * 1000:.1f};desc="{stats.statements} queries", '
+        f'db-slowest;dur={stats.slowest_time * 1000:.1f}, '
+        f'total;dur={total_ms:.1f}'
+    )
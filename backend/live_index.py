@@ -0,0 +1,132 @@
+"""
+Common life cycle of the per-process topic indexes (search_index, autocomplete,
+related_index).
+
+An index is loaded from the database once - normally by topic_indexes.warm_up()
+in a background thread at startup, ensure_built() otherwise - and then kept
+current by the topic write paths through index_topic() / remove_topic().
+
+The build reads a snapshot, so a write committed while it runs may be missing
+from it. Such writes are queued and applied once the build has finished;
+writes made before any build are dropped, because the build will read them.
+rebuild() loads a fresh copy next to the live one and swaps it in, replaying
+the writes made meanwhile, so lookups are served throughout.
+"""
+import threading
+
+from sqlalchemy.orm import Session
+
+
+class LiveIndex:
+    # 전체 통계(IDF)에 의존하는 인덱스는 대량 추가 후 rebuild()로 가중치를 갱신
+    global_weights = False
+
+    def __init__(self):
+        self._lock = threading.RLock()  # index data; held for the whole build
+        self._state_lock = threading.Lock()  # _built/_building/_pending only, never held long
+        self._built = False
+        self._building = False
+        self._pending = {}  # topic_id -> document (None: removed), written during a build
+        self._rebuild_log = None  # the same during rebuild(), None when no rebuild is running
+
+    @property
+    def built(self):
+        return self._built
+
+    @property
+    def in_use(self):
+        """True once a build has started; writes to an index that is not in use are dropped anyway"""
+        return self._built or self._building
+
+    def ensure_built(self, db: Session):
+        if self._built:
+            return
+        with self._lock:
+            if self._built:
+                return
+            with self._state_lock:
+                self._building = True
+            try:
+                self._load(db)
+            except BaseException:
+                with self._state_lock:
+                    self._building = False
+                    self._pending.clear()
+                self._reset()
+                raise
+            with self._state_lock:
+                pending, self._pending = self._pending, {}
+                self._building = False
+                self._built = True
+            # 아직 _lock을 쥐고 있으므로 이후 쓰기는 이 재적용 뒤에 반영된다
+            for topic_id, document in pending.items():
+                self._replace(topic_id, document)
+
+    def index_topic(self, topic):
+        """Add or replace a topic; call after the write has been committed"""
+        self._write(topic.id, self._document(topic))
+
+    def remove_topic(self, topic_id):
+        self._write(topic_id, None)
+
+    def rebuild(self, db: Session):
+        """Load a fresh copy and swap it in; the current data keeps serving until then"""
+        with self._state_lock:
+            if not self._built or self._rebuild_log is not None:
+                return
+            self._rebuild_log = {}
+        fresh = type(self)()
+        try:
+            fresh._load(db)
+        except BaseException:
+            with self._state_lock:
+                self._rebuild_log = None
+            raise
+        with self._lock:
+            with self._state_lock:
+                log, self._rebuild_log = self._rebuild_log, None
+            if not self._built:  # 그 사이 clear()됨
+                return
+            for topic_id, document in log.items():
+                fresh._replace(topic_id, document)
+            for name, value in vars(fresh).items():
+                if name not in _STATE_ATTRIBUTES:
+                    setattr(self, name, value)
+
+    def clear(self):
+        with self._lock:
+            self._reset()
+            with self._state_lock:
+                self._built = False
+
+    def _write(self, topic_id, document):
+        with self._state_lock:
+            if self._building:
+                self._pending[topic_id] = document
+                return
+            if not self._built:
+                return
+            if self._rebuild_log is not None:
+                self._rebuild_log[topic_id] = document
+        with self._lock:
+            # clear()가 끼어들었으면 다음 빌드가 이 쓰기를 읽는다
+            if self._built:
+                self._replace(topic_id, document)
+
+    def _document(self, topic):
+        """Plain data the index needs from a Topic ORM object (safe to keep after the session closes)"""
+        raise NotImplementedError
+
+    def _load(self, db: Session):
+        """Index every topic; called with the lock held on an empty index"""
+        raise NotImplementedError
+
+    def _replace(self, topic_id, document):
+        """Replace a topic's entries with `document`, or drop them when it is None"""
+        raise NotImplementedError
+
+    def _reset(self):
+        raise NotImplementedError
+
+
+_STATE_ATTRIBUTES = frozenset(vars(LiveIndex()))
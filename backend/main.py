@@ -1,19 +1,112 @@
 import os
-from fastapi import FastAPI
+import time
+import anyio
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.datastructures import Headers
 from contextlib import asynccontextmanager
-from routers import topics, categories, templates, weekly_exams, weekly_exams_new, test_weekly
-from database_config import init_db, test_connection
+from routers import topics, categories, templates, weekly_exams, weekly_exams_new, test_weekly, assignments, exam_history
+from database_config import init_db, test_connection, engine, DB_MODE
+import instrumentation
+import topic_indexes
+from pool_config import pool_metrics
+from read_cache import read_cache
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     init_db()
+    if topic_indexes.INDEX_WARM_UP:
+        topic_indexes.warm_up()
     yield
     # Shutdown (cleanup if needed)
 
 app = FastAPI(title="North PE API", version="1.0.0", lifespan=lifespan)
 
+instrumentation.instrument_engine(engine)
+if DB_MODE == "async":
+    from database_config import async_engine
+    instrumentation.instrument_engine(async_engine.sync_engine)
+
+@app.middleware("http")
+async def sql_timing(request: Request, call_next):
+    start = time.perf_counter()
+    stats, token = instrumentation.start_request()
+    try:
+        response = await call_next(request)
+    finally:
+        instrumentation.end_request(token)
+    total_ms = (time.perf_counter() - start) * 1000
+
+    route = request.scope.get("route")
+    route_key = f"{request.method} {route.path if route else 'unmatched'}"
+    instrumentation.route_metrics.observe(route_key, total_ms, stats)
+    response.headers["Server-Timing"] = instrumentation.server_timing_header(total_ms, stats)
+    return response
+
+# JSON 응답 압축 (brotli-asgi가 설치되어 있으면 br 우선, 아니면 gzip)
+COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1000"))
+# 이미 압축된 형식 (PDF 제출물/내보내기, .ndjson.gz 내보내기)은 다시 압축하지 않음
+PRECOMPRESSED_TYPES = {"application/pdf", "application/gzip", "application/x-gzip", "application/zip"}
+
+class CompressionMiddleware:
+    """Compress responses with `compressor`, except content types that are already compressed.
+
+    The content type is only known once the response starts, and neither
+    brotli-asgi nor older Starlette versions skip these types, so the app runs
+    here and, from its response start on, its messages either go straight out
+    (file downloads keep Range support and zero-copy sends) or are replayed
+    through the compressor.
+    """
+    def __init__(self, app, compressor, **options):
+        self.app = app
+        self.compressor = compressor
+        self.options = options
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        to_compressor, from_app = anyio.create_memory_object_stream(1)
+        direct = False
+
+        async def replay(scope, receive, send):
+            async with from_app:
+                async for message in from_app:
+                    await send(message)
+
+        try:
+            async with anyio.create_task_group() as task_group:
+                async def app_send(message):
+                    nonlocal direct
+                    if message["type"] == "http.response.start":
+                        direct = self.precompressed(message)
+                        if not direct:
+                            task_group.start_soon(self.compressor(replay, **self.options), scope, receive, send)
+                    if direct:
+                        await send(message)
+                    else:
+                        await to_compressor.send(message)
+
+                async with to_compressor:
+                    await self.app(scope, receive, app_send)
+        finally:
+            from_app.close()
+
+    @staticmethod
+    def precompressed(start_message):
+        headers = Headers(raw=start_message["headers"])
+        media_type = headers.get("content-type", "").partition(";")[0].strip().lower()
+        return media_type in PRECOMPRESSED_TYPES or "content-encoding" in headers
+
+try:
+    from brotli_asgi import BrotliMiddleware
+    app.add_middleware(CompressionMiddleware, compressor=BrotliMiddleware, minimum_size=COMPRESS_MIN_SIZE, gzip_fallback=True)
+except ImportError:
+    app.add_middleware(CompressionMiddleware, compressor=GZipMiddleware, minimum_size=COMPRESS_MIN_SIZE, compresslevel=6)
+
 # CORS origins from environment variable
 CORS_ORIGINS = os.getenv("CORS_ORIGINS", "http://localhost:4000").split(",")
 
@@ -26,12 +119,14 @@ app.add_middleware(
 )
 
 # Include routers
-app.include_router(topics.router)
-app.include_router(categories.router)
-app.include_router(templates.router)
-app.include_router(weekly_exams.router)
-app.include_router(weekly_exams_new.router)
-app.include_router(test_weekly.router)
+api_routers = [topics, categories, templates, weekly_exams, weekly_exams_new, test_weekly, assignments, exam_history]
+if DB_MODE == "async":
+    from async_routes import asyncify_router
+    for module in api_routers:
+        app.include_router(asyncify_router(module.router))
+else:
+    for module in api_routers:
+        app.include_router(module.router)
 
 @app.get("/")
 async def root():
@@ -41,37 +136,14 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
-# 직접 추가된 주간모의고사 엔드포인트
-@app.get("/weekly-exams-direct")
-async def get_weekly_exams_direct():
-    return [{
-        "id": 1,
-        "week_number": 1,
-        "category_id": 1,
-        "category": {"id": 1, "name": "네트워크", "description": "네트워킹 관련"},
-        "questions": [
-            {
-                "id": 1,
-                "session": 1,
-                "question_number": 1,
-                "question_text": "SCTP",
-                "question_type": "short_answer",
-                "weekly_exam_id": 1,
-                "created_at": "2024-09-01T00:00:00"
-            }
-        ],
-        "created_at": "2024-09-01T00:00:00"
-    }]
-
-@app.post("/weekly-exams-direct")  
-async def create_weekly_exam_direct():
+@app.get("/debug/metrics")
+async def debug_metrics():
+    """라우트별 응답시간/DB시간/쿼리수 p50, p95, p99와 가장 느린 SQL"""
     return {
-        "id": 2,
-        "week_number": 2,
-        "category_id": 1,
-        "category": {"id": 1, "name": "네트워크", "description": "네트워킹 관련"},
-        "questions": [],
-        "created_at": "2024-09-01T00:00:00"
+        "slow_query_ms": instrumentation.SLOW_QUERY_MS,
+        "routes": instrumentation.route_metrics.snapshot(),
+        "pool": pool_metrics.snapshot(),
+        "read_cache": read_cache.stats()
     }
 
 @app.get("/test")
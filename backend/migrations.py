@@ -0,0 +1,112 @@
+"""
+Lightweight schema upgrades for existing databases.
+
+Base.metadata.create_all() only creates missing tables, so columns and indexes
+added to models.py later never reach a database created by an older version.
+upgrade_schema() adds those (nullable) columns and missing indexes in place and
+is safe to run on every startup. Data backfills for new columns run afterwards.
+"""
+from sqlalchemy import exists, func, inspect, select, text, update
+from sqlalchemy.orm import Session
+
+import category_tree
+import exam_stats
+from models import Base, Category, ExamHistory, Topic, TopicExamStats
+
+
+def upgrade_schema(engine):
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+
+    with engine.begin() as conn:
+        if "submissions" in existing_tables:
+            check_duplicate_submissions(conn, existing_index_names(conn, inspector, "submissions"))
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+
+            columns = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in columns:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+                print(f"Migration: added column {table.name}.{column.name}")
+
+            indexes = existing_index_names(conn, inspector, table.name)
+            for index in table.indexes:
+                if index.name not in indexes:
+                    index.create(conn)
+                    print(f"Migration: created index {index.name}")
+
+        category_tree.backfill_paths(conn)
+        backfill_topic_categories(conn)
+        backfill_exam_stats(conn)
+
+
+def existing_index_names(conn, inspector, table_name):
+    names = {index["name"] for index in inspector.get_indexes(table_name)}
+    if conn.dialect.name == "sqlite":
+        # SQLite 리플렉션은 표현식 인덱스를 건너뛰므로 sqlite_master에서 확인
+        names.update(conn.execute(
+            text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :table"), {"table": table_name}
+        ).scalars())
+    return names
+
+
+def check_duplicate_submissions(conn, indexes):
+    """Refuse to start while a student has several submissions for one assignment.
+
+    The unique index cannot be created over them, and picking one would throw
+    away the others' files, scores and feedback, so they have to be merged by hand.
+    """
+    if "uq_submissions_assignment_id_user_id" in indexes:
+        return
+    rows = conn.execute(text("""
+        SELECT assignment_id, user_id, id FROM submissions
+        WHERE (assignment_id, user_id) IN (
+            SELECT assignment_id, user_id FROM submissions
+            WHERE assignment_id IS NOT NULL AND user_id IS NOT NULL
+            GROUP BY assignment_id, user_id
+            HAVING count(*) > 1
+        )
+        ORDER BY assignment_id, user_id, id
+    """)).all()
+    if rows:
+        duplicates = {}
+        for row in rows:
+            duplicates.setdefault((row.assignment_id, row.user_id), []).append(str(row.id))
+        listing = "\n".join(
+            f"  assignment {assignment_id}, user {user_id}: submissions {', '.join(ids)}"
+            for (assignment_id, user_id), ids in duplicates.items()
+        )
+        raise RuntimeError(
+            "Migration: students with more than one submission per assignment; keep one row each "
+            f"(carrying over its score and feedback) and delete the others before starting:\n{listing}"
+        )
+    # 고유 인덱스가 같은 열을 대신함
+    conn.execute(text("DROP INDEX IF EXISTS ix_submissions_assignment_id_user_id"))
+
+
+def backfill_topic_categories(conn):
+    """Link topics to categories by name where category_id is still empty"""
+    same_name = Category.name == Topic.category
+    result = conn.execute(
+        update(Topic)
+        .where(Topic.category_id.is_(None), exists().where(same_name))
+        .values(category_id=select(func.min(Category.id)).where(same_name).scalar_subquery())
+    )
+    if result.rowcount:
+        print(f"Migration: linked {result.rowcount} topics to categories")
+
+
+def backfill_exam_stats(conn):
+    """Build the exam frequency aggregates once for history recorded before they existed"""
+    if conn.execute(select(TopicExamStats.topic_id).limit(1)).first():
+        return
+    if not conn.execute(select(ExamHistory.id).where(ExamHistory.topic_id.isnot(None)).limit(1)).first():
+        return
+    with Session(bind=conn) as db:
+        exam_stats.rebuild(db)
+        db.flush()
+    print("Migration: built exam frequency aggregates")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Float, Enum
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Float, Enum, Index, func
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -12,10 +12,16 @@ class AssignmentType(enum.Enum):
 
 class Topic(Base):
     __tablename__ = "topics"
+    __table_args__ = (
+        # keyset pagination: ORDER BY (id), optionally per category; (modified_at, id) below
+        Index("ix_topics_updated_at_id", "updated_at", "id"),
+        Index("ix_topics_category_id_pk", "category_id", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(200), nullable=False)
-    category = Column(String(100))
+    category = Column(String(100))  # Category.name, kept in sync with category_id
+    category_id = Column(Integer, ForeignKey("categories.id"))
     content = Column(Text)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -25,12 +31,21 @@ class Topic(Base):
     mnemonics = relationship("Mnemonic", back_populates="topic")
     exam_histories = relationship("ExamHistory", back_populates="topic")
 
+# 예전 행은 updated_at이 비어 있어 created_at으로 대신함
+topic_modified_at = func.coalesce(Topic.updated_at, Topic.created_at)
+Index("ix_topics_modified_at_id", topic_modified_at, Topic.id)
+Index("ix_topics_category_id_modified_at_id", Topic.category_id, topic_modified_at, Topic.id)
+
 class TopicVersion(Base):
     __tablename__ = "topic_versions"
+    __table_args__ = (
+        Index("ix_topic_versions_topic_id_version", "topic_id", "version"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     topic_id = Column(Integer, ForeignKey("topics.id"))
-    content = Column(Text)
+    content = Column(Text)  # keyframe: full text, otherwise NULL
+    delta = Column(Text)  # diff-match-patch delta against the previous version
     version = Column(Integer)
     changed_by = Column(String(100))
     change_reason = Column(Text)
@@ -40,6 +55,9 @@ class TopicVersion(Base):
 
 class Keyword(Base):
     __tablename__ = "keywords"
+    __table_args__ = (
+        Index("idx_keywords_topic_id", "topic_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     topic_id = Column(Integer, ForeignKey("topics.id"))
@@ -49,6 +67,9 @@ class Keyword(Base):
 
 class Mnemonic(Base):
     __tablename__ = "mnemonics"
+    __table_args__ = (
+        Index("idx_mnemonics_topic_id", "topic_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     topic_id = Column(Integer, ForeignKey("topics.id"))
@@ -59,6 +80,9 @@ class Mnemonic(Base):
 
 class ExamHistory(Base):
     __tablename__ = "exam_history"
+    __table_args__ = (
+        Index("idx_exam_history_topic_id", "topic_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     topic_id = Column(Integer, ForeignKey("topics.id"))
@@ -68,6 +92,36 @@ class ExamHistory(Base):
     
     topic = relationship("Topic", back_populates="exam_histories")
 
+class TopicExamStats(Base):
+    """출제 빈도 per topic, maintained by exam_stats whenever exam_history is written"""
+    __tablename__ = "topic_exam_stats"
+    __table_args__ = (
+        # 빈도 순위: ORDER BY exam_count DESC, topic_id
+        Index("ix_topic_exam_stats_exam_count_topic_id", "exam_count", "topic_id"),
+        Index("ix_topic_exam_stats_updated_at", "updated_at"),
+    )
+    
+    topic_id = Column(Integer, ForeignKey("topics.id"), primary_key=True)
+    exam_count = Column(Integer, nullable=False, default=0)
+    score_count = Column(Integer, nullable=False, default=0)  # 점수가 기록된 출제 수 (평균의 분모)
+    score_sum = Column(Float, nullable=False, default=0)
+    last_round = Column(String(50))
+    last_round_number = Column(Integer)  # 회차 정렬용 ("131회" -> 131)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+class CategoryExamStats(Base):
+    """출제 빈도 per category (direct topics only), maintained by exam_stats"""
+    __tablename__ = "category_exam_stats"
+    
+    category_id = Column(Integer, ForeignKey("categories.id"), primary_key=True)
+    topic_count = Column(Integer, nullable=False, default=0)  # 한 번 이상 출제된 토픽 수
+    exam_count = Column(Integer, nullable=False, default=0)
+    score_count = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Float, nullable=False, default=0)
+    last_round = Column(String(50))
+    last_round_number = Column(Integer)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
 class Assignment(Base):
     __tablename__ = "assignments"
     
@@ -82,11 +136,19 @@ class Assignment(Base):
 
 class Submission(Base):
     __tablename__ = "submissions"
+    __table_args__ = (
+        # 학생당 과제 하나에 제출 하나 (재제출은 같은 행을 갱신)
+        Index("uq_submissions_assignment_id_user_id", "assignment_id", "user_id", unique=True),
+        Index("ix_submissions_sha256", "sha256"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     assignment_id = Column(Integer, ForeignKey("assignments.id"))
     user_id = Column(String(100))
-    file_path = Column(String(500))
+    file_path = Column(String(500))  # SUBMISSION_DIR 기준 상대 경로 (내용 주소: sha256)
+    sha256 = Column(String(64))
+    file_size = Column(Integer)
+    original_filename = Column(String(255))
     submitted_at = Column(DateTime, default=datetime.utcnow)
     score = Column(Float)
     feedback = Column(Text)
@@ -95,11 +157,16 @@ class Submission(Base):
 
 class Category(Base):
     __tablename__ = "categories"
+    __table_args__ = (
+        # 하위 트리 조회 (path LIKE '/1/4/%')
+        Index("ix_categories_path", "path", postgresql_ops={"path": "text_pattern_ops"}),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False)
     description = Column(Text)
     parent_id = Column(Integer, ForeignKey("categories.id"))
+    path = Column(String(255))  # materialized path of ids, e.g. "/1/4/9/"
     created_at = Column(DateTime, default=datetime.utcnow)
     
     parent = relationship("Category", remote_side=[id])
@@ -122,17 +189,24 @@ class QuestionType(enum.Enum):
 
 class WeeklyExam(Base):
     __tablename__ = "weekly_exams"
+    __table_args__ = (
+        Index("ix_weekly_exams_week_number", "week_number"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     week_number = Column(Integer, nullable=False)
     category_id = Column(Integer, ForeignKey("categories.id"))
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     category = relationship("Category")
     questions = relationship("ExamQuestion", back_populates="weekly_exam")
 
 class ExamQuestion(Base):
     __tablename__ = "exam_questions"
+    __table_args__ = (
+        Index("ix_exam_questions_topic_id", "topic_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     weekly_exam_id = Column(Integer, ForeignKey("weekly_exams.id"))
@@ -140,6 +214,8 @@ class ExamQuestion(Base):
     question_number = Column(Integer, nullable=False)  # 1~13 (1교시), 1~6 (2교시)
     question_text = Column(Text, nullable=False)
     question_type = Column(Enum(QuestionType), nullable=False)
+    topic_id = Column(Integer, ForeignKey("topics.id"))  # 자동 출제 시 원본 토픽
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     weekly_exam = relationship("WeeklyExam", back_populates="questions")
\ No newline at end of file
@@ -0,0 +1,46 @@
+"""
+Opaque keyset (cursor) pagination helpers.
+
+A cursor is the url-safe base64 of a small JSON document holding the sort key
+of the last row on the previous page, so the next page is fetched with an
+index range scan instead of OFFSET.
+"""
+import base64
+import json
+from datetime import datetime
+
+from fastapi import HTTPException
+
+
+def encode_cursor(**values):
+    payload = {
+        key: value.isoformat() if isinstance(value, datetime) else value
+        for key, value in values.items()
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor, required=()):
+    """Decode a cursor or raise 400; `required` keys must be present"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, dict) or any(key not in payload for key in required):
+            raise ValueError(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return payload
+
+
+def parse_id(value):
+    if type(value) is not int:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return value
+
+
+def parse_datetime(value):
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
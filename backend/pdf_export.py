@@ -0,0 +1,179 @@
+"""
+Printable PDF bundles of topics (시험장 지참용).
+
+Each topic is rendered to its own PDF fragment, cached on disk under
+PDF_CACHE_DIR and keyed by (topic_id, latest version, updated_at), so
+re-exporting a category only re-renders the topics that changed since the last
+export. Missing fragments are rendered in a process pool; the fragments are
+then merged (one bookmark per topic) into a temporary file that is streamed
+back in chunks and removed afterwards. pypdf keeps every page of the bundle in
+memory until the merged file is written, so peak memory grows with the number
+of topics - the export endpoint caps it with MAX_PDF_EXPORT_TOPICS. Deleting a
+topic removes its fragments (remove_fragments).
+
+Fonts: reportlab's built-in Korean CID font, so no font files are needed.
+"""
+import glob
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from xml.sax.saxutils import escape
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session, selectinload
+
+import models
+
+PDF_CACHE_DIR = os.getenv("PDF_CACHE_DIR", "./pdf_cache")
+FONT_NAME = "HYSMyeongJo-Medium"
+RENDER_REVISION = 1  # 레이아웃을 바꾸면 올려서 기존 조각을 무효화
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def fragment_path(topic_id, version, updated_at):
+    stamp = updated_at.strftime("%Y%m%d%H%M%S%f") if updated_at else "0"
+    return os.path.join(PDF_CACHE_DIR, f"topic_{topic_id}_r{RENDER_REVISION}_v{version}_{stamp}.pdf")
+
+
+def _paragraph_text(text):
+    return escape(text or "").replace("\n", "<br/>")
+
+
+def render_fragment(topic, path):
+    """Runs in a worker process: render one topic dict to `path`"""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import ParagraphStyle
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+
+    if FONT_NAME not in pdfmetrics.getRegisteredFontNames():
+        pdfmetrics.registerFont(UnicodeCIDFont(FONT_NAME))
+    title_style = ParagraphStyle("title", fontName=FONT_NAME, fontSize=16, leading=22, spaceAfter=6)
+    meta_style = ParagraphStyle("meta", fontName=FONT_NAME, fontSize=9, leading=13, textColor="#555555")
+    body_style = ParagraphStyle("body", fontName=FONT_NAME, fontSize=10.5, leading=16, wordWrap="CJK")
+
+    story = [Paragraph(_paragraph_text(topic["title"]), title_style)]
+    if topic["category"]:
+        story.append(Paragraph(_paragraph_text(f"카테고리: {topic['category']}"), meta_style))
+    if topic["keywords"]:
+        story.append(Paragraph(_paragraph_text("키워드: " + ", ".join(topic["keywords"])), meta_style))
+    for mnemonic, full_text in topic["mnemonics"]:
+        story.append(Paragraph(_paragraph_text(f"두음: {mnemonic} - {full_text}"), meta_style))
+    story.append(Spacer(1, 8))
+    story.append(Paragraph(_paragraph_text(topic["content"]), body_style))
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    SimpleDocTemplate(
+        tmp_path, pagesize=A4, title=topic["title"],
+        leftMargin=50, rightMargin=50, topMargin=50, bottomMargin=50,
+    ).build(story)
+    os.replace(tmp_path, path)  # 동시 내보내기에서도 완성된 파일만 보이도록
+    return path
+
+
+def _topic_payload(topic):
+    return {
+        "title": topic.title,
+        "category": topic.category,
+        "content": topic.content,
+        "keywords": [keyword.keyword for keyword in topic.keywords],
+        "mnemonics": [(mnemonic.mnemonic, mnemonic.full_text) for mnemonic in topic.mnemonics],
+    }
+
+
+def ensure_fragments(db: Session, topic_ids, workers=None):
+    """Render missing fragments; returns ([(topic_id, title, path)] in topic_ids order, rendered count)"""
+    os.makedirs(PDF_CACHE_DIR, exist_ok=True)
+    latest = dict(
+        db.query(models.TopicVersion.topic_id, func.max(models.TopicVersion.version))
+        .filter(models.TopicVersion.topic_id.in_(topic_ids))
+        .group_by(models.TopicVersion.topic_id)
+        .all()
+    )
+    rows = db.query(models.Topic.id, models.Topic.title, models.Topic.updated_at).filter(
+        models.Topic.id.in_(topic_ids)
+    ).all()
+    by_id = {row.id: row for row in rows}
+
+    fragments = []
+    missing = []
+    for topic_id in topic_ids:
+        row = by_id.get(topic_id)
+        if row is None:
+            continue
+        path = fragment_path(topic_id, latest.get(topic_id, 0), row.updated_at)
+        fragments.append((topic_id, row.title, path))
+        if not os.path.exists(path):
+            missing.append((topic_id, path))
+
+    if missing:
+        # 내용은 다시 그려야 하는 토픽만 읽음
+        topics = db.query(models.Topic).options(
+            selectinload(models.Topic.keywords), selectinload(models.Topic.mnemonics)
+        ).filter(models.Topic.id.in_([topic_id for topic_id, _ in missing])).all()
+        payloads = {topic.id: _topic_payload(topic) for topic in topics}
+
+        workers = workers or min(len(missing), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            list(executor.map(
+                render_fragment,
+                [payloads[topic_id] for topic_id, _ in missing],
+                [path for _, path in missing],
+                chunksize=max(1, len(missing) // (workers * 4)),
+            ))
+        for topic_id, path in missing:
+            _remove_stale(topic_id, path)
+    return fragments, len(missing)
+
+
+def _fragment_files(topic_id):
+    return glob.glob(os.path.join(PDF_CACHE_DIR, f"topic_{topic_id}_*.pdf"))
+
+
+def remove_fragments(topic_id):
+    """Delete every cached fragment of a topic"""
+    for path in _fragment_files(topic_id):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _remove_stale(topic_id, current_path):
+    current_mtime = os.path.getmtime(current_path)
+    for path in _fragment_files(topic_id):
+        try:
+            # 동시에 더 새 버전을 렌더링한 요청의 조각은 남김
+            if path != current_path and os.path.getmtime(path) < current_mtime:
+                os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def merge_fragments(fragments):
+    """Merge fragment files into a temporary PDF with one bookmark per topic; returns its path.
+
+    All pages are held by the PdfWriter until write(); only the response is streamed.
+    """
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+    for _, title, path in fragments:
+        writer.append(path, outline_item=title)
+    fd, output_path = tempfile.mkstemp(suffix=".pdf")
+    with os.fdopen(fd, "wb") as output:
+        writer.write(output)
+    writer.close()
+    return output_path
+
+
+def stream_file(path):
+    """Yield a file in chunks and delete it afterwards"""
+    try:
+        with open(path, "rb") as f:
+            while chunk := f.read(STREAM_CHUNK_SIZE):
+                yield chunk
+    finally:
+        os.remove(path)
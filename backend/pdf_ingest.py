@@ -0,0 +1,180 @@
+"""
+Ingest reference subnote PDFs (ref/*.pdf) as topics.
+
+Pages are extracted in a process pool, a bounded window at a time, so memory
+stays flat regardless of document size. The extracted lines are split into
+topics at headings (HEADING_PATTERN, overridable per run), each topic gets
+proposed keywords, and topics are written with topic_import.insert_topics in
+batches of INGEST_BATCH_SIZE - the same rows create_topic would produce.
+ingest_pdf() yields progress events; the API streams them as NDJSON and the
+CLI prints them.
+
+Scanned PDFs without a text layer yield no text (OCR is not attempted); such
+pages are counted as empty_pages.
+
+Usage:
+    python pdf_ingest.py "../ref/03. 소프트웨어공학_R1_최종1.pdf" --category 소프트웨어공학 [--dry-run]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from text_terms import terms
+
+INGEST_BATCH_SIZE = 100
+MAX_KEYWORDS = 5
+
+# ■ 제목 / ◆ 제목 / 【제목】 / [제목] 한 줄을 토픽 제목으로 간주
+HEADING_PATTERN = r"^\s*(?:[■◆▣●]\s*(?P<a>.{2,80}?)|【\s*(?P<b>.{2,80}?)\s*】|\[\s*(?P<c>[^\]]{2,80}?)\s*\])\s*$"
+
+_readers = {}
+
+
+def _extract_page(path, page_number):
+    """Runs in a worker process; keeps one open reader per file"""
+    from pypdf import PdfReader
+
+    reader = _readers.get(path)
+    if reader is None:
+        reader = _readers[path] = PdfReader(path)
+    return page_number, reader.pages[page_number].extract_text() or ""
+
+
+def page_count(path):
+    from pypdf import PdfReader
+
+    return len(PdfReader(path).pages)
+
+
+def extract_pages(path, workers=None):
+    """Yield (page_number, text) in order, at most 2 * workers pages in flight"""
+    workers = workers or min(4, os.cpu_count() or 1)
+    total = page_count(path)
+    window = workers * 2
+    # spawn: 웹 서버의 스레드/DB 연결을 fork로 복제하지 않도록
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        for start in range(0, total, window):
+            pages = range(start, min(start + window, total))
+            yield from executor.map(_extract_page, [path] * len(pages), pages)
+
+
+def propose_keywords(title, content, limit=MAX_KEYWORDS):
+    """Frequent terms of the topic body; acronyms and terms from the title rank higher"""
+    counts = Counter(terms(content))
+
+    def score(item):
+        term, count = item
+        weight = count
+        if term.isupper() and len(term) >= 2:
+            weight *= 2
+        if term in title:
+            weight *= 2
+        return weight
+
+    ranked = sorted((item for item in counts.items() if item[1] >= 2), key=score, reverse=True)
+    return [term for term, _ in ranked[:limit]]
+
+
+class TopicSplitter:
+    """Groups page lines into (title, content, first_page) at heading lines, one page at a time"""
+
+    def __init__(self, heading_pattern=HEADING_PATTERN):
+        self.heading = re.compile(heading_pattern)
+        self.title = None
+        self.lines = []
+        self.first_page = None
+
+    def feed(self, page_number, text):
+        done = []
+        for line in text.splitlines():
+            match = self.heading.match(line)
+            if match:
+                done.extend(self.finish())
+                self.title = next(group for group in match.groups() if group).strip()
+                self.first_page = page_number + 1
+            elif self.title is not None:
+                self.lines.append(line.rstrip())
+        return done
+
+    def finish(self):
+        if self.title is None:
+            return []
+        topic = (self.title, "\n".join(self.lines).strip(), self.first_page)
+        self.title, self.lines, self.first_page = None, [], None
+        return [topic]
+
+
+def ingest_pdf(path, db, category=None, dry_run=False, workers=None, heading_pattern=HEADING_PATTERN,
+               source_name=None):
+    """Extract, split and store topics from one PDF, yielding progress events"""
+    import topic_import
+    import topic_indexes
+
+    source_name = source_name or os.path.basename(path)
+    stats = {"pages": page_count(path), "empty_pages": 0, "topics": 0, "inserted": 0}
+    splitter = TopicSplitter(heading_pattern)
+    batch = []
+
+    def flush():
+        topics, errors = topic_import.validate_rows(db, batch)
+        if errors:
+            raise ValueError(f"Invalid topics: {errors[:5]}")
+        ids = topic_import.insert_topics(
+            db, topics, changed_by="pdf-ingest", change_reason=f"Imported from {source_name}"
+        )
+        db.commit()
+        topic_indexes.topics_added(ids)
+        batch.clear()
+        stats["inserted"] += len(ids)
+        return {"event": "batch", "inserted": stats["inserted"]}
+
+    def add(topics):
+        for title, content, first_page in topics:
+            stats["topics"] += 1
+            keywords = propose_keywords(title, content)
+            yield {"event": "topic", "title": title, "page": first_page, "keywords": keywords}
+            if not dry_run:
+                batch.append({"title": title[:200], "category": category, "content": content, "keywords": keywords})
+                if len(batch) >= INGEST_BATCH_SIZE:
+                    yield flush()
+
+    yield {"event": "start", "file": source_name, "pages": stats["pages"]}
+    for page_number, text in extract_pages(path, workers):
+        if not text.strip():
+            stats["empty_pages"] += 1
+        yield from add(splitter.feed(page_number, text))
+        yield {"event": "page", "page": page_number + 1, "pages": stats["pages"]}
+    yield from add(splitter.finish())
+    if batch:
+        yield flush()
+
+    yield {"event": "done", "dry_run": dry_run, **stats}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import topics from subnote PDFs")
+    parser.add_argument("files", nargs="+")
+    parser.add_argument("--category", help="category name for the imported topics")
+    parser.add_argument("--dry-run", action="store_true", help="show the split and keywords without saving")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--heading", default=HEADING_PATTERN, help="regex matching a topic heading line")
+    args = parser.parse_args()
+
+    from database_config import SessionLocal, init_db
+
+    init_db()
+    db = SessionLocal()
+    try:
+        for path in args.files:
+            for event in ingest_pdf(path, db, args.category, args.dry_run, args.workers, args.heading):
+                print(json.dumps(event, ensure_ascii=False))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
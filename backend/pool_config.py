@@ -0,0 +1,171 @@
+"""
+Connection pool configuration for Supabase (direct / session pooler / transaction pooler).
+
+DB_POOL_MODE selects the mode; when unset it is inferred from the URL:
+  - transaction: Supavisor/PgBouncer transaction mode (port 6543). Server-side
+    prepared statements are disabled because consecutive statements may land on
+    different backends. Uses NullPool (the pooler does the pooling) unless
+    DB_TRANSACTION_POOL=queue.
+  - session: Supavisor session mode (*.pooler.supabase.com:5432)
+  - direct: direct Postgres connection (db.<ref>.supabase.co)
+
+Liveness is handled by pool_recycle (DB_POOL_RECYCLE seconds) and TCP keepalives
+instead of pool_pre_ping, which costs a round trip on every checkout.
+Checkout wait time, in-use connections, overflow and timeouts are collected in
+pool_metrics and reported by /debug/metrics.
+"""
+import os
+import threading
+import time
+from collections import deque
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+
+POOL_MODES = ("direct", "session", "transaction")
+
+
+def detect_pool_mode(url):
+    mode = os.getenv("DB_POOL_MODE", "").lower()
+    if mode in POOL_MODES:
+        return mode
+    url = make_url(url)
+    if url.port == 6543:
+        return "transaction"
+    if url.host and "pooler." in url.host:
+        return "session"
+    return "direct"
+
+
+class PoolMetrics:
+    def __init__(self, samples=1000):
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=samples)
+        self._pools = {}
+        self.checkouts = 0
+        self.overflow_checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.max_in_use = 0
+
+    def register(self, name, engine):
+        self._pools[name] = engine.pool
+        event.listen(engine.pool, "connect", self._on_connect)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+
+    def record_checkout(self, pool, wait):
+        in_use = pool.checkedout()
+        with self._lock:
+            self.checkouts += 1
+            self._waits.append(wait * 1000)
+            if pool.overflow() > 0:
+                self.overflow_checkouts += 1
+            self.max_in_use = max(self.max_in_use, in_use)
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self):
+        with self._lock:
+            waits = sorted(self._waits)
+            report = {
+                "checkouts": self.checkouts,
+                "overflow_checkouts": self.overflow_checkouts,
+                "timeouts": self.timeouts,
+                "connects": self.connects,
+                "max_in_use": self.max_in_use,
+            }
+
+        def percentile(fraction):
+            return waits[int(fraction * (len(waits) - 1))] if waits else None
+
+        report["checkout_wait_ms"] = {
+            "p50": percentile(0.50),
+            "p95": percentile(0.95),
+            "p99": percentile(0.99),
+            "max": waits[-1] if waits else None,
+        }
+        report["pools"] = {}
+        for name, pool in self._pools.items():
+            if isinstance(pool, QueuePool):
+                report["pools"][name] = {
+                    "size": pool.size(),
+                    "in_use": pool.checkedout(),
+                    "idle": pool.checkedin(),
+                    "overflow": pool.overflow(),
+                }
+            else:
+                report["pools"][name] = {"status": pool.status()}
+        return report
+
+
+pool_metrics = PoolMetrics()
+
+
+class _TimedPoolMixin:
+    """Measures how long a checkout waits for a free connection"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_metrics.record_timeout()
+            raise
+        pool_metrics.record_checkout(self, time.perf_counter() - start)
+        return connection
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def engine_options(url, is_async=False):
+    """Return (pool mode, keyword arguments for create_engine / create_async_engine)"""
+    mode = detect_pool_mode(url)
+    url = make_url(url)
+    connect_args = {}
+
+    if mode == "transaction" and os.getenv("DB_TRANSACTION_POOL", "null").lower() != "queue":
+        options = {"poolclass": NullPool}
+    else:
+        default_size, default_overflow = ("5", "10") if mode == "transaction" else ("2", "5")
+        options = {
+            "poolclass": TimedAsyncQueuePool if is_async else TimedQueuePool,
+            "pool_size": int(os.getenv("DB_POOL_SIZE", default_size)),
+            "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", default_overflow)),
+            "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+            "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "300")),
+            "pool_pre_ping": False,
+            "pool_use_lifo": True,  # 남는 연결은 재사용되지 않고 recycle로 정리되도록
+        }
+
+    if mode == "transaction":
+        # 트랜잭션 풀러에서는 서버 측 prepared statement 사용 불가
+        if url.drivername == "postgresql+asyncpg":
+            connect_args["statement_cache_size"] = 0
+            connect_args["prepared_statement_cache_size"] = 0
+        elif url.drivername == "postgresql+psycopg":
+            connect_args["prepare_threshold"] = None
+
+    if url.drivername in ("postgresql", "postgresql+psycopg2", "postgresql+psycopg"):
+        connect_args.update({
+            "keepalives": 1,
+            "keepalives_idle": 30,
+            "keepalives_interval": 10,
+            "keepalives_count": 3,
+        })
+
+    if connect_args:
+        options["connect_args"] = connect_args
+    return mode, options
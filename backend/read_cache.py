@@ -0,0 +1,201 @@
+"""
+Read-through cache for rarely changing lookups (categories, templates, exam generator pools).
+
+Entries are grouped by namespace and expire after READ_CACHE_TTL seconds; the
+least recently used entries are evicted beyond READ_CACHE_MAX_ENTRIES. Write
+handlers call invalidate(namespace), which bumps the namespace version so every
+entry stored under the old version becomes unreachable - including one a
+concurrent request is still loading.
+
+READ_CACHE_BACKEND selects the store:
+  - memory (default): per process
+  - sqlite: a local file (READ_CACHE_PATH) shared by all workers on the host,
+    so an invalidation in one worker is seen by the others
+  - none: disabled
+Hit/miss counters are per process and reported by /debug/metrics.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+READ_CACHE_TTL = float(os.getenv("READ_CACHE_TTL", "300"))
+READ_CACHE_MAX_ENTRIES = int(os.getenv("READ_CACHE_MAX_ENTRIES", "256"))
+
+_MISS = object()
+
+
+class MemoryCacheBackend:
+    name = "memory"
+
+    def __init__(self, max_entries=READ_CACHE_MAX_ENTRIES):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._versions = defaultdict(int)
+        self.max_entries = max_entries
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISS
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return _MISS
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def version(self, namespace):
+        with self._lock:
+            return self._versions[namespace]
+
+    def bump_version(self, namespace):
+        with self._lock:
+            self._versions[namespace] += 1
+
+    def size(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteCacheBackend:
+    """Values are stored as JSON, so cached data must be JSON-serializable"""
+
+    name = "sqlite"
+
+    def __init__(self, path, max_entries=READ_CACHE_MAX_ENTRIES):
+        self._lock = threading.Lock()
+        self.max_entries = max_entries
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_cache_entries_accessed_at ON cache_entries (accessed_at)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_versions (namespace TEXT PRIMARY KEY, version INTEGER NOT NULL)"
+        )
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM cache_entries WHERE key = ? AND expires_at >= ?", (key, now)
+            ).fetchone()
+            if row is None:
+                return _MISS
+            self._conn.execute("UPDATE cache_entries SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(row[0])
+
+    def set(self, key, value, ttl):
+        now = time.time()
+        data = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, data, now + ttl, now),
+            )
+            # 만료 항목 정리 후 LRU 순으로 초과분 제거
+            self._conn.execute("DELETE FROM cache_entries WHERE expires_at < ?", (now,))
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE key IN ("
+                "SELECT key FROM cache_entries ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def version(self, namespace):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version FROM cache_versions WHERE namespace = ?", (namespace,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def bump_version(self, namespace):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO cache_versions (namespace, version) VALUES (?, 1) "
+                "ON CONFLICT(namespace) DO UPDATE SET version = version + 1",
+                (namespace,),
+            )
+
+    def size(self):
+        with self._lock:
+            return self._conn.execute("SELECT count(*) FROM cache_entries").fetchone()[0]
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries")
+
+
+class ReadCache:
+    def __init__(self, backend=None, ttl=READ_CACHE_TTL):
+        self.backend = backend
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._hits = defaultdict(int)
+        self._misses = defaultdict(int)
+
+    def get_or_load(self, namespace, key, loader):
+        """Return the cached value for (namespace, key), calling loader() on a miss"""
+        if self.backend is None:
+            return loader()
+        version = self.backend.version(namespace)
+        full_key = f"{namespace}:{version}:{key}"
+        value = self.backend.get(full_key)
+        if value is not _MISS:
+            with self._lock:
+                self._hits[namespace] += 1
+            return value
+
+        with self._lock:
+            self._misses[namespace] += 1
+        value = loader()
+        self.backend.set(full_key, value, self.ttl)
+        return value
+
+    def invalidate(self, namespace):
+        if self.backend is not None:
+            self.backend.bump_version(namespace)
+
+    def stats(self):
+        if self.backend is None:
+            return {"backend": "none"}
+        with self._lock:
+            namespaces = {
+                namespace: {"hits": self._hits[namespace], "misses": self._misses[namespace]}
+                for namespace in sorted(set(self._hits) | set(self._misses))
+            }
+        return {
+            "backend": self.backend.name,
+            "ttl": self.ttl,
+            "entries": self.backend.size(),
+            "max_entries": self.backend.max_entries,
+            "namespaces": namespaces,
+        }
+
+
+def create_backend(name):
+    name = name.lower()
+    if name == "none":
+        return None
+    if name == "sqlite":
+        return SQLiteCacheBackend(os.getenv("READ_CACHE_PATH", "./read_cache.db"))
+    return MemoryCacheBackend()
+
+
+read_cache = ReadCache(create_backend(os.getenv("READ_CACHE_BACKEND", "memory")))
@@ -0,0 +1,209 @@
+"""
+Related-topic (연관 토픽) recommendations from TF-IDF vectors.
+
+Every topic becomes a sparse TF-IDF vector over its title words, keywords
+(each keyword is one term) and content words (text_terms.terms), L2-normalized
+and cut to its MAX_TERMS strongest terms. Cosine similarity is computed
+through an inverted index of those vectors, skipping terms that occur in more
+than MAX_DF_RATIO of all topics, and each topic keeps its TOP_K most similar
+topics precomputed, so a lookup is a dict access.
+
+Like search_index, the index is a per-process LiveIndex built in the
+background at startup. index_topic() only touches the affected rows: the
+changed topic's own list is recomputed, topics that listed it are recomputed,
+and every other topic it now outscores gets it merged into its list. Bulk imports go through the same path, topic by topic,
+in the background (topic_indexes). IDF weights of untouched topics are not
+refreshed on single writes; after a bulk import of REBUILD_AFTER_TOPICS or
+more, topic_indexes rebuilds the index next to the live one and swaps it in.
+"""
+import heapq
+import math
+import os
+from collections import Counter, defaultdict
+from itertools import islice
+
+from sqlalchemy.orm import Session, selectinload
+
+import models
+from live_index import LiveIndex
+from search_index import normalize
+from text_terms import terms
+
+TOP_K = int(os.getenv("RELATED_TOP_K", "10"))
+MAX_TERMS = 40
+PROBE_TERMS = 10
+CANDIDATES = 50
+MAX_DF_RATIO = 0.2
+MIN_DOCS_FOR_DF_CUT = 50
+
+# 필드별 가중치 (제목/키워드 > 본문)
+FIELD_WEIGHTS = {
+    "title": 3.0,
+    "keyword": 3.0,
+    "content": 1.0,
+}
+
+
+def topic_terms(topic):
+    """Weighted term frequencies of a Topic ORM object"""
+    counts = Counter()
+    for term in terms(topic.title):
+        counts[term.lower()] += FIELD_WEIGHTS["title"]
+    for keyword in topic.keywords:
+        term = normalize(keyword.keyword)
+        if term:
+            counts[term] += FIELD_WEIGHTS["keyword"]
+    for term in terms(topic.content):
+        counts[term.lower()] += FIELD_WEIGHTS["content"]
+    return counts
+
+
+class RelatedTopicIndex(LiveIndex):
+    global_weights = True
+
+    def __init__(self):
+        super().__init__()
+        self._terms = {}  # topic_id -> Counter(term), kept to re-vectorize and unindex
+        self._df = Counter()
+        self._vectors = {}  # topic_id -> {term: weight}
+        self._postings = defaultdict(dict)  # term -> {topic_id: weight}
+        self._neighbours = {}  # topic_id -> [(score, other_id)] best first
+        self._referrers = defaultdict(set)  # topic_id -> topics whose list contains it
+
+    def _document(self, topic):
+        return topic_terms(topic)
+
+    def _load(self, db: Session):
+        topics = db.query(models.Topic).options(selectinload(models.Topic.keywords)).yield_per(500)
+        for topic in topics:
+            counts = topic_terms(topic)
+            self._terms[topic.id] = counts
+            self._df.update(counts.keys())
+        for topic_id, counts in self._terms.items():
+            self._set_vector(topic_id, counts)
+        for topic_id in self._terms:
+            self._set_neighbours(topic_id, self._score(topic_id))
+
+    def _replace(self, topic_id, counts):
+        """Re-vectorize one topic and update the lists it affects"""
+        stale = self._referrers.get(topic_id, set()) - {topic_id}
+        self._remove(topic_id)
+        scores = {}
+        if counts is not None:
+            self._terms[topic_id] = counts
+            self._df.update(counts.keys())
+            self._set_vector(topic_id, counts)
+            scores = self._score(topic_id)
+            self._set_neighbours(topic_id, scores)
+        # 이 토픽을 목록에 갖고 있던 토픽은 다시 계산, 나머지는 새 점수가 목록에 들어가는지만 확인
+        for other_id in stale:
+            if other_id in self._terms:
+                self._set_neighbours(other_id, self._score(other_id))
+        for other_id, score in scores.items():
+            if other_id not in stale:
+                self._offer(other_id, topic_id, score)
+
+    def _reset(self):
+        self._terms.clear()
+        self._df.clear()
+        self._vectors.clear()
+        self._postings.clear()
+        self._neighbours.clear()
+        self._referrers.clear()
+
+    def related(self, topic_id, limit=TOP_K):
+        """[(topic_id, score)] of the most similar topics"""
+        with self._lock:
+            return [(other_id, score) for score, other_id in self._neighbours.get(topic_id, [])[:limit]]
+
+    def _max_df(self):
+        total = len(self._terms)
+        return total * MAX_DF_RATIO if total >= MIN_DOCS_FOR_DF_CUT else total
+
+    def _set_vector(self, topic_id, counts):
+        total = len(self._terms)
+        max_df = self._max_df()
+        weights = {}
+        for term, tf in counts.items():
+            df = self._df[term]
+            if df > max_df:
+                continue  # 대부분의 토픽에 나오는 단어는 유사도에 기여하지 않음
+            weights[term] = (1 + math.log(tf)) * (math.log((1 + total) / (1 + df)) + 1)
+        strongest = heapq.nlargest(MAX_TERMS, weights.items(), key=lambda item: item[1])
+        norm = math.sqrt(sum(weight * weight for _, weight in strongest)) or 1.0
+        vector = {term: weight / norm for term, weight in strongest}
+        self._vectors[topic_id] = vector
+        for term, weight in vector.items():
+            self._postings[term][topic_id] = weight
+
+    def _score(self, topic_id):
+        """Cosine similarity of a topic to its most promising candidates.
+
+        Candidates come from the postings of the topic's PROBE_TERMS strongest
+        terms only (the rarest, so the shortest lists); the best CANDIDATES by
+        that partial score then get their exact cosine over the full vectors.
+        """
+        vector = self._vectors.get(topic_id)
+        if not vector:
+            return {}
+        partial = {}
+        get = partial.get
+        max_df = self._max_df()
+        for term, weight in islice(vector.items(), PROBE_TERMS):  # 가중치 내림차순
+            entry = self._postings.get(term)
+            if not entry or len(entry) > max_df:
+                continue
+            for other_id, other_weight in entry.items():
+                partial[other_id] = get(other_id, 0.0) + weight * other_weight
+        partial.pop(topic_id, None)
+
+        scores = {}
+        for other_id in heapq.nlargest(CANDIDATES, partial, key=partial.__getitem__):
+            other = self._vectors[other_id]
+            scores[other_id] = sum(vector[term] * other[term] for term in vector.keys() & other.keys())
+        return scores
+
+    def _set_neighbours(self, topic_id, scores):
+        for _, other_id in self._neighbours.get(topic_id, ()):
+            self._referrers[other_id].discard(topic_id)
+        best = heapq.nlargest(TOP_K, scores, key=scores.__getitem__)
+        self._neighbours[topic_id] = sorted(
+            ((round(scores[other_id], 4), other_id) for other_id in best), key=lambda item: (-item[0], item[1])
+        )
+        for _, other_id in self._neighbours[topic_id]:
+            self._referrers[other_id].add(topic_id)
+
+    def _offer(self, topic_id, candidate_id, score):
+        """Merge one candidate into a topic's list if it ranks within TOP_K"""
+        neighbours = self._neighbours.setdefault(topic_id, [])
+        score = round(score, 4)
+        if len(neighbours) >= TOP_K and (score, -candidate_id) <= (neighbours[-1][0], -neighbours[-1][1]):
+            return
+        neighbours.append((score, candidate_id))
+        neighbours.sort(key=lambda item: (-item[0], item[1]))
+        self._referrers[candidate_id].add(topic_id)
+        if len(neighbours) > TOP_K:
+            _, dropped_id = neighbours.pop()
+            self._referrers[dropped_id].discard(topic_id)
+
+    def _remove(self, topic_id):
+        counts = self._terms.pop(topic_id, None)
+        if counts is None:
+            return
+        self._df.subtract(counts.keys())
+        for term in counts:
+            if self._df[term] <= 0:
+                del self._df[term]
+        for term in self._vectors.pop(topic_id, {}):
+            entry = self._postings.get(term)
+            if entry is None:
+                continue
+            entry.pop(topic_id, None)
+            if not entry:
+                del self._postings[term]
+        for _, other_id in self._neighbours.pop(topic_id, ()):
+            self._referrers[other_id].discard(topic_id)
+        self._referrers.pop(topic_id, None)
+
+
+related_index = RelatedTopicIndex()
@@ -0,0 +1,316 @@
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from typing import List, Optional
+import math
+import os
+import statistics
+import models
+import schemas
+import submission_storage
+from database_config import SessionLocal, get_db
+
+router = APIRouter(prefix="/api/assignments", tags=["assignments"])
+
+@router.get("/", response_model=List[schemas.Assignment])
+def get_assignments(db: Session = Depends(get_db)):
+    return db.query(models.Assignment).order_by(models.Assignment.id.desc()).all()
+
+@router.post("/", response_model=schemas.Assignment)
+def create_assignment(assignment: schemas.AssignmentCreate, db: Session = Depends(get_db)):
+    try:
+        assignment_type = models.AssignmentType(assignment.type)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="type must be one of: outline, self_test")
+    db_assignment = models.Assignment(
+        type=assignment_type,
+        title=assignment.title,
+        description=assignment.description,
+        due_date=assignment.due_date
+    )
+    db.add(db_assignment)
+    db.commit()
+    db.refresh(db_assignment)
+    return db_assignment
+
+@router.get("/{assignment_id}", response_model=schemas.Assignment)
+def get_assignment(assignment_id: int, db: Session = Depends(get_db)):
+    assignment = db.query(models.Assignment).filter(models.Assignment.id == assignment_id).first()
+    if not assignment:
+        raise HTTPException(status_code=404, detail="Assignment not found")
+    return assignment
+
+@router.delete("/{assignment_id}")
+def delete_assignment(assignment_id: int, db: Session = Depends(get_db)):
+    assignment = db.query(models.Assignment).filter(models.Assignment.id == assignment_id).first()
+    if not assignment:
+        raise HTTPException(status_code=404, detail="Assignment not found")
+
+    paths = {row.file_path for row in db.query(models.Submission.file_path).filter(
+        models.Submission.assignment_id == assignment_id
+    )}
+    db.query(models.Submission).filter(models.Submission.assignment_id == assignment_id).delete()
+    db.delete(assignment)
+    db.commit()
+    for path in paths:
+        _release_object(path)
+    return {"message": "Assignment deleted successfully"}
+
+@router.get("/{assignment_id}/submissions", response_model=List[schemas.Submission])
+def get_submissions(assignment_id: int, db: Session = Depends(get_db)):
+    return db.query(models.Submission).filter(
+        models.Submission.assignment_id == assignment_id
+    ).order_by(models.Submission.user_id).all()
+
+GRADE_FIELDS = ("score", "feedback")
+
+def grade_stats(assignment_id: int, scores: List[Optional[float]], bucket_size: float) -> schemas.GradeStats:
+    """Mean / median / histogram of the graded scores of one assignment"""
+    graded = sorted(score for score in scores if score is not None)
+    stats = schemas.GradeStats(assignment_id=assignment_id, submissions=len(scores), graded=len(graded))
+    if graded:
+        stats.mean = round(statistics.fmean(graded), 2)
+        stats.median = statistics.median(graded)
+        stats.min, stats.max = graded[0], graded[-1]
+        for score in graded:
+            low = math.floor(score / bucket_size) * bucket_size
+            label = f"{low:g}-{low + bucket_size:g}"
+            stats.distribution[label] = stats.distribution.get(label, 0) + 1
+    return stats
+
+def apply_grades(db: Session, batches: List[schemas.AssignmentGrades], bucket_size: float):
+    """Validate every grade, write them in one transaction and return (updated, [GradeStats])"""
+    assignment_ids = {batch.assignment_id for batch in batches}
+    found = {row.id for row in db.query(models.Assignment.id).filter(models.Assignment.id.in_(assignment_ids))}
+    if found != assignment_ids:
+        raise HTTPException(status_code=404, detail=f"Assignment not found: {sorted(assignment_ids - found)}")
+
+    # 해당 과제들의 제출물을 한 번에 읽어 검증과 통계에 함께 사용
+    rows = db.query(
+        models.Submission.id, models.Submission.assignment_id, models.Submission.user_id, models.Submission.score
+    ).filter(models.Submission.assignment_id.in_(assignment_ids)).all()
+    submissions = {row.id: row for row in rows}
+    by_user = {(row.assignment_id, row.user_id): row.id for row in rows}
+    scores = {row.id: row.score for row in rows}
+
+    updates = {}
+    seen = set()
+    errors = []
+    for batch in batches:
+        for row_number, grade in enumerate(batch.grades, start=1):
+            def error(message):
+                errors.append({"assignment_id": batch.assignment_id, "row": row_number, "message": message})
+
+            if grade.submission_id is not None:
+                submission = submissions.get(grade.submission_id)
+                submission_id = submission.id if submission and submission.assignment_id == batch.assignment_id else None
+            elif grade.user_id is not None:
+                submission_id = by_user.get((batch.assignment_id, grade.user_id))
+            else:
+                error("submission_id or user_id is required")
+                continue
+            if submission_id is None:
+                error("Submission not found for this assignment")
+                continue
+            if submission_id in seen:
+                error("Submission graded more than once")
+                continue
+            fields = tuple(field for field in GRADE_FIELDS if field in grade.model_fields_set)
+            if not fields:
+                error("Nothing to update")
+                continue
+            seen.add(submission_id)
+            # 같은 컬럼 조합끼리 묶어 executemany 한 번으로 전송
+            updates.setdefault(fields, []).append(
+                {"id": submission_id, **{field: getattr(grade, field) for field in fields}}
+            )
+            if "score" in fields:
+                scores[submission_id] = grade.score
+    if errors:
+        raise HTTPException(status_code=422, detail={"message": "Invalid grades", "errors": errors})
+
+    for params in updates.values():
+        db.execute(update(models.Submission), params)
+    db.commit()
+
+    per_assignment = {assignment_id: [] for assignment_id in assignment_ids}
+    for row in rows:
+        per_assignment[row.assignment_id].append(scores[row.id])
+    summaries = [
+        grade_stats(assignment_id, per_assignment[assignment_id], bucket_size)
+        for assignment_id in sorted(assignment_ids)
+    ]
+    return len(seen), summaries
+
+@router.put("/grades", response_model=schemas.BulkGradeResult)
+def grade_assignments(
+    payload: schemas.BulkGradeRequest,
+    bucket_size: float = Query(10, gt=0),
+    db: Session = Depends(get_db)
+):
+    """여러 과제의 점수/피드백을 한 번에 반영 (전부 유효할 때만 하나의 트랜잭션으로 저장)"""
+    updated, summaries = apply_grades(db, payload.assignments, bucket_size)
+    return schemas.BulkGradeResult(updated=updated, assignments=summaries)
+
+@router.put("/{assignment_id}/grades", response_model=schemas.BulkGradeResult)
+def grade_assignment(
+    assignment_id: int,
+    grades: List[schemas.GradeEntry],
+    bucket_size: float = Query(10, gt=0),
+    db: Session = Depends(get_db)
+):
+    updated, summaries = apply_grades(
+        db, [schemas.AssignmentGrades(assignment_id=assignment_id, grades=grades)], bucket_size
+    )
+    return schemas.BulkGradeResult(updated=updated, assignments=summaries)
+
+@router.get("/{assignment_id}/grades", response_model=schemas.GradeStats)
+def get_grade_stats(assignment_id: int, bucket_size: float = Query(10, gt=0), db: Session = Depends(get_db)):
+    if not db.query(models.Assignment.id).filter(models.Assignment.id == assignment_id).first():
+        raise HTTPException(status_code=404, detail="Assignment not found")
+    scores = [row.score for row in db.query(models.Submission.score).filter(
+        models.Submission.assignment_id == assignment_id
+    )]
+    return grade_stats(assignment_id, scores, bucket_size)
+
+RECORD_ATTEMPTS = 5
+
+def _is_referenced(path: str):
+    # 새 세션: 다른 요청이 방금 커밋한 제출도 보이도록
+    db = SessionLocal()
+    try:
+        return db.query(models.Submission.id).filter(models.Submission.file_path == path).first() is not None
+    finally:
+        db.close()
+
+def _release_object(path: Optional[str]):
+    """Delete a stored file once no submission refers to it any more (call after the commit)"""
+    if path and not _is_referenced(path):
+        submission_storage.release(path, lambda: _is_referenced(path))
+
+def _assignment_exists(assignment_id: int):
+    db = SessionLocal()
+    try:
+        return db.query(models.Assignment.id).filter(models.Assignment.id == assignment_id).first() is not None
+    finally:
+        db.close()
+
+def _record_submission(assignment_id, user_id, filename, sha256, size, tmp_path):
+    """Record the upload, then publish its file (the row exists first, so a concurrent release keeps the object)"""
+    path = submission_storage.object_path(sha256)
+    db = SessionLocal()
+    try:
+        for _ in range(RECORD_ATTEMPTS):
+            submission = db.query(models.Submission).filter(
+                models.Submission.assignment_id == assignment_id,
+                models.Submission.user_id == user_id
+            ).first()
+            if submission and submission.sha256 == sha256:
+                submission_storage.publish(tmp_path, path)
+                result = schemas.SubmissionUploadResult.model_validate(submission)
+                result.deduplicated = True
+                return result
+
+            values = dict(
+                file_path=path, sha256=sha256, file_size=size,
+                original_filename=filename, submitted_at=datetime.utcnow()
+            )
+            try:
+                if submission is None:
+                    old_path = None
+                    submission = models.Submission(assignment_id=assignment_id, user_id=user_id, **values)
+                    db.add(submission)
+                else:
+                    old_path = submission.file_path
+                    # 읽은 뒤 다른 제출이 먼저 바꿨다면 0행 - 다시 읽어서 그 파일을 정리 대상으로 삼음
+                    # 내용이 바뀐 재제출은 미채점 상태로 (이전 점수/피드백은 이전 파일에 대한 것)
+                    result = db.execute(
+                        update(models.Submission)
+                        .where(models.Submission.id == submission.id, models.Submission.sha256 == submission.sha256)
+                        .values(**values, **dict.fromkeys(GRADE_FIELDS))
+                        .execution_options(synchronize_session=False)
+                    )
+                    if result.rowcount == 0:
+                        db.rollback()
+                        continue
+                db.commit()
+                break
+            except IntegrityError:
+                # 같은 학생의 첫 제출이 동시에 기록됨: 먼저 생긴 행을 갱신
+                db.rollback()
+        else:
+            raise HTTPException(status_code=409, detail="Concurrent submissions, please retry")
+
+        submission_storage.publish(tmp_path, path)
+        if old_path != path:
+            _release_object(old_path)
+        db.refresh(submission)
+        return schemas.SubmissionUploadResult.model_validate(submission)
+    finally:
+        submission_storage.discard(tmp_path)  # 게시되지 않은 임시 파일만 남아 있음
+        db.close()
+
+@router.post("/{assignment_id}/submissions", response_model=schemas.SubmissionUploadResult)
+async def upload_submission(
+    assignment_id: int,
+    request: Request,
+    user_id: str = Query(..., min_length=1, max_length=100),
+    filename: Optional[str] = Query(None, max_length=255),
+):
+    """PDF 파일을 요청 본문(Content-Type: application/pdf) 그대로 전송 - 메모리에 올리지 않고 디스크로 스트리밍"""
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > submission_storage.MAX_SUBMISSION_BYTES:
+        raise HTTPException(status_code=413, detail="File too large")
+    if not await run_in_threadpool(_assignment_exists, assignment_id):
+        raise HTTPException(status_code=404, detail="Assignment not found")
+
+    try:
+        sha256, size, tmp_path = await submission_storage.store_stream(request.stream())
+    except submission_storage.UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except submission_storage.InvalidUpload as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return await run_in_threadpool(_record_submission, assignment_id, user_id, filename, sha256, size, tmp_path)
+
+@router.get("/{assignment_id}/submissions/{submission_id}/file")
+def download_submission(assignment_id: int, submission_id: int, db: Session = Depends(get_db)):
+    """제출 파일 다운로드 (Range 요청 지원, 파일을 메모리에 올리지 않고 전송)"""
+    submission = db.query(
+        models.Submission.file_path, models.Submission.sha256, models.Submission.original_filename
+    ).filter(
+        models.Submission.id == submission_id,
+        models.Submission.assignment_id == assignment_id
+    ).first()
+    if not submission or not submission.file_path:
+        raise HTTPException(status_code=404, detail="Submission not found")
+    path = submission_storage.absolute_path(submission.file_path)
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Submission file missing")
+
+    return FileResponse(
+        path,
+        media_type="application/pdf",
+        filename=submission.original_filename or f"submission_{submission_id}.pdf",
+        # 내용 주소 저장이므로 해시가 곧 ETag
+        headers={"ETag": f'"{submission.sha256}"', "Cache-Control": "private, no-cache"}
+    )
+
+@router.delete("/{assignment_id}/submissions/{submission_id}")
+def delete_submission(assignment_id: int, submission_id: int, db: Session = Depends(get_db)):
+    submission = db.query(models.Submission).filter(
+        models.Submission.id == submission_id,
+        models.Submission.assignment_id == assignment_id
+    ).first()
+    if not submission:
+        raise HTTPException(status_code=404, detail="Submission not found")
+
+    path = submission.file_path
+    db.delete(submission)
+    db.commit()
+    _release_object(path)
+    return {"message": "Submission deleted successfully"}
@@ -1,15 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from typing import List, Optional
 import models
 import schemas
+import category_tree
+import conditional
 from database_config import get_db
+from read_cache import read_cache
+from routers.topics import query_topics
 
 router = APIRouter(prefix="/api/categories", tags=["categories"])
 
+def cached_categories(db: Session):
+    def load():
+        categories = db.query(models.Category).order_by(models.Category.name).all()
+        return [schemas.Category.model_validate(cat).model_dump(mode="json") for cat in categories]
+    return read_cache.get_or_load("categories", "list", load)
+
 @router.get("/", response_model=List[schemas.Category])
-def get_categories(db: Session = Depends(get_db)):
-    categories = db.query(models.Category).order_by(models.Category.name).all()
+def get_categories(request: Request, response: Response, db: Session = Depends(get_db)):
+    categories = cached_categories(db)
+    not_modified = conditional.check(request, response, conditional.make_etag(categories))
+    if not_modified:
+        return not_modified
     return categories
 
 @router.post("/", response_model=schemas.Category)
@@ -20,8 +34,25 @@ def create_category(category: schemas.CategoryCreate, db: Session = Depends(get_
         description=category.description
     )
     db.add(db_category)
+    db.flush()
+    
+    parent_path = None
+    if category.parent_id is not None:
+        parent = db.query(models.Category).filter(models.Category.id == category.parent_id).first()
+        if not parent:
+            raise HTTPException(status_code=404, detail="Parent category not found")
+        parent_path = parent.path
+    db_category.path = category_tree.child_path(parent_path, db_category.id)
+    
+    # 같은 이름으로 먼저 등록된 토픽을 새 카테고리에 연결
+    db.query(models.Topic).filter(
+        models.Topic.category_id.is_(None),
+        models.Topic.category == db_category.name
+    ).update({models.Topic.category_id: db_category.id}, synchronize_session=False)
+    
     db.commit()
     db.refresh(db_category)
+    read_cache.invalidate("categories")
     return db_category
 
 @router.put("/{category_id}", response_model=schemas.Category)
@@ -34,15 +65,29 @@ def update_category(
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
     
-    if category_update.name:
+    if category_update.name and category_update.name != category.name:
         category.name = category_update.name
+        # 토픽의 카테고리 이름도 한 번에 갱신 (이름 변경으로 토픽이 분리되지 않도록)
+        db.query(models.Topic).filter(models.Topic.category_id == category_id).update(
+            {models.Topic.category: category_update.name}, synchronize_session=False
+        )
     if category_update.description is not None:
         category.description = category_update.description
-    if category_update.parent_id is not None:
-        category.parent_id = category_update.parent_id
+    if category_update.parent_id is not None and category_update.parent_id != category.parent_id:
+        parent = db.query(models.Category).filter(models.Category.id == category_update.parent_id).first()
+        if not parent:
+            raise HTTPException(status_code=404, detail="Parent category not found")
+        if parent.path.startswith(category.path):
+            raise HTTPException(status_code=400, detail="Cannot move category under itself")
+        
+        # 자신과 하위 카테고리의 path를 한 번에 갱신
+        old_path = category.path
+        category.parent_id = parent.id
+        category_tree.move_subtree(db, old_path, category_tree.child_path(parent.path, category.id))
     
     db.commit()
     db.refresh(category)
+    read_cache.invalidate("categories")
     return category
 
 @router.delete("/{category_id}")
@@ -57,31 +102,69 @@ def delete_category(category_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=400, detail="Cannot delete category with children")
     
     # 이 카테고리를 사용하는 토픽이 있는지 확인
-    topics_using_category = db.query(models.Topic).filter(models.Topic.category == category.name).first()
+    topics_using_category = db.query(models.Topic.id).filter(models.Topic.category_id == category_id).first()
     if topics_using_category:
         raise HTTPException(status_code=400, detail="Cannot delete category in use by topics")
     
     db.delete(category)
     db.commit()
+    read_cache.invalidate("categories")
     return {"message": "Category deleted successfully"}
 
 @router.get("/tree")
-def get_category_tree(db: Session = Depends(get_db)):
+def get_category_tree(request: Request, response: Response, db: Session = Depends(get_db)):
     """카테고리를 트리 구조로 반환"""
-    categories = db.query(models.Category).all()
+    tree = read_cache.get_or_load(
+        "categories", "tree",
+        lambda: category_tree.build_tree(db.query(models.Category).order_by(models.Category.id).all())
+    )
+    not_modified = conditional.check(request, response, conditional.make_etag(tree))
+    if not_modified:
+        return not_modified
+    return tree
+
+@router.get("/counts", response_model=List[schemas.CategoryTopicCount])
+def get_category_topic_counts(db: Session = Depends(get_db)):
+    """카테고리별 토픽 수 (category_id 인덱스만으로 집계)"""
+    counts = dict(
+        db.query(models.Topic.category_id, func.count(models.Topic.id))
+        .filter(models.Topic.category_id.isnot(None))
+        .group_by(models.Topic.category_id)
+        .all()
+    )
+    categories = db.query(models.Category.id, models.Category.name, models.Category.path).order_by(
+        models.Category.path
+    ).all()
     
-    def build_tree(parent_id=None):
-        tree = []
-        for cat in categories:
-            if cat.parent_id == parent_id:
-                children = build_tree(cat.id)
-                tree.append({
-                    "id": cat.id,
-                    "name": cat.name,
-                    "description": cat.description,
-                    "parent_id": cat.parent_id,
-                    "children": children
-                })
-        return tree
+    # path의 각 조상에게 직접 토픽 수를 더해 하위 트리 합계 계산
+    subtree = {}
+    for cat in categories:
+        for ancestor_id in (cat.path or f"/{cat.id}/").strip("/").split("/"):
+            subtree[int(ancestor_id)] = subtree.get(int(ancestor_id), 0) + counts.get(cat.id, 0)
+    return [
+        schemas.CategoryTopicCount(
+            category_id=cat.id,
+            name=cat.name,
+            topic_count=counts.get(cat.id, 0),
+            subtree_topic_count=subtree.get(cat.id, 0)
+        )
+        for cat in categories
+    ]
+
+@router.get("/{category_id}/topics", response_model=List[schemas.Topic])
+def get_category_subtree_topics(
+    category_id: int,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(get_db)
+):
+    """카테고리와 모든 하위 카테고리에 속한 토픽 (예: 네트워크 전체)"""
+    category = db.query(models.Category.path).filter(models.Category.id == category_id).first()
+    if not category:
+        raise HTTPException(status_code=404, detail="Category not found")
     
-    return build_tree()
\ No newline at end of file
+    ids = db.query(models.Category.id).filter(category_tree.subtree_clause(db, category.path))
+    topics = query_topics(db).filter(
+        models.Topic.category_id.in_(ids.scalar_subquery())
+    ).order_by(models.Topic.id).offset(skip).limit(limit).all()
+    return topics
\ No newline at end of file
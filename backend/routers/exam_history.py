@@ -0,0 +1,116 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from typing import List, Optional
+import category_tree
+import conditional
+import exam_generator
+import exam_stats
+import models
+import schemas
+from database_config import get_db
+
+router = APIRouter(prefix="/api/exam-history", tags=["exam-history"])
+
+@router.post("/", response_model=List[schemas.ExamHistory])
+def create_exam_history(entries: List[schemas.ExamHistoryEntry], db: Session = Depends(get_db)):
+    """기출 기록 추가 (한 회차 전체를 한 번에) - 출제 빈도 집계도 같은 트랜잭션에서 갱신"""
+    topic_ids = {entry.topic_id for entry in entries}
+    found = {row.id for row in db.query(models.Topic.id).filter(models.Topic.id.in_(topic_ids))}
+    if found != topic_ids:
+        raise HTTPException(status_code=400, detail=f"Topic not found: {sorted(topic_ids - found)}")
+    
+    rows = [models.ExamHistory(**entry.model_dump()) for entry in entries]
+    db.add_all(rows)
+    db.flush()
+    exam_stats.record(db, rows)
+    created = [schemas.ExamHistory.model_validate(row) for row in rows]
+    db.commit()
+    exam_generator.invalidate_pools()
+    return created
+
+@router.delete("/{history_id}")
+def delete_exam_history(history_id: int, db: Session = Depends(get_db)):
+    history = db.query(models.ExamHistory).filter(models.ExamHistory.id == history_id).first()
+    if not history:
+        raise HTTPException(status_code=404, detail="Exam history not found")
+    
+    topic_id = history.topic_id
+    db.delete(history)
+    db.flush()
+    exam_stats.recompute_topics(db, [topic_id])
+    db.commit()
+    exam_generator.invalidate_pools()
+    return {"message": "Exam history deleted successfully"}
+
+@router.get("/frequent", response_model=List[schemas.TopicFrequency])
+def get_frequent_topics(
+    request: Request,
+    response: Response,
+    category_id: Optional[int] = Query(None, description="하위 카테고리 포함"),
+    min_count: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=200),
+    db: Session = Depends(get_db)
+):
+    """자주 출제된 토픽 순위 (topic_exam_stats만 조회)"""
+    ids = None
+    if category_id is not None:
+        ids = category_tree.subtree_ids(db, category_id)
+        if ids is None:
+            raise HTTPException(status_code=404, detail="Category not found")
+    # 응답의 제목/카테고리와 하위 카테고리 소속은 토픽 행에서 오므로 토픽 변경 시각과 하위 카테고리 목록도 검증값에 포함
+    topics_modified_at = db.query(func.max(models.topic_modified_at)).scalar()
+    not_modified = conditional.check(
+        request, response,
+        conditional.make_etag(
+            "frequent", exam_stats.version(db), topics_modified_at, sorted(ids or ()), category_id, min_count, limit
+        )
+    )
+    if not_modified:
+        return not_modified
+    
+    stats = models.TopicExamStats
+    query = db.query(stats, models.Topic.title, models.Topic.category_id, models.Topic.category).join(
+        models.Topic, models.Topic.id == stats.topic_id
+    ).filter(stats.exam_count >= min_count)
+    if ids is not None:
+        query = query.filter(models.Topic.category_id.in_(ids))
+    rows = query.order_by(stats.exam_count.desc(), stats.topic_id).limit(limit).all()
+    return [
+        schemas.TopicFrequency(
+            topic_id=row.TopicExamStats.topic_id,
+            title=row.title,
+            category_id=row.category_id,
+            category=row.category,
+            exam_count=row.TopicExamStats.exam_count,
+            last_round=row.TopicExamStats.last_round,
+            average_score=exam_stats.average(row.TopicExamStats.score_sum, row.TopicExamStats.score_count)
+        )
+        for row in rows
+    ]
+
+@router.get("/categories", response_model=List[schemas.CategoryFrequency])
+def get_category_frequencies(db: Session = Depends(get_db)):
+    """카테고리별 출제 빈도 (category_exam_stats만 조회)"""
+    rows = db.query(models.CategoryExamStats, models.Category.name).join(
+        models.Category, models.Category.id == models.CategoryExamStats.category_id
+    ).order_by(models.CategoryExamStats.exam_count.desc(), models.CategoryExamStats.category_id).all()
+    return [
+        schemas.CategoryFrequency(
+            category_id=stats.category_id,
+            name=name,
+            topic_count=stats.topic_count,
+            exam_count=stats.exam_count,
+            last_round=stats.last_round,
+            average_score=exam_stats.average(stats.score_sum, stats.score_count)
+        )
+        for stats, name in rows
+    ]
+
+@router.post("/rebuild")
+def rebuild_exam_stats(db: Session = Depends(get_db)):
+    """집계 테이블을 exam_history 전체에서 다시 계산 (직접 DB를 수정한 경우 등)"""
+    exam_stats.rebuild(db)
+    db.commit()
+    exam_generator.invalidate_pools()
+    return {"topics": exam_stats.version(db)[0]}
@@ -1,24 +1,47 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
+import conditional
 from database_config import get_db
 from models import Template
+from read_cache import read_cache
 from schemas import TemplateCreate, TemplateUpdate, Template as TemplateSchema
 
 router = APIRouter(prefix="/api/templates", tags=["templates"])
 
 @router.get("/", response_model=List[TemplateSchema])
-def get_templates(category: Optional[str] = None, db: Session = Depends(get_db)):
-    query = db.query(Template)
-    if category:
-        query = query.filter(Template.category == category)
-    return query.order_by(Template.name).all()
+def get_templates(
+    request: Request,
+    response: Response,
+    category: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    def load():
+        query = db.query(Template)
+        if category:
+            query = query.filter(Template.category == category)
+        return [TemplateSchema.model_validate(t).model_dump(mode="json") for t in query.order_by(Template.name)]
+    templates = read_cache.get_or_load("templates", f"list:{category or ''}", load)
+    not_modified = conditional.check(request, response, conditional.make_etag(templates))
+    if not_modified:
+        return not_modified
+    return templates
 
 @router.get("/{template_id}", response_model=TemplateSchema)
-def get_template(template_id: int, db: Session = Depends(get_db)):
-    template = db.query(Template).filter(Template.id == template_id).first()
+def get_template(template_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
+    def load():
+        template = db.query(Template).filter(Template.id == template_id).first()
+        return TemplateSchema.model_validate(template).model_dump(mode="json") if template else None
+    template = read_cache.get_or_load("templates", f"item:{template_id}", load)
     if not template:
         raise HTTPException(status_code=404, detail="Template not found")
+    
+    last_modified = datetime.fromisoformat(template["updated_at"])
+    etag = conditional.make_etag("template", template_id, template["updated_at"])
+    not_modified = conditional.check(request, response, etag, last_modified)
+    if not_modified:
+        return not_modified
     return template
 
 @router.post("/", response_model=TemplateSchema)
@@ -27,6 +50,7 @@ def create_template(template: TemplateCreate, db: Session = Depends(get_db)):
     db.add(db_template)
     db.commit()
     db.refresh(db_template)
+    read_cache.invalidate("templates")
     return db_template
 
 @router.put("/{template_id}", response_model=TemplateSchema)
@@ -41,6 +65,7 @@ def update_template(template_id: int, template: TemplateUpdate, db: Session = De
     
     db.commit()
     db.refresh(db_template)
+    read_cache.invalidate("templates")
     return db_template
 
 @router.delete("/{template_id}")
@@ -51,4 +76,5 @@ def delete_template(template_id: int, db: Session = Depends(get_db)):
     
     db.delete(db_template)
     db.commit()
+    read_cache.invalidate("templates")
     return {"message": "Template deleted successfully"}
\ No newline at end of file
@@ -1,18 +1,88 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
-from typing import List, Optional
+import csv
+import json
+import os
+import shutil
+import tempfile
+import zlib
+from datetime import datetime
+from fastapi import APIRouter, Body, Depends, File, HTTPException, Query, Request, Response, UploadFile
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select, tuple_, update
+from sqlalchemy.orm import Session, selectinload
+from typing import Any, List, Optional
+import conditional
+import exam_generator
+import exam_stats
 import models
+import category_tree
+import pdf_export
+import pdf_ingest
 import schemas
-from database_config import get_db
+import topic_import
+import topic_indexes
+import versioning
+from autocomplete import autocomplete_index
+from database_config import SessionLocal, get_db
+from pagination import decode_cursor, encode_cursor, parse_datetime, parse_id
+from related_index import TOP_K as TOP_K_RELATED, related_index
+from search_backend import get_search_backend
 
 router = APIRouter(prefix="/api/topics", tags=["topics"])
 
+def topic_loads():
+    """Loader options that batch-load every relationship schemas.Topic serializes"""
+    return (
+        selectinload(models.Topic.keywords),
+        selectinload(models.Topic.mnemonics),
+        selectinload(models.Topic.exam_histories)
+    )
+
+def query_topics(db: Session):
+    return db.query(models.Topic).options(*topic_loads())
+
+def select_topics():
+    """select() form of query_topics, shared with the async handlers (async_routes)"""
+    return select(models.Topic).options(*topic_loads())
+
+def load_topic(db: Session, topic_id: int):
+    return query_topics(db).filter(models.Topic.id == topic_id).populate_existing().first()
+
+def resolve_category(db: Session, category_id: Optional[int] = None, name: Optional[str] = None):
+    """Return (category_id, name) for a topic given either the id or the category name"""
+    if category_id is not None:
+        category = db.query(models.Category.id, models.Category.name).filter(
+            models.Category.id == category_id
+        ).first()
+        if not category:
+            raise HTTPException(status_code=400, detail="Category not found")
+        return category.id, category.name
+    if name:
+        # 등록되지 않은 이름은 category_id 없이 문자열로만 저장
+        return db.query(func.min(models.Category.id)).filter(models.Category.name == name).scalar(), name
+    return None, None
+
+def category_ids_by_name(category: str):
+    return select(models.Category.id).where(models.Category.name == category)
+
+def category_scope(category: Optional[str], category_id: Optional[int], ids_by_name=()):
+    """WHERE clause for topics in a category, served from the category_id indexes"""
+    if category_id is not None:
+        return models.Topic.category_id == category_id
+    if ids_by_name:
+        return models.Topic.category_id.in_(ids_by_name)
+    return models.Topic.category == category
+
+def category_filter(db: Session, category: Optional[str] = None, category_id: Optional[int] = None):
+    ids = [] if category_id is not None else db.execute(category_ids_by_name(category)).scalars().all()
+    return category_scope(category, category_id, ids)
+
 @router.post("/", response_model=schemas.Topic)
 def create_topic(topic: schemas.TopicCreate, db: Session = Depends(get_db)):
+    category_id, category = resolve_category(db, topic.category_id, topic.category)
     db_topic = models.Topic(
         title=topic.title,
-        category=topic.category,
+        category=category,
+        category_id=category_id,
         content=topic.content
     )
     db.add(db_topic)
@@ -33,64 +103,375 @@ def create_topic(topic: schemas.TopicCreate, db: Session = Depends(get_db)):
         db.add(db_mnemonic)
     
     # Create initial version
-    db_version = models.TopicVersion(
+    versioning.create_version(
+        db,
         topic_id=db_topic.id,
         content=topic.content,
         version=1,
         changed_by="system",
         change_reason="Initial creation"
     )
-    db.add(db_version)
     
     db.commit()
-    db.refresh(db_topic)
+    db_topic = load_topic(db, db_topic.id)
+    topic_indexes.topic_saved(db_topic)
     return db_topic
 
+def _import_rows(db: Session, rows: List[Any], dry_run: bool):
+    topics, errors = topic_import.validate_rows(db, rows)
+    if errors:
+        raise HTTPException(status_code=422, detail={"message": "Import rejected", "errors": errors[:1000]})
+    if dry_run:
+        return schemas.TopicImportResult(received=len(rows), created=0)
+    
+    topic_ids = topic_import.insert_topics(db, topics)
+    db.commit()
+    # 대량 추가는 새 토픽만 백그라운드에서 색인
+    topic_indexes.topics_added(topic_ids)
+    return schemas.TopicImportResult(received=len(rows), created=len(topic_ids), topic_ids=topic_ids)
+
+@router.post("/import", response_model=schemas.TopicImportResult)
+def import_topics(
+    rows: List[Any] = Body(..., description="TopicCreate 형식의 행 목록"),
+    dry_run: bool = Query(False, description="검증만 하고 저장하지 않음"),
+    db: Session = Depends(get_db)
+):
+    """토픽 일괄 등록: 전체를 검증한 뒤 한 트랜잭션에서 다건 INSERT"""
+    return _import_rows(db, rows, dry_run)
+
+@router.post("/import/csv", response_model=schemas.TopicImportResult)
+def import_topics_csv(
+    file: UploadFile = File(..., description="title,category,content,keywords(;구분),mnemonics(두음=전체;...)"),
+    dry_run: bool = Query(False, description="검증만 하고 저장하지 않음"),
+    db: Session = Depends(get_db)
+):
+    try:
+        rows = topic_import.parse_csv(topic_import.decode_csv(file.file.read()))
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid CSV: {e}")
+    return _import_rows(db, rows, dry_run)
+
+def _ingest_lines(path: str, source_name: str, category: Optional[str], dry_run: bool):
+    # 스트리밍 동안 유지되어야 하므로 별도 세션 사용
+    db = SessionLocal()
+    try:
+        for event in pdf_ingest.ingest_pdf(path, db, category, dry_run, source_name=source_name):
+            yield (json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8")
+    except Exception as e:
+        db.rollback()
+        yield (json.dumps({"event": "error", "message": str(e)}, ensure_ascii=False) + "\n").encode("utf-8")
+    finally:
+        db.close()
+        os.unlink(path)
+
+@router.post("/ingest/pdf")
+def ingest_pdf(
+    file: UploadFile = File(..., description="서브노트 PDF"),
+    category: Optional[str] = Query(None, description="가져온 토픽의 카테고리 이름"),
+    dry_run: bool = Query(False, description="토픽 분할/키워드 제안만 확인"),
+):
+    """PDF를 제목 단위로 토픽 분할하여 등록, 진행 상황을 NDJSON으로 스트리밍"""
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+        shutil.copyfileobj(file.file, tmp, 1024 * 1024)
+    try:
+        pdf_ingest.page_count(tmp.name)
+    except Exception as e:
+        os.unlink(tmp.name)
+        raise HTTPException(status_code=400, detail=f"Invalid PDF: {e}")
+    return StreamingResponse(
+        _ingest_lines(tmp.name, file.filename or "upload.pdf", category, dry_run),
+        media_type="application/x-ndjson"
+    )
+
 @router.get("/", response_model=List[schemas.Topic])
 def get_topics(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     category: Optional[str] = None,
+    category_id: Optional[int] = None,
+    sort: str = Query("id", pattern="^(id|frequency)$", description="frequency: 출제 빈도 높은 순"),
+    min_frequency: Optional[int] = Query(None, ge=1, description="최소 출제 횟수"),
     db: Session = Depends(get_db)
 ):
-    query = db.query(models.Topic)
-    if category:
-        query = query.filter(models.Topic.category == category)
-    topics = query.offset(skip).limit(limit).all()
-    return topics
+    scope = None
+    if category or category_id is not None:
+        scope = category_filter(db, category, category_id)
+    
+    validator = db.execute(topic_list_validator(scope)).one()
+    etag = topic_list_etag(validator, exam_stats.version(db), skip, limit, sort, min_frequency)
+    not_modified = conditional.check(request, response, etag)
+    if not_modified:
+        return not_modified
+    
+    return db.execute(topic_list_select(scope, skip, limit, sort, min_frequency)).scalars().all()
+
+def topic_list_validator(scope):
+    # 본문을 읽기 전에 집계값만으로 변경 여부 확인 (기출 기록은 topic_exam_stats로 반영)
+    stmt = select(func.count(models.Topic.id), func.max(models.Topic.id), func.max(models.Topic.updated_at))
+    return stmt.where(scope) if scope is not None else stmt
+
+def topic_list_etag(validator, exam_version, skip, limit, sort, min_frequency):
+    """ETag of a topic list from topic_list_validator and exam_stats.version.
+
+    No Last-Modified for lists: deleting a topic does not move max(updated_at),
+    only the row count in the ETag.
+    """
+    return conditional.make_etag("topics", *validator, *exam_version, skip, limit, sort, min_frequency)
+
+def topic_list_select(scope, skip, limit, sort, min_frequency):
+    stmt = select_topics()
+    if scope is not None:
+        stmt = stmt.where(scope)
+    if sort == "frequency" or min_frequency:
+        # 빈도 정렬/필터는 집계 테이블만 조인 (exam_history는 읽지 않음)
+        stats = models.TopicExamStats
+        if min_frequency:
+            stmt = stmt.join(stats, stats.topic_id == models.Topic.id).where(stats.exam_count >= min_frequency)
+        else:
+            stmt = stmt.outerjoin(stats, stats.topic_id == models.Topic.id)
+        if sort == "frequency":
+            stmt = stmt.order_by(func.coalesce(stats.exam_count, 0).desc(), models.Topic.id)
+    if sort == "id":
+        stmt = stmt.order_by(models.Topic.id)
+    return stmt.offset(skip).limit(limit)
+
+@router.get("/page", response_model=schemas.TopicPage)
+def get_topic_page(
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=100),
+    category: Optional[str] = None,
+    category_id: Optional[int] = None,
+    order: str = Query("id", pattern="^(id|updated_at)$", description="id: 오래된 순, updated_at: 최근 수정 순"),
+    db: Session = Depends(get_db)
+):
+    """Keyset 페이지네이션: 깊은 페이지도 첫 페이지와 같은 비용"""
+    scope = None
+    if category or category_id is not None:
+        scope = category_filter(db, category, category_id)
+    topics = db.execute(topic_page_select(scope, cursor, limit, order)).scalars().all()
+    return topic_page(topics, limit, order)
+
+def topic_page_select(scope, cursor: Optional[str], limit: int, order: str):
+    stmt = select_topics()
+    if scope is not None:
+        stmt = stmt.where(scope)
+    
+    if order == "updated_at":
+        if cursor:
+            position = decode_cursor(cursor, required=("updated_at", "id"))
+            stmt = stmt.where(
+                tuple_(models.topic_modified_at, models.Topic.id)
+                < tuple_(parse_datetime(position["updated_at"]), parse_id(position["id"]))
+            )
+        stmt = stmt.order_by(models.topic_modified_at.desc(), models.Topic.id.desc())
+    else:
+        if cursor:
+            position = decode_cursor(cursor, required=("id",))
+            stmt = stmt.where(models.Topic.id > parse_id(position["id"]))
+        stmt = stmt.order_by(models.Topic.id)
+    
+    # 다음 페이지 존재 여부 확인용으로 하나 더 조회
+    return stmt.limit(limit + 1)
+
+def topic_page(topics, limit: int, order: str):
+    next_cursor = None
+    if len(topics) > limit:
+        topics = topics[:limit]
+        last = topics[-1]
+        if order == "updated_at":
+            next_cursor = encode_cursor(updated_at=last.updated_at or last.created_at, id=last.id)
+        else:
+            next_cursor = encode_cursor(id=last.id)
+    return schemas.TopicPage(items=topics, next_cursor=next_cursor)
+
+EXPORT_BATCH_SIZE = 500
+
+def _export_lines(category: Optional[str], category_id: Optional[int] = None):
+    """Yield one JSON line per topic, reading the table in id-ordered batches"""
+    # 응답 스트리밍 동안 유지되어야 하므로 요청 세션이 아닌 별도 세션 사용
+    db = SessionLocal()
+    try:
+        last_id = 0
+        scope = None
+        if category or category_id is not None:
+            scope = category_filter(db, category, category_id)
+        while True:
+            query = query_topics(db).filter(models.Topic.id > last_id)
+            if scope is not None:
+                query = query.filter(scope)
+            batch = query.order_by(models.Topic.id).limit(EXPORT_BATCH_SIZE).all()
+            if not batch:
+                break
+            lines = [schemas.Topic.model_validate(topic).model_dump_json() for topic in batch]
+            last_id = batch[-1].id
+            db.expunge_all()
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+    finally:
+        db.close()
+
+def _gzip_stream(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # 31: gzip 헤더 포함
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+@router.get("/export")
+def export_topics(
+    category: Optional[str] = None,
+    category_id: Optional[int] = None,
+    gzip: bool = Query(False, description="gzip으로 압축된 .ndjson.gz 로 내려받기"),
+):
+    """전체 토픽(키워드, 두음, 출제이력 포함)을 NDJSON으로 스트리밍"""
+    if gzip:
+        return StreamingResponse(
+            _gzip_stream(_export_lines(category, category_id)),
+            media_type="application/gzip",
+            headers={"Content-Disposition": 'attachment; filename="topics.ndjson.gz"'}
+        )
+    return StreamingResponse(
+        _export_lines(category, category_id),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="topics.ndjson"'}
+    )
+
+MAX_PDF_EXPORT_TOPICS = 1000
+
+@router.get("/export/pdf")
+def export_topics_pdf(
+    category_id: Optional[int] = Query(None, description="카테고리 (하위 카테고리 포함)"),
+    topic_ids: Optional[List[int]] = Query(None, description="개별 토픽 선택"),
+):
+    """선택한 토픽을 하나의 PDF로 (토픽별 조각은 버전 단위로 캐시)"""
+    if category_id is None and not topic_ids:
+        raise HTTPException(status_code=400, detail="category_id or topic_ids is required")
+    
+    # db 의존성 없이 직접 세션을 열어 async 모드에서도 스레드풀에서 실행되도록
+    db = SessionLocal()
+    try:
+        query = db.query(models.Topic.id)
+        if category_id is not None:
+            ids = category_tree.subtree_ids(db, category_id)
+            if ids is None:
+                raise HTTPException(status_code=404, detail="Category not found")
+            query = query.filter(models.Topic.category_id.in_(ids))
+        if topic_ids:
+            query = query.filter(models.Topic.id.in_(topic_ids))
+        selected = [row.id for row in query.order_by(models.Topic.id).limit(MAX_PDF_EXPORT_TOPICS + 1)]
+        if not selected:
+            raise HTTPException(status_code=404, detail="No topics to export")
+        if len(selected) > MAX_PDF_EXPORT_TOPICS:
+            raise HTTPException(status_code=400, detail=f"At most {MAX_PDF_EXPORT_TOPICS} topics per export")
+        
+        fragments, rendered = pdf_export.ensure_fragments(db, selected)
+    finally:
+        db.close()
+    
+    return StreamingResponse(
+        pdf_export.stream_file(pdf_export.merge_fragments(fragments)),
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": 'attachment; filename="topics.pdf"',
+            "X-Rendered-Fragments": str(rendered),
+        }
+    )
 
 @router.get("/search", response_model=List[schemas.Topic])
 def search_topics(
     q: str = Query(..., description="Search query"),
-    search_type: str = Query("all", description="Search type: all, title, keyword, mnemonic"),
+    search_type: str = Query("all", description="Search type: all, title, keyword, mnemonic, content"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
     db: Session = Depends(get_db)
 ):
-    query = db.query(models.Topic)
-    
-    if search_type == "title":
-        query = query.filter(models.Topic.title.contains(q))
-    elif search_type == "keyword":
-        query = query.join(models.Keyword).filter(models.Keyword.keyword.contains(q))
-    elif search_type == "mnemonic":
-        query = query.join(models.Mnemonic).filter(models.Mnemonic.mnemonic.contains(q))
-    else:  # all
-        query = query.outerjoin(models.Keyword).outerjoin(models.Mnemonic).filter(
-            or_(
-                models.Topic.title.contains(q),
-                models.Keyword.keyword.contains(q),
-                models.Mnemonic.mnemonic.contains(q)
-            )
-        )
+    topic_ids = get_search_backend().search(db, q, search_type, limit=limit, offset=offset)
+    if not topic_ids:
+        return []
     
-    topics = query.distinct().all()
-    return topics
+    # 인덱스 순위대로 정렬
+    topics = query_topics(db).filter(models.Topic.id.in_(topic_ids)).all()
+    by_id = {topic.id: topic for topic in topics}
+    return [by_id[topic_id] for topic_id in topic_ids if topic_id in by_id]
+
+@router.get("/autocomplete", response_model=List[schemas.AutocompleteSuggestion])
+def autocomplete_topics(
+    q: str = Query(..., min_length=1, description="Prefix or 초성, e.g. 비복 / ㅂㅂㅂ"),
+    limit: int = Query(10, ge=1, le=20),
+    db: Session = Depends(get_db)
+):
+    topic_indexes.ready(autocomplete_index, db)
+    return autocomplete_index.suggest(q, limit=limit)
+
+@router.put("/bulk/category")
+def bulk_update_category(request: schemas.TopicBulkCategory, db: Session = Depends(get_db)):
+    """여러 토픽의 카테고리를 한 번의 UPDATE로 변경"""
+    category_id, category = resolve_category(db, request.category_id)
+    moved_from = [row.category_id for row in db.query(models.Topic.category_id).join(
+        models.TopicExamStats, models.TopicExamStats.topic_id == models.Topic.id
+    ).filter(models.Topic.id.in_(request.topic_ids)).distinct()]
+    result = db.execute(
+        update(models.Topic)
+        .where(models.Topic.id.in_(request.topic_ids))
+        .values(category_id=category_id, category=category)
+        .execution_options(synchronize_session=False)
+    )
+    if moved_from:
+        exam_stats.refresh_categories(db, moved_from + [category_id])
+    db.commit()
+    exam_generator.invalidate_pools()
+    return {"updated": result.rowcount}
 
 @router.get("/{topic_id}", response_model=schemas.Topic)
-def get_topic(topic_id: int, db: Session = Depends(get_db)):
-    topic = db.query(models.Topic).filter(models.Topic.id == topic_id).first()
-    if not topic:
+def get_topic(topic_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
+    etag = topic_etag(topic_id, db.execute(topic_validator(topic_id)).first())
+    not_modified = conditional.check(request, response, etag)
+    if not_modified:
+        return not_modified
+    
+    return load_topic(db, topic_id)
+
+def topic_validator(topic_id: int):
+    return select(models.Topic.updated_at, models.TopicExamStats.updated_at.label("exam_updated_at")).outerjoin(
+        models.TopicExamStats, models.TopicExamStats.topic_id == models.Topic.id
+    ).where(models.Topic.id == topic_id)
+
+def topic_etag(topic_id: int, row):
+    """ETag of one topic from topic_validator's row; 404 if there is none.
+
+    No Last-Modified: deleting a topic's last exam history row removes its
+    stats row, so max(updated_at) would move backwards.
+    """
+    if not row:
         raise HTTPException(status_code=404, detail="Topic not found")
-    return topic
+    return conditional.make_etag("topic", topic_id, row.updated_at, row.exam_updated_at)
+
+@router.get("/{topic_id}/related", response_model=List[schemas.RelatedTopic])
+def get_related_topics(
+    topic_id: int,
+    limit: int = Query(5, ge=1, le=TOP_K_RELATED),
+    db: Session = Depends(get_db)
+):
+    """연관 토픽 추천 (본문/키워드 TF-IDF 유사도, 토픽별 상위 목록을 미리 계산)"""
+    if not db.query(models.Topic.id).filter(models.Topic.id == topic_id).first():
+        raise HTTPException(status_code=404, detail="Topic not found")
+    topic_indexes.ready(related_index, db)
+    related = related_index.related(topic_id, limit)
+    if not related:
+        return []
+    topics = {
+        row.id: row for row in db.query(models.Topic.id, models.Topic.title, models.Topic.category).filter(
+            models.Topic.id.in_([other_id for other_id, _ in related])
+        )
+    }
+    return [
+        schemas.RelatedTopic(
+            topic_id=other_id, title=topics[other_id].title, category=topics[other_id].category, score=score
+        )
+        for other_id, score in related if other_id in topics
+    ]
 
 @router.put("/{topic_id}", response_model=schemas.Topic)
 def update_topic(
@@ -108,22 +489,33 @@ def update_topic(
     ).order_by(models.TopicVersion.version.desc()).first()
     
     new_version_num = (last_version.version + 1) if last_version else 1
+    previous_content = (
+        versioning.materialize(db, topic_id, last_version.version) if last_version else None
+    )
     
     # Create new version before updating
-    db_version = models.TopicVersion(
+    versioning.create_version(
+        db,
         topic_id=topic_id,
         content=topic.content,  # Save current content as version
         version=new_version_num,
         changed_by="admin",
-        change_reason=topic_update.change_reason or "Content update"
+        change_reason=topic_update.change_reason or "Content update",
+        previous_content=previous_content
     )
-    db.add(db_version)
     
-    # Update topic
+    # Update topic (키워드/두음만 바뀌어도 ETag가 바뀌도록 항상 갱신)
+    topic.updated_at = datetime.utcnow()
     if topic_update.title:
         topic.title = topic_update.title
-    if topic_update.category:
-        topic.category = topic_update.category
+    if topic_update.category_id is not None or topic_update.category:
+        previous_category_id = topic.category_id
+        topic.category_id, topic.category = resolve_category(
+            db, topic_update.category_id, topic_update.category
+        )
+        if topic.category_id != previous_category_id:
+            db.flush()
+            exam_stats.refresh_categories(db, [previous_category_id, topic.category_id])
     if topic_update.content:
         topic.content = topic_update.content
     
@@ -150,7 +542,8 @@ def update_topic(
             db.add(db_mnemonic)
     
     db.commit()
-    db.refresh(topic)
+    topic = load_topic(db, topic_id)
+    topic_indexes.topic_saved(topic)
     return topic
 
 @router.delete("/{topic_id}")
@@ -159,13 +552,93 @@ def delete_topic(topic_id: int, db: Session = Depends(get_db)):
     if not topic:
         raise HTTPException(status_code=404, detail="Topic not found")
     
+    exam_stats.forget_topic(db, topic_id, topic.category_id)
+    # 자동 출제된 문제는 남기고 원본 토픽 연결만 해제
+    db.query(models.ExamQuestion).filter(models.ExamQuestion.topic_id == topic_id).update(
+        {models.ExamQuestion.topic_id: None}, synchronize_session=False
+    )
     db.delete(topic)
     db.commit()
+    topic_indexes.topic_removed(topic_id)
+    versioning.diff_cache.forget_topic(topic_id)
+    pdf_export.remove_fragments(topic_id)
     return {"message": "Topic deleted successfully"}
 
 @router.get("/{topic_id}/versions", response_model=List[schemas.TopicVersion])
 def get_topic_versions(topic_id: int, db: Session = Depends(get_db)):
     versions = db.query(models.TopicVersion).filter(
         models.TopicVersion.topic_id == topic_id
+    ).order_by(models.TopicVersion.version).all()
+    contents = versioning.materialize_rows(versions)
+    
+    return [
+        schemas.TopicVersion(
+            id=v.id,
+            topic_id=v.topic_id,
+            content=contents[v.version],
+            version=v.version,
+            changed_by=v.changed_by,
+            change_reason=v.change_reason,
+            created_at=v.created_at
+        )
+        for v in reversed(versions)
+    ]
+
+@router.get("/{topic_id}/versions/summary", response_model=List[schemas.TopicVersionSummary])
+def get_topic_version_summaries(topic_id: int, db: Session = Depends(get_db)):
+    """히스토리 사이드바용: content 없이 메타데이터만 조회"""
+    versions = db.query(
+        models.TopicVersion.id,
+        models.TopicVersion.topic_id,
+        models.TopicVersion.version,
+        models.TopicVersion.changed_by,
+        models.TopicVersion.change_reason,
+        models.TopicVersion.created_at
+    ).filter(
+        models.TopicVersion.topic_id == topic_id
     ).order_by(models.TopicVersion.version.desc()).all()
-    return versions
\ No newline at end of file
+    return versions
+
+@router.get("/{topic_id}/versions/{version}", response_model=schemas.TopicVersion)
+def get_topic_version(topic_id: int, version: int, db: Session = Depends(get_db)):
+    db_version = db.query(models.TopicVersion).filter(
+        models.TopicVersion.topic_id == topic_id,
+        models.TopicVersion.version == version
+    ).first()
+    if not db_version:
+        raise HTTPException(status_code=404, detail="Version not found")
+    try:
+        content = versioning.materialize(db, topic_id, version)
+    except LookupError:
+        raise HTTPException(status_code=404, detail="Version not found")
+    
+    return schemas.TopicVersion(
+        id=db_version.id,
+        topic_id=db_version.topic_id,
+        content=content,
+        version=db_version.version,
+        changed_by=db_version.changed_by,
+        change_reason=db_version.change_reason,
+        created_at=db_version.created_at
+    )
+
+@router.get("/{topic_id}/diff", response_model=schemas.TopicVersionDiff)
+def get_topic_diff(
+    topic_id: int,
+    v1: int = Query(..., description="Base version"),
+    v2: int = Query(..., description="Target version"),
+    db: Session = Depends(get_db)
+):
+    try:
+        diffs = versioning.diff_versions(db, topic_id, v1, v2)
+    except LookupError:
+        raise HTTPException(status_code=404, detail="Version not found")
+    
+    return schemas.TopicVersionDiff(
+        topic_id=topic_id,
+        v1=v1,
+        v2=v2,
+        diffs=diffs,
+        insertions=sum(len(text) for op, text in diffs if op == 1),
+        deletions=sum(len(text) for op, text in diffs if op == -1)
+    )
\ No newline at end of file
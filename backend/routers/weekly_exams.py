@@ -1,55 +1,161 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session, joinedload, selectinload
 from typing import List
 from database_config import get_db
+import conditional
+import exam_generator
 import models
 import schemas
+import weekly_exam_writer
+from routers.categories import cached_categories
 
 router = APIRouter(prefix="/weekly-exams", tags=["weekly-exams"])
 
+def query_weekly_exams(db: Session):
+    """WeeklyExam query that loads category and questions up front (no per-exam lazy loads)"""
+    return db.query(models.WeeklyExam).options(
+        joinedload(models.WeeklyExam.category),
+        selectinload(models.WeeklyExam.questions)
+    )
+
+def create_exam(db: Session, exam_data: schemas.WeeklyExamCreate):
+    """Validate and insert one exam with all its questions in a single transaction"""
+    if not db.query(models.Category.id).filter(models.Category.id == exam_data.category_id).first():
+        raise HTTPException(status_code=404, detail="Category not found")
+    errors = weekly_exam_writer.validate_questions(exam_data.questions)
+    if errors:
+        raise HTTPException(status_code=422, detail={"message": "Invalid questions", "errors": errors})
+    
+    exam_ids = weekly_exam_writer.insert_exams(db, [exam_data.model_dump()])
+    db.commit()
+    return query_weekly_exams(db).filter(models.WeeklyExam.id == exam_ids[0]).one()
+
 @router.post("/", response_model=schemas.WeeklyExamResponse)
 def create_weekly_exam(exam_data: schemas.WeeklyExamCreate, db: Session = Depends(get_db)):
-    # 카테고리 존재 확인
-    category = db.query(models.Category).filter(models.Category.id == exam_data.category_id).first()
-    if not category:
-        raise HTTPException(status_code=404, detail="Category not found")
+    return create_exam(db, exam_data)
+
+@router.post("/clone", response_model=schemas.WeeklyExamCloneResult)
+def clone_weekly_exams(request: schemas.WeeklyExamClone, db: Session = Depends(get_db)):
+    """이전 기수의 주차 범위 시험을 문제까지 통째로 복사 (주차 이동, 카테고리 재매핑)"""
+    if request.week_from > request.week_to:
+        raise HTTPException(status_code=400, detail="week_from must not be greater than week_to")
+    if request.week_from + request.week_offset < 1:
+        raise HTTPException(status_code=400, detail="week_offset would produce week numbers below 1")
     
-    # 주간모의고사 생성
-    db_exam = models.WeeklyExam(
-        week_number=exam_data.week_number,
-        category_id=exam_data.category_id
+    query = db.query(models.WeeklyExam).options(selectinload(models.WeeklyExam.questions)).filter(
+        models.WeeklyExam.week_number.between(request.week_from, request.week_to)
     )
-    db.add(db_exam)
-    db.commit()
-    db.refresh(db_exam)
+    if request.created_from:
+        query = query.filter(models.WeeklyExam.created_at >= request.created_from)
+    if request.created_to:
+        query = query.filter(models.WeeklyExam.created_at < request.created_to)
+    sources = query.order_by(models.WeeklyExam.week_number, models.WeeklyExam.id).all()
+    if not sources:
+        raise HTTPException(status_code=404, detail="No weekly exams in the given range")
     
-    # 문제들 생성
-    for question_data in exam_data.questions:
-        db_question = models.ExamQuestion(
-            weekly_exam_id=db_exam.id,
-            session=question_data.session,
-            question_number=question_data.question_number,
-            question_text=question_data.question_text,
-            question_type=models.QuestionType(question_data.question_type)
-        )
-        db.add(db_question)
+    targets = {request.category_map.get(exam.category_id, exam.category_id) for exam in sources}
+    found = {row.id for row in db.query(models.Category.id).filter(models.Category.id.in_(targets))}
+    if found != targets:
+        raise HTTPException(status_code=400, detail=f"Category not found: {sorted(targets - found)}")
     
+    exam_ids = weekly_exam_writer.clone_exams(db, sources, request.week_offset, request.category_map)
     db.commit()
+    return schemas.WeeklyExamCloneResult(created=len(exam_ids), exam_ids=exam_ids)
+
+@router.post("/generate", response_model=schemas.WeeklyExamDraft)
+def generate_weekly_exam(request: schemas.WeeklyExamGenerate, db: Session = Depends(get_db)):
+    """출제 빈도/최근성 가중치로 카테고리 하위 토픽에서 모의고사 초안 생성 (dry_run이 아니면 저장)"""
+    if not db.query(models.Category.id).filter(models.Category.id == request.category_id).first():
+        raise HTTPException(status_code=404, detail="Category not found")
+    try:
+        questions = exam_generator.generate_questions(
+            db, request.category_id, request.week_number, request.avoid_weeks, request.seed
+        )
+    except exam_generator.NotEnoughTopics as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    # 생성된 시험 정보 반환
-    db.refresh(db_exam)
-    return db_exam
+    draft = schemas.WeeklyExamDraft(week_number=request.week_number, category_id=request.category_id, questions=questions)
+    if not request.dry_run:
+        draft.id = weekly_exam_writer.insert_exams(db, [draft.model_dump()])[0]
+        db.commit()
+    return draft
+
+def row_version(model):
+    """Aggregates that change with any insert, delete or update of the table's rows.
+
+    count and sum(id) catch deletes and inserts (also a delete followed by an
+    insert), max(updated_at) catches in-place updates and a reused id.
+    """
+    return func.count(model.id), func.coalesce(func.sum(model.id), 0), func.max(model.updated_at)
+
+def weekly_exam_list_etag(db: Session):
+    """Validator for the exam list: exams and questions may change in any way, categories may be renamed"""
+    exams = db.query(*row_version(models.WeeklyExam)).one()
+    questions = db.query(*row_version(models.ExamQuestion)).one()
+    return conditional.make_etag("weekly_exams", tuple(exams), tuple(questions), cached_categories(db))
 
 @router.get("/", response_model=List[schemas.WeeklyExamResponse])
-def get_weekly_exams(db: Session = Depends(get_db)):
-    exams = db.query(models.WeeklyExam).all()
+def get_weekly_exams(request: Request, response: Response, db: Session = Depends(get_db)):
+    not_modified = conditional.check(request, response, weekly_exam_list_etag(db))
+    if not_modified:
+        return not_modified
+    
+    exams = query_weekly_exams(db).order_by(models.WeeklyExam.week_number, models.WeeklyExam.id).all()
     return exams
 
+def weekly_exam_summaries(db: Session):
+    """주차, 카테고리 이름, 교시별 문항 수를 집계 쿼리 한 번으로 조회 (문제 본문은 읽지 않음)"""
+    question = models.ExamQuestion
+    rows = db.query(
+        models.WeeklyExam.id,
+        models.WeeklyExam.week_number,
+        models.WeeklyExam.category_id,
+        models.WeeklyExam.created_at,
+        models.Category.name.label("category_name"),
+        func.count(case((question.session == 1, question.id))).label("session1_questions"),
+        func.count(case((question.session == 2, question.id))).label("session2_questions"),
+        func.count(question.id).label("question_count")
+    ).outerjoin(models.Category, models.Category.id == models.WeeklyExam.category_id).outerjoin(
+        question, question.weekly_exam_id == models.WeeklyExam.id
+    ).group_by(
+        models.WeeklyExam.id, models.WeeklyExam.week_number, models.WeeklyExam.category_id,
+        models.WeeklyExam.created_at, models.Category.name
+    ).order_by(models.WeeklyExam.week_number, models.WeeklyExam.id).all()
+    return [schemas.WeeklyExamSummary.model_validate(row._mapping) for row in rows]
+
+@router.get("/summary", response_model=List[schemas.WeeklyExamSummary])
+def get_weekly_exam_summaries(request: Request, response: Response, db: Session = Depends(get_db)):
+    not_modified = conditional.check(request, response, weekly_exam_list_etag(db))
+    if not_modified:
+        return not_modified
+    return weekly_exam_summaries(db)
+
 @router.get("/{exam_id}", response_model=schemas.WeeklyExamResponse)
-def get_weekly_exam(exam_id: int, db: Session = Depends(get_db)):
-    exam = db.query(models.WeeklyExam).filter(models.WeeklyExam.id == exam_id).first()
-    if not exam:
+def get_weekly_exam(exam_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
+    validator = db.query(
+        models.WeeklyExam.updated_at,
+        models.WeeklyExam.week_number,
+        models.WeeklyExam.category_id,
+        models.Category.name,
+        models.Category.description,
+        models.Category.parent_id,
+        *row_version(models.ExamQuestion)
+    ).outerjoin(models.Category, models.Category.id == models.WeeklyExam.category_id).outerjoin(
+        models.ExamQuestion, models.ExamQuestion.weekly_exam_id == models.WeeklyExam.id
+    ).filter(models.WeeklyExam.id == exam_id).group_by(
+        models.WeeklyExam.id, models.WeeklyExam.updated_at, models.WeeklyExam.week_number,
+        models.WeeklyExam.category_id, models.Category.name, models.Category.description,
+        models.Category.parent_id
+    ).first()
+    if not validator:
         raise HTTPException(status_code=404, detail="Weekly exam not found")
+    # 문항 삭제는 어떤 시각도 앞당기지 않으므로 Last-Modified 없이 ETag만 사용
+    not_modified = conditional.check(request, response, conditional.make_etag("weekly_exam", exam_id, tuple(validator)))
+    if not_modified:
+        return not_modified
+    
+    exam = query_weekly_exams(db).filter(models.WeeklyExam.id == exam_id).first()
     return exam
 
 @router.delete("/{exam_id}")
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 class KeywordBase(BaseModel):
     keyword: str
@@ -44,9 +44,30 @@ class ExamHistory(ExamHistoryBase):
     class Config:
         from_attributes = True
 
+class ExamHistoryEntry(ExamHistoryBase):
+    topic_id: int
+
+class TopicFrequency(BaseModel):
+    topic_id: int
+    title: str
+    category_id: Optional[int] = None
+    category: Optional[str] = None
+    exam_count: int
+    last_round: Optional[str] = None
+    average_score: Optional[float] = None
+
+class CategoryFrequency(BaseModel):
+    category_id: int
+    name: str
+    topic_count: int  # 한 번 이상 출제된 토픽 수
+    exam_count: int
+    last_round: Optional[str] = None
+    average_score: Optional[float] = None
+
 class TopicBase(BaseModel):
     title: str
     category: Optional[str] = None
+    category_id: Optional[int] = None
     content: Optional[str] = None
 
 class TopicCreate(TopicBase):
@@ -62,7 +83,7 @@ class TopicUpdate(TopicBase):
 class Topic(TopicBase):
     id: int
     created_at: datetime
-    updated_at: datetime
+    updated_at: Optional[datetime] = None  # 예전 행은 비어 있을 수 있음
     keywords: List[Keyword] = []
     mnemonics: List[Mnemonic] = []
     exam_histories: List[ExamHistory] = []
@@ -70,6 +91,19 @@ class Topic(TopicBase):
     class Config:
         from_attributes = True
 
+class TopicPage(BaseModel):
+    items: List[Topic]
+    next_cursor: Optional[str] = None
+
+class TopicImportResult(BaseModel):
+    received: int
+    created: int
+    topic_ids: List[int] = []
+
+class TopicBulkCategory(BaseModel):
+    topic_ids: List[int]
+    category_id: Optional[int] = None  # None: 분류 해제
+
 class TopicVersionBase(BaseModel):
     content: str
     version: int
@@ -84,10 +118,41 @@ class TopicVersion(TopicVersionBase):
     class Config:
         from_attributes = True
 
+class TopicVersionSummary(BaseModel):
+    id: int
+    topic_id: int
+    version: int
+    changed_by: Optional[str] = None
+    change_reason: Optional[str] = None
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+class TopicVersionDiff(BaseModel):
+    topic_id: int
+    v1: int
+    v2: int
+    diffs: List[Tuple[int, str]]  # (-1 삭제, 0 동일, 1 추가, 텍스트)
+    insertions: int
+    deletions: int
+
 class TopicSearch(BaseModel):
     query: str
     search_type: Optional[str] = "all"  # all, title, keyword, mnemonic
 
+class RelatedTopic(BaseModel):
+    topic_id: int
+    title: str
+    category: Optional[str] = None
+    score: float  # 코사인 유사도 (0~1)
+
+class AutocompleteSuggestion(BaseModel):
+    text: str
+    kind: str  # mnemonic, keyword, full_text
+    topic_id: int
+    topic_title: str
+
 class CategoryBase(BaseModel):
     name: str
     description: Optional[str] = None
@@ -108,6 +173,12 @@ class Category(CategoryBase):
     class Config:
         from_attributes = True
 
+class CategoryTopicCount(BaseModel):
+    category_id: int
+    name: str
+    topic_count: int
+    subtree_topic_count: int  # 하위 카테고리 포함
+
 class TemplateBase(BaseModel):
     name: str
     description: Optional[str] = None
@@ -131,12 +202,74 @@ class Template(TemplateBase):
     class Config:
         from_attributes = True
 
+# Assignment Schemas
+class AssignmentBase(BaseModel):
+    type: str  # outline | self_test
+    title: str
+    description: Optional[str] = None
+    due_date: Optional[datetime] = None
+
+class AssignmentCreate(AssignmentBase):
+    pass
+
+class Assignment(AssignmentBase):
+    id: int
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+class Submission(BaseModel):
+    id: int
+    assignment_id: int
+    user_id: str
+    original_filename: Optional[str] = None
+    file_size: Optional[int] = None
+    sha256: Optional[str] = None
+    submitted_at: datetime
+    score: Optional[float] = None
+    feedback: Optional[str] = None
+    
+    class Config:
+        from_attributes = True
+
+class SubmissionUploadResult(Submission):
+    deduplicated: bool = False  # 같은 파일을 다시 제출해 변경 없음
+
+class GradeEntry(BaseModel):
+    submission_id: Optional[int] = None
+    user_id: Optional[str] = None  # submission_id 대신 사용 가능
+    score: Optional[float] = None
+    feedback: Optional[str] = None
+
+class AssignmentGrades(BaseModel):
+    assignment_id: int
+    grades: List[GradeEntry]
+
+class BulkGradeRequest(BaseModel):
+    assignments: List[AssignmentGrades]
+
+class GradeStats(BaseModel):
+    assignment_id: int
+    submissions: int
+    graded: int
+    mean: Optional[float] = None
+    median: Optional[float] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+    distribution: Dict[str, int] = {}  # "60-70": 명수
+
+class BulkGradeResult(BaseModel):
+    updated: int
+    assignments: List[GradeStats]
+
 # Weekly Exam Schemas
 class ExamQuestionBase(BaseModel):
     session: int
     question_number: int
     question_text: str
     question_type: str
+    topic_id: Optional[int] = None  # 자동 출제 시 원본 토픽
 
 class ExamQuestionCreate(ExamQuestionBase):
     pass
@@ -163,4 +296,33 @@ class WeeklyExamResponse(WeeklyExamBase):
     questions: List[ExamQuestion] = []
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class WeeklyExamSummary(WeeklyExamBase):
+    id: int
+    created_at: datetime
+    category_name: Optional[str] = None
+    session1_questions: int  # 1교시 (단답형) 문항 수
+    session2_questions: int  # 2교시 (서술형) 문항 수
+    question_count: int
+
+class WeeklyExamClone(BaseModel):
+    week_from: int
+    week_to: int
+    created_from: Optional[datetime] = None  # 이전 기수 구분 (생성 시각 범위)
+    created_to: Optional[datetime] = None
+    week_offset: int = 0
+    category_map: Dict[int, int] = {}  # 원본 category_id -> 새 category_id
+
+class WeeklyExamCloneResult(BaseModel):
+    created: int
+    exam_ids: List[int]
+
+class WeeklyExamGenerate(WeeklyExamBase):
+    avoid_weeks: int = 4  # 이번 주를 포함한 최근 N주 안에 이번 기수가 출제한 토픽 제외 (0이면 제외하지 않음)
+    seed: Optional[int] = None
+    dry_run: bool = False  # True면 저장하지 않고 초안만 반환
+
+class WeeklyExamDraft(WeeklyExamBase):
+    id: Optional[int] = None  # dry_run이면 None
+    questions: List[ExamQuestionCreate]
@@ -0,0 +1,247 @@
+"""
+Topic search backends selected from the active database engine.
+
+- PostgreSQL: pg_trgm GIN indexes, ILIKE matching ranked by similarity()
+- SQLite: FTS5 virtual table (trigram tokenizer) kept in sync by triggers
+- Fallback: the in-memory bigram index from search_index
+
+Trigram indexes cannot answer terms shorter than three characters, so those
+queries (common with Hangul, e.g. "망") are served from the in-memory index,
+which matches a one-letter term anywhere in a word, as the LIKE search did.
+Set SEARCH_BACKEND=memory to force the in-memory index everywhere.
+
+Bulk writers wrap their inserts in bulk_insert(): on SQLite the FTS triggers
+would otherwise rebuild a topic's whole document once for the topic row and
+again for every keyword and mnemonic row, so the batch is indexed once instead.
+"""
+import json
+import os
+from contextlib import contextmanager
+
+from sqlalchemy import func, literal, select, text, union_all
+from sqlalchemy.orm import Session
+
+import models
+import topic_indexes
+from search_index import SEARCH_FIELDS, normalize, topic_index
+
+
+def _short_query(q):
+    return any(len(term) < 3 for term in normalize(q).split(" "))
+
+
+class MemorySearchBackend:
+    name = "memory"
+
+    def install(self, engine):
+        return True
+
+    @contextmanager
+    def bulk_insert(self, db: Session):
+        """Wrap inserting many topics in one transaction; yields a list the caller fills with their ids"""
+        yield []
+
+    def search(self, db: Session, q, search_type="all", limit=20, offset=0):
+        topic_indexes.ready(topic_index, db)
+        return topic_index.search(q, search_type, limit=limit, offset=offset)[1]
+
+
+class PostgresTrigramSearchBackend(MemorySearchBackend):
+    name = "pg_trgm"
+
+    INDEXES = {
+        "ix_topics_title_trgm": ("topics", "title"),
+        "ix_topics_content_trgm": ("topics", "content"),
+        "ix_keywords_keyword_trgm": ("keywords", "keyword"),
+        "ix_mnemonics_mnemonic_trgm": ("mnemonics", "mnemonic"),
+    }
+
+    def install(self, engine):
+        with engine.begin() as conn:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            for index_name, (table, column) in self.INDEXES.items():
+                conn.execute(text(
+                    f"CREATE INDEX IF NOT EXISTS {index_name} "
+                    f"ON {table} USING gin ({column} gin_trgm_ops)"
+                ))
+        return True
+
+    def search(self, db: Session, q, search_type="all", limit=20, offset=0):
+        query = normalize(q)
+        if not query or _short_query(query):
+            return super().search(db, q, search_type, limit, offset)
+
+        pattern = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        fields = SEARCH_FIELDS.get(search_type, SEARCH_FIELDS["all"])
+        branches = []
+        if "title" in fields:
+            branches.append(select(
+                models.Topic.id.label("topic_id"),
+                (literal(5.0) * func.similarity(models.Topic.title, query)).label("score"),
+            ).where(models.Topic.title.ilike(pattern, escape="\\")))
+        if "keyword" in fields:
+            branches.append(select(
+                models.Keyword.topic_id.label("topic_id"),
+                (literal(3.0) * func.similarity(models.Keyword.keyword, query)).label("score"),
+            ).where(models.Keyword.keyword.ilike(pattern, escape="\\")))
+        if "mnemonic" in fields:
+            branches.append(select(
+                models.Mnemonic.topic_id.label("topic_id"),
+                (literal(3.0) * func.similarity(models.Mnemonic.mnemonic, query)).label("score"),
+            ).where(models.Mnemonic.mnemonic.ilike(pattern, escape="\\")))
+        if "content" in fields:
+            branches.append(select(
+                models.Topic.id.label("topic_id"),
+                func.word_similarity(query, models.Topic.content).label("score"),
+            ).where(models.Topic.content.ilike(pattern, escape="\\")))
+
+        hits = union_all(*branches).subquery()
+        score = func.sum(hits.c.score)
+        stmt = (
+            select(hits.c.topic_id)
+            .group_by(hits.c.topic_id)
+            .order_by(score.desc(), hits.c.topic_id)
+            .limit(limit)
+            .offset(offset)
+        )
+        return list(db.execute(stmt).scalars())
+
+
+class SQLiteFTSSearchBackend(MemorySearchBackend):
+    name = "fts5"
+
+    # bm25 weights follow the column order below
+    COLUMNS = ("title", "keywords", "mnemonics", "content")
+    WEIGHTS = (5.0, 3.0, 3.0, 1.0)
+    FIELD_COLUMNS = {
+        "title": "title",
+        "keyword": "keywords",
+        "mnemonic": "mnemonics",
+        "content": "content",
+    }
+
+    _INDEX = """
+        INSERT INTO topics_fts (rowid, title, keywords, mnemonics, content)
+        SELECT t.id, t.title,
+               (SELECT group_concat(keyword, ' ') FROM keywords WHERE topic_id = t.id),
+               (SELECT group_concat(mnemonic, ' ') FROM mnemonics WHERE topic_id = t.id),
+               t.content
+        FROM topics t
+    """
+    _REFRESH = "DELETE FROM topics_fts WHERE rowid = {id}; " + _INDEX + " WHERE t.id = {id};"
+    # bulk_insert()가 트랜잭션 안에서만 행을 넣어 두는 표시 테이블 (SQLite는 쓰기가 직렬화됨)
+    _DEFERRED = "topics_fts_deferred"
+
+    def _triggers(self):
+        refresh_new = self._REFRESH.format(id="NEW.id")
+        unless_deferred = f"WHEN NOT EXISTS (SELECT 1 FROM {self._DEFERRED})"
+        triggers = {
+            "topics_fts_ai": f"AFTER INSERT ON topics {unless_deferred} BEGIN {refresh_new} END",
+            "topics_fts_au": f"AFTER UPDATE ON topics BEGIN {refresh_new} END",
+            "topics_fts_ad": "AFTER DELETE ON topics BEGIN DELETE FROM topics_fts WHERE rowid = OLD.id; END",
+        }
+        for table in ("keywords", "mnemonics"):
+            triggers[f"{table}_fts_ai"] = (
+                f"AFTER INSERT ON {table} {unless_deferred} BEGIN {self._REFRESH.format(id='NEW.topic_id')} END"
+            )
+            triggers[f"{table}_fts_ad"] = f"AFTER DELETE ON {table} BEGIN {self._REFRESH.format(id='OLD.topic_id')} END"
+            triggers[f"{table}_fts_au"] = (
+                f"AFTER UPDATE ON {table} BEGIN "
+                f"{self._REFRESH.format(id='OLD.topic_id')} {self._REFRESH.format(id='NEW.topic_id')} END"
+            )
+        return triggers
+
+    def install(self, engine):
+        with engine.begin() as conn:
+            try:
+                conn.execute(text(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS topics_fts USING fts5("
+                    + ", ".join(self.COLUMNS) + ", tokenize='trigram')"
+                ))
+            except Exception as e:
+                print(f"FTS5 trigram search unavailable, using in-memory index: {e}")
+                return False
+            conn.execute(text(f"CREATE TABLE IF NOT EXISTS {self._DEFERRED} (flag INTEGER)"))
+            # 정의가 바뀌었을 수 있으므로 트리거는 매번 다시 만든다
+            for name, body in self._triggers().items():
+                conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+                conn.execute(text(f"CREATE TRIGGER {name} {body}"))
+
+            # 기존 데이터 최초 색인
+            if conn.execute(text("SELECT count(*) FROM topics_fts")).scalar() == 0:
+                conn.execute(text(self._INDEX))
+        return True
+
+    @contextmanager
+    def bulk_insert(self, db: Session):
+        """Suspend the insert triggers and index the collected topics once, in the same transaction.
+
+        The marker row is removed before the caller commits; if the caller
+        rolls back instead, it disappears with the rest of the transaction.
+        """
+        db.execute(text(f"INSERT INTO {self._DEFERRED} (flag) VALUES (1)"))
+        topic_ids = []
+        yield topic_ids
+        if topic_ids:
+            db.execute(
+                text(self._INDEX + " WHERE t.id IN (SELECT value FROM json_each(:ids))"),
+                {"ids": json.dumps(topic_ids)},
+            )
+        db.execute(text(f"DELETE FROM {self._DEFERRED}"))
+
+    def _match_expression(self, query, search_type):
+        terms = " ".join('"' + term.replace('"', '""') + '"' for term in query.split(" "))
+        fields = SEARCH_FIELDS.get(search_type, SEARCH_FIELDS["all"])
+        columns = " ".join(self.FIELD_COLUMNS[field] for field in fields)
+        return f"{{{columns}}} : ({terms})"
+
+    def search(self, db: Session, q, search_type="all", limit=20, offset=0):
+        query = normalize(q)
+        if not query or _short_query(query):
+            return super().search(db, q, search_type, limit, offset)
+
+        weights = ", ".join(str(w) for w in self.WEIGHTS)
+        rows = db.execute(
+            text(
+                f"SELECT rowid FROM topics_fts WHERE topics_fts MATCH :match "
+                f"ORDER BY bm25(topics_fts, {weights}), rowid LIMIT :limit OFFSET :offset"
+            ),
+            {"match": self._match_expression(query, search_type), "limit": limit, "offset": offset},
+        )
+        return [row[0] for row in rows]
+
+
+_search_backend = None
+
+
+def get_search_backend():
+    global _search_backend
+    if _search_backend is None:
+        from database_config import engine
+        _search_backend = _select_backend(engine)
+    return _search_backend
+
+
+def _select_backend(engine):
+    mode = os.getenv("SEARCH_BACKEND", "auto").lower()
+    if mode != "memory":
+        dialect = engine.dialect.name
+        if dialect == "postgresql":
+            return PostgresTrigramSearchBackend()
+        if dialect == "sqlite":
+            return SQLiteFTSSearchBackend()
+    return MemorySearchBackend()
+
+
+def install_search_backend(engine):
+    """Create search indexes/triggers for the active engine (called from init_db)"""
+    global _search_backend
+    backend = _select_backend(engine)
+    try:
+        installed = backend.install(engine)
+    except Exception as e:
+        print(f"Error installing {backend.name} search backend: {e}")
+        installed = False
+    _search_backend = backend if installed else MemorySearchBackend()
+    print(f"Search backend: {_search_backend.name}")
+    return _search_backend
@@ -0,0 +1,212 @@
+"""
+In-memory character bigram inverted index for topic search.
+
+Hangul has no reliable word boundaries for substring search, so every field is
+split into overlapping character bigrams and a query matches a topic when all of
+its grams are present in the searched fields. Single characters are not
+indexed: a one-letter query term ("망") is answered from the postings of every
+indexed bigram that contains it, so it still finds every word containing it,
+like the LIKE search it replaces.
+
+Postings are packed arrays (8 bytes per topic and gram) rather than dicts, and
+only the source texts are kept per topic to unindex it. The index is built in
+the background at startup (see live_index) and kept up to date by the topic
+write paths; each worker process holds its own copy.
+"""
+import math
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict
+
+from sqlalchemy.orm import Session, selectinload
+
+import models
+from live_index import LiveIndex
+
+# 필드별 가중치 (제목 > 키워드/두음 > 본문)
+FIELD_WEIGHTS = {
+    "title": 5.0,
+    "keyword": 3.0,
+    "mnemonic": 3.0,
+    "content": 1.0,
+}
+
+# posting = topic_id << TF_BITS | min(tf, MAX_TF), one unsigned 64-bit array per gram
+TF_BITS = 8
+MAX_TF = (1 << TF_BITS) - 1
+
+SEARCH_FIELDS = {
+    "all": ("title", "keyword", "mnemonic", "content"),
+    "title": ("title",),
+    "keyword": ("keyword",),
+    "mnemonic": ("mnemonic",),
+    "content": ("content",),
+}
+
+
+def normalize(text):
+    return " ".join((text or "").lower().split())
+
+
+def ngrams(text):
+    """Character bigrams of every whitespace separated word; a one-letter word is its own gram"""
+    grams = []
+    for word in normalize(text).split(" "):
+        if len(word) == 1:
+            grams.append(word)
+        else:
+            grams.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return grams
+
+
+def topic_fields(topic):
+    """Extract indexable text per field from a Topic ORM object"""
+    return {
+        "title": [topic.title or ""],
+        "keyword": [k.keyword or "" for k in topic.keywords],
+        "mnemonic": [m.mnemonic or "" for m in topic.mnemonics],
+        "content": [topic.content or ""],
+    }
+
+
+class TopicSearchIndex(LiveIndex):
+    def __init__(self):
+        super().__init__()
+        # field -> gram -> sorted array of (topic_id << TF_BITS | term frequency)
+        self._postings = {field: {} for field in FIELD_WEIGHTS}
+        # character -> grams containing it, to answer one-character query terms
+        self._grams_by_char = defaultdict(set)
+        # topic_id -> indexed texts, re-split to unindex a topic
+        self._docs = {}
+        self._titles = {}
+
+    def _document(self, topic):
+        return topic_fields(topic)
+
+    def _load(self, db: Session):
+        topics = db.query(models.Topic).options(
+            selectinload(models.Topic.keywords),
+            selectinload(models.Topic.mnemonics),
+        ).order_by(models.Topic.id).yield_per(500)
+        for topic in topics:
+            self._add(topic.id, topic_fields(topic))
+
+    def _replace(self, topic_id, fields):
+        self._remove(topic_id)
+        if fields is not None:
+            self._add(topic_id, fields)
+
+    def _reset(self):
+        for postings in self._postings.values():
+            postings.clear()
+        self._grams_by_char.clear()
+        self._docs.clear()
+        self._titles.clear()
+
+    @staticmethod
+    def _field_grams(texts):
+        counts = Counter()
+        for text in texts:
+            counts.update(ngrams(text))
+        return counts
+
+    def _add(self, topic_id, fields):
+        for field, texts in fields.items():
+            postings = self._postings[field]
+            for gram, tf in self._field_grams(texts).items():
+                packed = topic_id << TF_BITS | min(tf, MAX_TF)
+                entry = postings.get(gram)
+                if entry is None:
+                    postings[gram] = array("Q", (packed,))
+                    for char in gram:
+                        self._grams_by_char[char].add(gram)
+                elif entry[-1] >> TF_BITS < topic_id:
+                    entry.append(packed)  # 빌드는 id 순이므로 대부분 끝에 추가
+                else:
+                    entry.insert(bisect_left(entry, topic_id << TF_BITS), packed)
+        self._docs[topic_id] = fields
+        self._titles[topic_id] = normalize(fields["title"][0])
+
+    def _remove(self, topic_id):
+        fields = self._docs.pop(topic_id, None)
+        self._titles.pop(topic_id, None)
+        if not fields:
+            return
+        for field, texts in fields.items():
+            postings = self._postings[field]
+            for gram in self._field_grams(texts):
+                entry = postings.get(gram)
+                if entry is None:
+                    continue
+                position = bisect_left(entry, topic_id << TF_BITS)
+                if position < len(entry) and entry[position] >> TF_BITS == topic_id:
+                    del entry[position]
+                if not entry:
+                    del postings[gram]
+                    if not any(gram in other for other in self._postings.values()):
+                        for char in gram:
+                            self._grams_by_char[char].discard(gram)
+
+    def _matches(self, field, gram):
+        """{topic_id: tf} of a query gram in one field.
+
+        A single character matches every gram containing it; the number of
+        such grams in a topic stands in for its term frequency.
+        """
+        postings = self._postings[field]
+        if len(gram) > 1:
+            return {packed >> TF_BITS: packed & MAX_TF for packed in postings.get(gram, ())}
+        matched = Counter()
+        for key in self._grams_by_char.get(gram, ()):
+            entry = postings.get(key)
+            if entry:
+                matched.update([packed >> TF_BITS for packed in entry])
+        return matched
+
+    def search(self, q, search_type="all", limit=20, offset=0):
+        """Return (total, ranked topic ids for the requested page)"""
+        fields = SEARCH_FIELDS.get(search_type, SEARCH_FIELDS["all"])
+        grams = list(dict.fromkeys(ngrams(q)))
+        if not grams:
+            return 0, []
+
+        with self._lock:
+            total_docs = max(len(self._docs), 1)
+            # 모든 gram을 포함하는 토픽만 후보 (필드는 달라도 됨), 희귀한 bigram부터 좁힌다
+            candidates = None
+            matches = {}
+            gram_docs = {}
+            for gram in sorted(grams, key=lambda g: (len(g) == 1, self._doc_freq(g, fields))):
+                matches[gram] = {field: self._matches(field, gram) for field in fields}
+                matched = set().union(*matches[gram].values())
+                gram_docs[gram] = len(matched)
+                candidates = matched if candidates is None else candidates & matched
+                if not candidates:
+                    return 0, []
+
+            scores = {}
+            for gram in grams:
+                idf = math.log(1 + total_docs / gram_docs[gram])
+                for field, entry in matches[gram].items():
+                    weight = FIELD_WEIGHTS[field] * idf
+                    for topic_id in candidates.intersection(entry):
+                        tf = entry[topic_id]
+                        scores[topic_id] = scores.get(topic_id, 0.0) + weight * (1 + math.log(tf))
+
+            if "title" in fields:
+                query = normalize(q)
+                for topic_id in candidates:
+                    title = self._titles.get(topic_id, "")
+                    if title == query:
+                        scores[topic_id] += 100.0
+                    elif title.startswith(query):
+                        scores[topic_id] += 20.0
+
+        ranked = sorted(scores, key=lambda topic_id: (-scores[topic_id], topic_id))
+        return len(ranked), ranked[offset:offset + limit]
+
+    def _doc_freq(self, gram, fields):
+        return sum(len(self._postings[field].get(gram, ())) for field in fields)
+
+
+topic_index = TopicSearchIndex()
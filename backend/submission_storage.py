@@ -0,0 +1,115 @@
+"""
+Content-addressed storage for homework submission files.
+
+Uploads are streamed to a temporary file in SUBMISSION_DIR chunk by chunk
+while the SHA-256 is computed, so no upload is ever held in memory; the file
+I/O runs in worker threads so a burst of uploads does not stall the event
+loop. The size limit is checked against Content-Length before reading and
+again while streaming.
+
+An object (objects/<first two hex chars>/<sha256>.pdf) is shared by every
+submission with the same content, so publishing and deleting it must not race:
+- publish() runs after the submission row is committed and moves the
+  temporary file into place, or drops it when the object already exists.
+- release() runs after the last reference was removed. It moves the object
+  aside, re-checks the references and only then deletes it; if a submission
+  was recorded in the meantime the object is put back.
+"""
+import hashlib
+import os
+import tempfile
+import uuid
+
+from anyio import CancelScope, to_thread
+
+SUBMISSION_DIR = os.getenv("SUBMISSION_DIR", "./submissions")
+MAX_SUBMISSION_BYTES = int(os.getenv("MAX_SUBMISSION_MB", "20")) * 1024 * 1024
+PDF_MAGIC = b"%PDF-"
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+class InvalidUpload(Exception):
+    pass
+
+
+def object_path(sha256):
+    """Path relative to SUBMISSION_DIR, as stored in Submission.file_path"""
+    return os.path.join("objects", sha256[:2], f"{sha256}.pdf")
+
+
+def absolute_path(relative_path):
+    return os.path.join(SUBMISSION_DIR, relative_path)
+
+
+def _open_temp():
+    tmp_dir = os.path.join(SUBMISSION_DIR, "tmp")
+    os.makedirs(tmp_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=tmp_dir, suffix=".part")
+    return tmp_path, os.fdopen(fd, "wb")
+
+
+def discard(tmp_path):
+    try:
+        os.remove(tmp_path)
+    except FileNotFoundError:
+        pass
+
+
+async def store_stream(chunks, max_bytes=MAX_SUBMISSION_BYTES):
+    """Write an async byte-chunk iterator to a temporary file; returns (sha256, size, temporary path).
+
+    The caller records the submission and then calls publish(), or discard() on failure.
+    """
+    tmp_path, tmp = await to_thread.run_sync(_open_temp)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async for chunk in chunks:
+            if not chunk:
+                continue
+            if size == 0 and not chunk.startswith(PDF_MAGIC[:len(chunk)]):
+                raise InvalidUpload("Only PDF files are accepted")
+            size += len(chunk)
+            if size > max_bytes:
+                raise UploadTooLarge(f"File exceeds {max_bytes // (1024 * 1024)} MB")
+            digest.update(chunk)
+            await to_thread.run_sync(tmp.write, chunk)
+        await to_thread.run_sync(tmp.close)
+        if size == 0:
+            raise InvalidUpload("Empty upload")
+        return digest.hexdigest(), size, tmp_path
+    except BaseException:
+        # 연결이 끊겨 취소된 경우에도 임시 파일은 정리
+        with CancelScope(shield=True):
+            await to_thread.run_sync(tmp.close)
+            await to_thread.run_sync(discard, tmp_path)
+        raise
+
+
+def publish(tmp_path, relative_path):
+    """Move an uploaded temporary file to its object path (call after the row referencing it is committed)"""
+    final_path = absolute_path(relative_path)
+    if os.path.exists(final_path):
+        discard(tmp_path)  # 동일 파일 재제출: 기존 객체 재사용
+        return
+    os.makedirs(os.path.dirname(final_path), exist_ok=True)
+    os.replace(tmp_path, final_path)
+
+
+def release(relative_path, is_referenced):
+    """Delete an object unless `is_referenced()` (checked after the object is moved aside) says otherwise"""
+    final_path = absolute_path(relative_path)
+    trash_path = f"{final_path}.{uuid.uuid4().hex}.deleting"
+    try:
+        os.replace(final_path, trash_path)
+    except FileNotFoundError:
+        return
+    if not is_referenced():
+        os.remove(trash_path)
+    elif os.path.exists(final_path):
+        os.remove(trash_path)  # 그 사이 같은 내용이 다시 게시됨
+    else:
+        os.replace(trash_path, final_path)
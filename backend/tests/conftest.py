@@ -0,0 +1,22 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# 앱 모듈을 불러오기 전에 임시 SQLite DB를 지정
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}"
+os.environ.setdefault("SLOW_QUERY_MS", "60000")
+# 백그라운드 인덱스 빌드가 쿼리 수 측정에 섞이지 않도록
+os.environ.setdefault("INDEX_WARM_UP", "false")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+
+    import main
+
+    with TestClient(main.app) as client:
+        yield client
@@ -0,0 +1,93 @@
+import pytest
+from sqlalchemy import select
+
+import exam_stats
+import models
+from database_config import SessionLocal
+
+TOPIC_COLUMNS = ("topic_id", "exam_count", "score_count", "score_sum", "last_round", "last_round_number")
+CATEGORY_COLUMNS = (
+    "category_id", "topic_count", "exam_count", "score_count", "score_sum", "last_round", "last_round_number",
+)
+
+
+def snapshot(db):
+    """Both aggregate tables without updated_at, which rebuild() naturally changes"""
+    def rows(model, columns):
+        key = getattr(model, columns[0])
+        return [
+            tuple(round(value, 6) if isinstance(value, float) else value for value in row)
+            for row in db.execute(select(*(getattr(model, column) for column in columns)).order_by(key))
+        ]
+    return rows(models.TopicExamStats, TOPIC_COLUMNS), rows(models.CategoryExamStats, CATEGORY_COLUMNS)
+
+
+def assert_matches_rebuild():
+    db = SessionLocal()
+    try:
+        incremental = snapshot(db)
+        exam_stats.rebuild(db)
+        db.flush()
+        assert incremental == snapshot(db)
+    finally:
+        db.rollback()
+        db.close()
+
+
+@pytest.fixture(scope="module")
+def categories(client):
+    ids = []
+    for name in ("통계 테스트 네트워크", "통계 테스트 보안"):
+        response = client.post("/api/categories/", json={"name": name})
+        response.raise_for_status()
+        ids.append(response.json()["id"])
+    return ids
+
+
+def create_topic(client, title, category_id=None):
+    response = client.post("/api/topics/", json={"title": title, "content": "본문", "category_id": category_id})
+    response.raise_for_status()
+    return response.json()["id"]
+
+
+def add_history(client, entries):
+    response = client.post("/api/exam-history/", json=[
+        {"topic_id": topic_id, "exam_round": exam_round, "question_number": "1", "score": score}
+        for topic_id, exam_round, score in entries
+    ])
+    response.raise_for_status()
+    return [row["id"] for row in response.json()]
+
+
+def test_incremental_stats_equal_rebuild(client, categories):
+    network, security = categories
+    tcp = create_topic(client, "통계 TCP", network)
+    udp = create_topic(client, "통계 UDP", network)
+    aes = create_topic(client, "통계 AES", security)
+    loose = create_topic(client, "통계 미분류")
+
+    first = add_history(client, [(tcp, "130회", 8.5), (udp, "130회", None), (aes, "129회", 7.0), (loose, "기출", 5.0)])
+    assert_matches_rebuild()
+
+    # 기존 행에 누적: 같은 배치 안의 중복, 번호 없는 회차, 더 이른 회차
+    history = add_history(client, [
+        (tcp, "131회", 9.0), (tcp, "모의고사", None), (aes, "128회", 6.5), (udp, "132회", 4.0),
+    ])
+    assert_matches_rebuild()
+
+    # 회차가 가장 늦은 기록과 토픽의 마지막 기록 삭제
+    client.delete(f"/api/exam-history/{history[3]}").raise_for_status()
+    assert_matches_rebuild()
+    client.delete(f"/api/exam-history/{first[1]}").raise_for_status()
+    assert_matches_rebuild()
+
+    # 카테고리 이동: 단건 수정과 일괄 이동 (미분류로, 미분류에서)
+    client.put(f"/api/topics/{tcp}", json={"category_id": security}).raise_for_status()
+    assert_matches_rebuild()
+    client.put("/api/topics/bulk/category", json={"topic_ids": [aes, loose], "category_id": network}).raise_for_status()
+    assert_matches_rebuild()
+    client.put("/api/topics/bulk/category", json={"topic_ids": [tcp], "category_id": None}).raise_for_status()
+    assert_matches_rebuild()
+
+    client.delete(f"/api/topics/{aes}").raise_for_status()
+    assert_matches_rebuild()
@@ -0,0 +1,50 @@
+import pytest
+from sqlalchemy import event
+
+
+@pytest.fixture(scope="module")
+def topics(client):
+    ids = []
+    for i in range(40):
+        response = client.post("/api/topics/", json={
+            "title": f"쿼리 수 토픽 {i}",
+            "content": "본문",
+            "keywords": [f"키워드{i}", "공통"],
+            "mnemonics": [{"mnemonic": f"두음{i}", "full_text": "전체"}],
+        })
+        response.raise_for_status()
+        ids.append(response.json()["id"])
+    client.post("/api/exam-history/", json=[
+        {"topic_id": topic_id, "exam_round": "130회", "question_number": "1", "session": 1} for topic_id in ids
+    ]).raise_for_status()
+    return ids
+
+
+def count_statements(client, url):
+    from database_config import engine
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        response = client.get(url)
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    response.raise_for_status()
+    return len(statements), response.json()
+
+
+@pytest.mark.parametrize("path, items", [
+    ("/api/topics/?limit={limit}", lambda body: body),
+    ("/api/topics/page?limit={limit}", lambda body: body["items"]),
+])
+def test_query_count_does_not_depend_on_page_size(client, topics, path, items):
+    small, small_body = count_statements(client, path.format(limit=5))
+    large, large_body = count_statements(client, path.format(limit=30))
+
+    assert len(items(small_body)) == 5
+    assert len(items(large_body)) == 30
+    assert small == large
@@ -0,0 +1,70 @@
+import pytest
+
+import models
+import versioning
+from database_config import SessionLocal
+
+
+def edited(base, i):
+    lines = base.splitlines()
+    lines[i % len(lines)] = f"{i}번째 수정: 캐시 일관성과 TLB 플러시 정책"
+    return "\n".join(lines)
+
+
+@pytest.fixture(scope="module")
+def versioned_topic(client):
+    """Topic with more than two keyframe intervals of edits; returns (topic_id, {version: content})"""
+    content = "\n".join(f"{n}. 가상 메모리 페이지 교체 알고리즘 설명 줄" for n in range(30))
+    response = client.post("/api/topics/", json={"title": "버전 테스트", "content": content, "keywords": []})
+    response.raise_for_status()
+    topic_id = response.json()["id"]
+
+    expected = {1: content}
+    for i in range(2 * versioning.KEYFRAME_INTERVAL + 3):
+        if i == versioning.KEYFRAME_INTERVAL + 2:
+            # 전부 바뀌는 수정: 델타가 본문보다 커서 키프레임으로 저장되어야 함
+            new_content = "\n".join(f"완전히 다른 내용 {n}: 프로세스 스케줄링" for n in range(40))
+        else:
+            new_content = edited(content, i)
+        client.put(f"/api/topics/{topic_id}", json={"content": new_content}).raise_for_status()
+        # PUT은 수정 전 본문을 새 버전으로 남긴다
+        expected[max(expected) + 1] = content
+        content = new_content
+    return topic_id, expected
+
+
+def test_versions_store_deltas_and_promoted_keyframes(versioned_topic):
+    topic_id, expected = versioned_topic
+    db = SessionLocal()
+    try:
+        rows = db.query(models.TopicVersion).filter(models.TopicVersion.topic_id == topic_id).all()
+    finally:
+        db.close()
+
+    assert sorted(row.version for row in rows) == sorted(expected)
+    scheduled = {
+        row.version for row in rows
+        if row.version == 1 or (row.version - 1) % versioning.KEYFRAME_INTERVAL == 0
+    }
+    keyframes = {row.version for row in rows if versioning.is_keyframe(row)}
+    assert scheduled <= keyframes
+    assert keyframes - scheduled, "the full rewrite should have been stored as a keyframe"
+    assert len(keyframes) < len(rows)
+
+
+def test_versions_match_plain_text(client, versioned_topic):
+    topic_id, expected = versioned_topic
+
+    listed = client.get(f"/api/topics/{topic_id}/versions").json()
+    assert [item["version"] for item in listed] == sorted(expected, reverse=True)
+    assert {item["version"]: item["content"] for item in listed} == expected
+
+    db = SessionLocal()
+    try:
+        for version, content in expected.items():
+            assert client.get(f"/api/topics/{topic_id}/versions/{version}").json()["content"] == content
+            assert versioning.materialize(db, topic_id, version) == content
+    finally:
+        db.close()
+
+    assert client.get(f"/api/topics/{topic_id}/versions/{max(expected) + 1}").status_code == 404
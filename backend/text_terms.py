@@ -0,0 +1,33 @@
+"""
+Content words (terms) of Korean/English subnote text.
+
+Shared by pdf_ingest (keyword proposals) and related_index (TF-IDF vectors):
+Hangul words of two or more syllables with a trailing particle (조사) removed
+and English terms, minus stopwords and predicates.
+"""
+import re
+
+_TOKEN = re.compile(r"[A-Za-z][A-Za-z0-9+\-/]*[A-Za-z0-9+]|[가-힣]{2,}")
+_HANGUL_WORD = re.compile(r"[가-힣]+")
+_PARTICLES = ("으로", "에서", "에게", "까지", "부터", "은", "는", "이", "가", "을", "를", "의", "에", "와", "과", "로", "도")
+_STOPWORDS = {
+    "정의", "개념", "특징", "구성", "요소", "유형", "종류", "절차", "방법", "기법", "비교", "설명", "활용",
+    "통한", "위한", "대한", "관련", "있음", "없음", "the", "and", "for", "with",
+}
+
+
+def _strip_particle(token):
+    if token.endswith(_PARTICLES) and _HANGUL_WORD.fullmatch(token):
+        for particle in _PARTICLES:
+            if token.endswith(particle) and len(token) - len(particle) >= 2:
+                return token[:-len(particle)]
+    return token
+
+
+def terms(text):
+    """Content words of a text: Hangul words without particles and English terms, stopwords dropped"""
+    for token in _TOKEN.findall(text or ""):
+        token = _strip_particle(token)
+        if token.lower() in _STOPWORDS or token.endswith("다"):  # 서술어(~이다, ~한다) 제외
+            continue
+        yield token
@@ -0,0 +1,167 @@
+"""
+Bulk topic import (JSON / CSV).
+
+The whole payload is validated before anything is written: every row goes
+through schemas.TopicCreate and category resolution, errors are reported per
+row number and nothing is inserted unless all rows are valid. insert_topics()
+then writes topics, keywords, mnemonics and the initial TopicVersion with one
+executemany INSERT per table and batch (SQLAlchemy sends them as multi-row
+VALUES), so the number of round trips no longer grows with the number of
+topics, and indexes them for search once (search_backend.bulk_insert). It is
+shared with the PDF ingestion pipeline.
+
+CSV columns: title, category, category_id, content, keywords, mnemonics.
+keywords are separated by ';', mnemonics are 'mnemonic=full text' entries
+separated by ';'.
+"""
+import csv
+import io
+from datetime import datetime
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+import models
+import schemas
+from search_backend import get_search_backend
+
+INSERT_BATCH_SIZE = 1000
+CSV_LIST_SEPARATOR = ";"
+
+
+def decode_csv(data: bytes) -> str:
+    # 엑셀에서 저장한 CSV는 BOM이 붙거나 cp949인 경우가 많음
+    try:
+        return data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return data.decode("cp949")
+
+
+def _split(value):
+    if not value:
+        return []
+    return [item.strip() for item in value.split(CSV_LIST_SEPARATOR) if item.strip()]
+
+
+def parse_csv(text):
+    """Turn CSV text into row dicts in the JSON import format"""
+    rows = []
+    for record in csv.DictReader(io.StringIO(text)):
+        record = {key.strip(): (value or "").strip() for key, value in record.items() if key}
+        mnemonics = []
+        for item in _split(record.get("mnemonics")):
+            mnemonic, _, full_text = item.partition("=")
+            mnemonics.append({"mnemonic": mnemonic.strip(), "full_text": full_text.strip()})
+        rows.append({
+            "title": record.get("title", ""),
+            "category": record.get("category") or None,
+            "category_id": record.get("category_id") or None,
+            "content": record.get("content") or None,
+            "keywords": _split(record.get("keywords")),
+            "mnemonics": mnemonics,
+        })
+    return rows
+
+
+def validate_rows(db: Session, rows):
+    """Return (topics ready for insert_topics, per-row errors); rows are numbered from 1"""
+    categories = dict(db.query(models.Category.id, models.Category.name).all())
+    ids_by_name = {}
+    for category_id, name in sorted(categories.items()):
+        ids_by_name.setdefault(name, category_id)
+
+    topics = []
+    errors = []
+    for row_number, row in enumerate(rows, start=1):
+        try:
+            topic = schemas.TopicCreate.model_validate(row)
+        except ValidationError as e:
+            errors.extend(
+                {"row": row_number, "field": ".".join(str(part) for part in error["loc"]), "message": error["msg"]}
+                for error in e.errors()
+            )
+            continue
+
+        title = topic.title.strip()
+        if not title:
+            errors.append({"row": row_number, "field": "title", "message": "Title is required"})
+            continue
+        if topic.category_id is not None:
+            if topic.category_id not in categories:
+                errors.append({"row": row_number, "field": "category_id", "message": "Category not found"})
+                continue
+            category_id, category = topic.category_id, categories[topic.category_id]
+        else:
+            category_id, category = ids_by_name.get(topic.category), topic.category
+
+        topics.append({
+            "title": title,
+            "category": category,
+            "category_id": category_id,
+            "content": topic.content,
+            "keywords": [keyword for keyword in topic.keywords if keyword.strip()],
+            "mnemonics": [mnemonic.model_dump() for mnemonic in topic.mnemonics],
+        })
+    return topics, errors
+
+
+def insert_topics(db: Session, topics, changed_by="system", change_reason="Bulk import"):
+    """Insert validated topics with their keywords, mnemonics and version 1; returns the new ids.
+
+    Does not commit, so the caller decides the transaction boundary.
+    """
+    now = datetime.utcnow()
+    with get_search_backend().bulk_insert(db) as topic_ids:
+        # SQLite는 RETURNING 순서를 보장하지 못해 sort_by_parameter_order가 행 단위 INSERT로 바뀜.
+        # 한 문장 안의 행은 VALUES 순서대로 증가하는 rowid를 받으므로 정렬한 id를 대응시킴
+        is_sqlite = db.get_bind().dialect.name == "sqlite"
+        statement = insert(models.Topic).returning(models.Topic.id, sort_by_parameter_order=not is_sqlite)
+        for start in range(0, len(topics), INSERT_BATCH_SIZE):
+            batch = topics[start:start + INSERT_BATCH_SIZE]
+            ids = db.execute(
+                statement,
+                [
+                    {
+                        "title": topic["title"],
+                        "category": topic["category"],
+                        "category_id": topic["category_id"],
+                        "content": topic["content"],
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    for topic in batch
+                ]
+            ).scalars().all()
+            if is_sqlite:
+                ids = sorted(ids)
+
+            keywords = [
+                {"topic_id": topic_id, "keyword": keyword}
+                for topic_id, topic in zip(ids, batch)
+                for keyword in topic["keywords"]
+            ]
+            mnemonics = [
+                {"topic_id": topic_id, "mnemonic": mnemonic["mnemonic"], "full_text": mnemonic["full_text"]}
+                for topic_id, topic in zip(ids, batch)
+                for mnemonic in topic["mnemonics"]
+            ]
+            # 첫 버전은 항상 전체 내용을 저장하는 keyframe (versioning.create_version과 동일)
+            versions = [
+                {
+                    "topic_id": topic_id,
+                    "content": topic["content"],
+                    "version": 1,
+                    "changed_by": changed_by,
+                    "change_reason": change_reason,
+                    "created_at": now,
+                }
+                for topic_id, topic in zip(ids, batch)
+            ]
+            if keywords:
+                db.execute(insert(models.Keyword), keywords)
+            if mnemonics:
+                db.execute(insert(models.Mnemonic), mnemonics)
+            db.execute(insert(models.TopicVersion), versions)
+            topic_ids.extend(ids)
+    return topic_ids
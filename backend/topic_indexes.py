@@ -0,0 +1,187 @@
+"""
+The per-process topic indexes (search, autocomplete, related topics).
+
+INDEXES are the LiveIndex instances every worker keeps in memory. warm_up()
+builds them one after another in a background thread at startup, so no
+request pays for a build; a request that needs an index before its build has
+finished waits for it instead of starting a second one. Set INDEX_WARM_UP=false
+to build lazily on first use (scripts, tests).
+
+Topic write paths call one of topic_saved(), topic_removed() or topics_added()
+after committing; these update every index and drop the exam generator pools,
+so a new index only has to be added to INDEXES. Bulk writes (topic import, PDF
+ingest) do not throw the indexes away: topics_added() hands the new ids to a
+single background writer, which loads them in batches and indexes them one by
+one, so the precomputed structures - related topic lists above all - survive
+and lookups keep being served. Indexes with corpus-wide weights (related
+topics' IDF) are then rebuilt in the background when at least
+REBUILD_AFTER_TOPICS topics came in at once.
+
+Topics inserted by another process (the pdf_ingest CLI, another worker) are
+picked up by ready(): at most every INDEX_SYNC_SECONDS it looks for topic ids
+above the highest one this process has seen and indexes them the same way.
+Edits and deletes made by other processes are not propagated.
+"""
+import os
+import queue
+import threading
+import time
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session, selectinload
+
+import exam_generator
+import models
+from autocomplete import autocomplete_index
+from related_index import related_index
+from search_index import topic_index
+
+INDEXES = (topic_index, autocomplete_index, related_index)
+INDEX_WARM_UP = os.getenv("INDEX_WARM_UP", "true").lower() in ("1", "true", "yes", "on")
+INDEX_SYNC_SECONDS = float(os.getenv("INDEX_SYNC_SECONDS", "30"))
+REINDEX_BATCH_SIZE = 500
+REBUILD_AFTER_TOPICS = int(os.getenv("INDEX_REBUILD_AFTER_TOPICS", "100"))
+
+_jobs = queue.Queue()
+_writer = None
+_writer_lock = threading.Lock()
+
+_sync_lock = threading.Lock()
+_known_id = None  # 이 프로세스가 색인 대상으로 확인한 최대 topic id
+_local_ids = set()  # _known_id보다 큰, 이 프로세스가 직접 색인한 id
+_synced_at = 0.0
+
+
+def _note_latest(db: Session):
+    """Remember the newest topic id before the first build; later inserts are found by ready()"""
+    global _known_id
+    with _sync_lock:
+        if _known_id is None:
+            _known_id = db.query(func.max(models.Topic.id)).scalar() or 0
+
+
+def _build_all():
+    from database_config import SessionLocal
+
+    db = SessionLocal()
+    try:
+        _note_latest(db)
+        for index in INDEXES:
+            index.ensure_built(db)
+    except Exception as e:
+        print(f"Topic index warm-up failed, building on first use instead: {e}")
+    finally:
+        db.close()
+
+
+def warm_up():
+    """Start building every index in a daemon thread; returns the thread"""
+    thread = threading.Thread(target=_build_all, name="topic-index-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+def ready(index, db: Session):
+    """Build `index` if needed and queue topics other processes have inserted since"""
+    global _known_id, _synced_at
+    if not index.built:
+        _note_latest(db)
+        index.ensure_built(db)
+    if time.monotonic() - _synced_at < INDEX_SYNC_SECONDS or not _sync_lock.acquire(blocking=False):
+        return
+    try:
+        _synced_at = time.monotonic()
+        if _known_id is None:  # 인덱스를 topic_indexes 밖에서 빌드한 경우
+            return
+        new_ids = [row.id for row in db.query(models.Topic.id).filter(
+            models.Topic.id > _known_id
+        ).order_by(models.Topic.id)]
+        if not new_ids:
+            return
+        _known_id = new_ids[-1]
+        foreign = [topic_id for topic_id in new_ids if topic_id not in _local_ids]
+        _local_ids.difference_update(new_ids)
+    finally:
+        _sync_lock.release()
+    if foreign:
+        _submit(foreign)
+        exam_generator.invalidate_pools()
+
+
+def topic_saved(topic):
+    """Index a created or updated topic (loaded with keywords and mnemonics); call after commit"""
+    _mark_local([topic.id])
+    for index in INDEXES:
+        index.index_topic(topic)
+    exam_generator.invalidate_pools()
+
+
+def topic_removed(topic_id):
+    for index in INDEXES:
+        index.remove_topic(topic_id)
+    exam_generator.invalidate_pools()
+
+
+def topics_added(topic_ids):
+    """Index committed bulk-written topics in the background"""
+    if not topic_ids:
+        return
+    _mark_local(topic_ids)
+    _submit(list(topic_ids))
+    exam_generator.invalidate_pools()
+
+
+def _mark_local(topic_ids):
+    with _sync_lock:
+        if _known_id is not None:
+            _local_ids.update(topic_id for topic_id in topic_ids if topic_id > _known_id)
+
+
+def _submit(topic_ids):
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = threading.Thread(target=_write_jobs, name="topic-index-writer", daemon=True)
+            _writer.start()
+    _jobs.put(topic_ids)
+
+
+def _write_jobs():
+    while True:
+        topic_ids = _jobs.get()
+        try:
+            _reindex(topic_ids)
+        except Exception as e:
+            print(f"Topic index update failed for {len(topic_ids)} topics: {e}")
+        finally:
+            _jobs.task_done()
+
+
+def _reindex(topic_ids):
+    from database_config import SessionLocal
+
+    indexes = [index for index in INDEXES if index.in_use]
+    if not indexes:
+        return
+    db = SessionLocal()
+    try:
+        for start in range(0, len(topic_ids), REINDEX_BATCH_SIZE):
+            batch = topic_ids[start:start + REINDEX_BATCH_SIZE]
+            topics = db.query(models.Topic).options(
+                selectinload(models.Topic.keywords),
+                selectinload(models.Topic.mnemonics),
+            ).filter(models.Topic.id.in_(batch)).all()
+            for topic in topics:
+                for index in indexes:
+                    index.index_topic(topic)
+            # 그 사이 삭제된 토픽
+            for topic_id in set(batch) - {topic.id for topic in topics}:
+                for index in indexes:
+                    index.remove_topic(topic_id)
+            db.expunge_all()
+        if len(topic_ids) >= REBUILD_AFTER_TOPICS:
+            for index in indexes:
+                if index.global_weights:
+                    index.rebuild(db)
+    finally:
+        db.close()
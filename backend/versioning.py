@@ -0,0 +1,157 @@
+"""
+Delta-compressed topic version storage.
+
+Every KEYFRAME_INTERVAL-th version (and the first one) stores the full text in
+TopicVersion.content. The versions in between store only a diff-match-patch
+delta against the previous version in TopicVersion.delta, with content left
+NULL. Rows written before deltas existed have delta NULL and are therefore
+treated as keyframes, so old data needs no rewrite.
+
+Materializing a version reads its nearest keyframe and applies at most
+KEYFRAME_INTERVAL - 1 deltas. Diffs between two versions are cached in-process.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+from diff_match_patch import diff_match_patch
+from sqlalchemy.orm import Session
+
+import models
+
+KEYFRAME_INTERVAL = max(1, int(os.getenv("VERSION_KEYFRAME_INTERVAL", "10")))
+
+_dmp = diff_match_patch()
+_dmp.Diff_Timeout = 1.0
+
+
+def make_delta(old, new):
+    diffs = _dmp.diff_main(old, new)
+    _dmp.diff_cleanupEfficiency(diffs)
+    return _dmp.diff_toDelta(diffs)
+
+
+def apply_delta(base, delta):
+    return _dmp.diff_text2(_dmp.diff_fromDelta(base, delta))
+
+
+def is_keyframe(row):
+    return row.delta is None
+
+
+def create_version(
+    db: Session,
+    topic_id,
+    content,
+    version,
+    changed_by,
+    change_reason,
+    previous_content=None,
+):
+    """Add a TopicVersion row, storing a delta against previous_content when possible"""
+    db_version = models.TopicVersion(
+        topic_id=topic_id,
+        version=version,
+        changed_by=changed_by,
+        change_reason=change_reason,
+    )
+    keyframe = (
+        version <= 1
+        or (version - 1) % KEYFRAME_INTERVAL == 0
+        or content is None
+        or previous_content is None
+    )
+    if not keyframe:
+        delta = make_delta(previous_content, content)
+        # 변경량이 많으면 전체 저장이 더 작음
+        keyframe = len(delta) >= len(content)
+    if keyframe:
+        db_version.content = content
+    else:
+        db_version.delta = delta
+    db.add(db_version)
+    return db_version
+
+
+def materialize(db: Session, topic_id, version):
+    """Return the full content of one version, or raise LookupError"""
+    keyframe = db.query(models.TopicVersion.version).filter(
+        models.TopicVersion.topic_id == topic_id,
+        models.TopicVersion.version <= version,
+        models.TopicVersion.delta.is_(None),
+    ).order_by(models.TopicVersion.version.desc()).first()
+    if keyframe is None:
+        raise LookupError(f"No keyframe for topic {topic_id} version {version}")
+
+    rows = db.query(models.TopicVersion).filter(
+        models.TopicVersion.topic_id == topic_id,
+        models.TopicVersion.version >= keyframe.version,
+        models.TopicVersion.version <= version,
+    ).order_by(models.TopicVersion.version).all()
+    if not rows or rows[-1].version != version:
+        raise LookupError(f"Topic {topic_id} has no version {version}")
+    return materialize_rows(rows)[version]
+
+
+def materialize_rows(rows):
+    """Map version -> content for rows of one topic ordered by ascending version"""
+    contents = {}
+    current = None
+    for row in rows:
+        if is_keyframe(row):
+            current = row.content
+        elif current is None:
+            raise LookupError(f"Version {row.version} has no base to apply its delta to")
+        else:
+            current = apply_delta(current, row.delta)
+        contents[row.version] = current
+    return contents
+
+
+class DiffCache:
+    """Bounded LRU of computed diffs keyed by (topic_id, v1, v2).
+
+    Stored versions never change, so entries only need dropping when the topic
+    itself is deleted (SQLite may hand its id to a new topic).
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def forget_topic(self, topic_id):
+        with self._lock:
+            for key in [key for key in self._items if key[0] == topic_id]:
+                del self._items[key]
+
+
+diff_cache = DiffCache(int(os.getenv("VERSION_DIFF_CACHE_SIZE", "256")))
+
+
+def diff_versions(db: Session, topic_id, v1, v2):
+    """Return [(op, text), ...] turning version v1 into v2 (op: -1 delete, 0 equal, 1 insert)"""
+    key = (topic_id, v1, v2)
+    diffs = diff_cache.get(key)
+    if diffs is None:
+        old = materialize(db, topic_id, v1) or ""
+        new = materialize(db, topic_id, v2) or ""
+        diffs = _dmp.diff_main(old, new)
+        _dmp.diff_cleanupSemantic(diffs)
+        diffs = [(op, text) for op, text in diffs]
+        diff_cache.put(key, diffs)
+    return diffs
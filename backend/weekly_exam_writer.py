@@ -0,0 +1,102 @@
+"""
+Writing weekly mock exams (주간 모의고사) in a single transaction.
+
+Questions are validated against the real exam format before anything is
+written (session 1: 13 short-answer questions, session 2: 6 essays, no
+duplicate numbers), so a rejected exam never leaves a half-created row behind.
+insert_exams() then writes all exams with one multi-row INSERT ... RETURNING
+and all their questions with one executemany INSERT, whatever the number of
+exams - the same path serves single creation, semester cloning and generated
+drafts. Nothing here commits; the caller owns the transaction.
+"""
+from datetime import datetime
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+import models
+
+# 교시별 문항 수
+SESSION_QUESTIONS = {1: 13, 2: 6}
+QUESTION_TYPES = {question_type.value for question_type in models.QuestionType}
+
+
+def validate_questions(questions):
+    """Per-question errors ({question, field, message}, numbered from 1) for an exam's questions"""
+    errors = []
+    seen = set()
+    for index, question in enumerate(questions, start=1):
+        def error(field, message):
+            errors.append({"question": index, "field": field, "message": message})
+
+        if question.session not in SESSION_QUESTIONS:
+            error("session", "session must be 1 or 2")
+            continue
+        if not 1 <= question.question_number <= SESSION_QUESTIONS[question.session]:
+            error("question_number", f"session {question.session} has questions 1-{SESSION_QUESTIONS[question.session]}")
+        elif (question.session, question.question_number) in seen:
+            error("question_number", "duplicate question number")
+        seen.add((question.session, question.question_number))
+        if question.question_type not in QUESTION_TYPES:
+            error("question_type", f"question_type must be one of: {', '.join(sorted(QUESTION_TYPES))}")
+        if not question.question_text.strip():
+            error("question_text", "question_text is required")
+    return errors
+
+
+def insert_exams(db: Session, exams):
+    """Insert exams given as {week_number, category_id, questions: [dict]}; returns the new ids in order"""
+    if not exams:
+        return []
+    now = datetime.utcnow()
+    # topic_import.insert_topics와 같은 이유로 SQLite에서는 정렬한 id를 대응시킴
+    is_sqlite = db.get_bind().dialect.name == "sqlite"
+    ids = db.execute(
+        insert(models.WeeklyExam).returning(models.WeeklyExam.id, sort_by_parameter_order=not is_sqlite),
+        [
+            {"week_number": exam["week_number"], "category_id": exam["category_id"], "created_at": now, "updated_at": now}
+            for exam in exams
+        ]
+    ).scalars().all()
+    if is_sqlite:
+        ids = sorted(ids)
+
+    questions = [
+        {
+            "weekly_exam_id": exam_id,
+            "session": question["session"],
+            "question_number": question["question_number"],
+            "question_text": question["question_text"],
+            "question_type": models.QuestionType(question["question_type"]),
+            "topic_id": question.get("topic_id"),
+            "created_at": now,
+            "updated_at": now,
+        }
+        for exam_id, exam in zip(ids, exams)
+        for question in exam["questions"]
+    ]
+    if questions:
+        db.execute(insert(models.ExamQuestion), questions)
+    return ids
+
+
+def clone_exams(db: Session, source_exams, week_offset=0, category_map=None):
+    """Copy WeeklyExam rows (questions loaded) with shifted weeks and remapped categories"""
+    category_map = category_map or {}
+    return insert_exams(db, [
+        {
+            "week_number": exam.week_number + week_offset,
+            "category_id": category_map.get(exam.category_id, exam.category_id),
+            "questions": [
+                {
+                    "session": question.session,
+                    "question_number": question.question_number,
+                    "question_text": question.question_text,
+                    "question_type": question.question_type.value,
+                    "topic_id": question.topic_id,
+                }
+                for question in exam.questions
+            ],
+        }
+        for exam in source_exams
+    ])
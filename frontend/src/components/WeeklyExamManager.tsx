@@ -53,6 +53,17 @@ interface WeeklyExam {
   created_at: string;
 }
 
+interface WeeklyExamSummary {
+  id: number;
+  week_number: number;
+  category_id: number;
+  category_name?: string;
+  session1_questions: number;
+  session2_questions: number;
+  question_count: number;
+  created_at: string;
+}
+
 interface Student {
   id: number;
   name: string;
@@ -71,7 +82,7 @@ interface ExamScore {
 }
 
 const WeeklyExamManager: React.FC = () => {
-  const [weeklyExams, setWeeklyExams] = useState<WeeklyExam[]>([]);
+  const [weeklyExams, setWeeklyExams] = useState<WeeklyExamSummary[]>([]);
   const [categories, setCategories] = useState<Category[]>([]);
   const [students, setStudents] = useState<Student[]>([]);
   const [examScores, setExamScores] = useState<ExamScore[]>([]);
@@ -114,7 +125,8 @@ const WeeklyExamManager: React.FC = () => {
 
   const loadWeeklyExams = async () => {
     try {
-      const response = await axios.get(`${process.env.REACT_APP_API_URL || 'http://localhost:9000'}/weekly-exams-direct`);
+      // 목록은 요약(교시별 문항 수)만 받고, 문제는 상세를 열 때 불러옴
+      const response = await axios.get(`${process.env.REACT_APP_API_URL || 'http://localhost:9000'}/weekly-exams/summary`);
       setWeeklyExams(response.data);
     } catch (error) {
       message.error('주간모의고사를 불러오는데 실패했습니다.');
@@ -199,7 +211,7 @@ const WeeklyExamManager: React.FC = () => {
         questions: [...session1Qs, ...session2Qs],
       };
 
-      await axios.post(`${process.env.REACT_APP_API_URL || 'http://localhost:9000'}/weekly-exams-direct`, examData);
+      await axios.post(`${process.env.REACT_APP_API_URL || 'http://localhost:9000'}/weekly-exams/`, examData);
 
       message.success('주간모의고사가 성공적으로 등록되었습니다.');
       setIsCreateModalVisible(false);
@@ -218,19 +230,33 @@ const WeeklyExamManager: React.FC = () => {
     setIsCreateModalVisible(true);
   };
 
-  const showDetailModal = (exam: WeeklyExam) => {
-    setSelectedExam(exam);
-    setIsDetailModalVisible(true);
+  const loadExamDetail = async (examId: number) => {
+    try {
+      const response = await axios.get(`${process.env.REACT_APP_API_URL || 'http://localhost:9000'}/weekly-exams/${examId}`);
+      setSelectedExam(response.data);
+      return true;
+    } catch (error) {
+      message.error('주간모의고사 문제를 불러오는데 실패했습니다.');
+      return false;
+    }
+  };
+
+  const showDetailModal = async (exam: WeeklyExamSummary) => {
+    if (await loadExamDetail(exam.id)) {
+      setIsDetailModalVisible(true);
+    }
   };
 
-  const showScoreModal = (exam: WeeklyExam) => {
-    setSelectedExam(exam);
-    setIsScoreModalVisible(true);
+  const showScoreModal = async (exam: WeeklyExamSummary) => {
+    if (await loadExamDetail(exam.id)) {
+      setIsScoreModalVisible(true);
+    }
   };
 
-  const showScoreViewModal = (exam: WeeklyExam) => {
-    setSelectedExam(exam);
-    setIsScoreViewModalVisible(true);
+  const showScoreViewModal = async (exam: WeeklyExamSummary) => {
+    if (await loadExamDetail(exam.id)) {
+      setIsScoreViewModalVisible(true);
+    }
   };
 
   const handleScoreSubmit = async (values: any) => {
@@ -374,7 +400,7 @@ const WeeklyExamManager: React.FC = () => {
         {weeklyExams.map((exam) => (
           <Col span={8} key={exam.id} style={{ marginBottom: 16 }}>
             <Card
-              title={`${exam.week_number}주차 - ${exam.category?.name}`}
+              title={`${exam.week_number}주차 - ${exam.category_name}`}
               extra={
                 <Space>
                   <Button
@@ -399,7 +425,7 @@ const WeeklyExamManager: React.FC = () => {
                 </Space>
               }
             >
-              <p>문제 수: {exam.questions?.length || 0}개</p>
+              <p>문제 수: {exam.question_count}개 (1교시 {exam.session1_questions} / 2교시 {exam.session2_questions})</p>
               <p>등록일: {new Date(exam.created_at).toLocaleDateString()}</p>
             </Card>
           </Col>
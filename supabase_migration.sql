@@ -7,6 +7,8 @@ CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 -- Drop tables if exists (for clean migration)
 DROP TABLE IF EXISTS exam_questions CASCADE;
 DROP TABLE IF EXISTS weekly_exams CASCADE;
+DROP TABLE IF EXISTS category_exam_stats CASCADE;
+DROP TABLE IF EXISTS topic_exam_stats CASCADE;
 DROP TABLE IF EXISTS exam_history CASCADE;
 DROP TABLE IF EXISTS submissions CASCADE;
 DROP TABLE IF EXISTS assignments CASCADE;
@@ -23,6 +25,7 @@ CREATE TABLE categories (
     name VARCHAR(100) NOT NULL,
     description TEXT,
     parent_id INTEGER REFERENCES categories(id) ON DELETE CASCADE,
+    path VARCHAR(255),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
@@ -31,6 +34,7 @@ CREATE TABLE topics (
     id SERIAL PRIMARY KEY,
     title VARCHAR(200) NOT NULL,
     category VARCHAR(100),
+    category_id INTEGER REFERENCES categories(id),
     content TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
@@ -41,6 +45,7 @@ CREATE TABLE topic_versions (
     id SERIAL PRIMARY KEY,
     topic_id INTEGER REFERENCES topics(id) ON DELETE CASCADE,
     content TEXT,
+    delta TEXT,
     version INTEGER,
     changed_by VARCHAR(100),
     change_reason TEXT,
@@ -71,10 +76,32 @@ CREATE TABLE exam_history (
     score FLOAT
 );
 
+-- Exam frequency aggregates (maintained by the API on every exam_history write)
+CREATE TABLE topic_exam_stats (
+    topic_id INTEGER PRIMARY KEY REFERENCES topics(id) ON DELETE CASCADE,
+    exam_count INTEGER NOT NULL DEFAULT 0,
+    score_count INTEGER NOT NULL DEFAULT 0,
+    score_sum FLOAT NOT NULL DEFAULT 0,
+    last_round VARCHAR(50),
+    last_round_number INTEGER,
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE TABLE category_exam_stats (
+    category_id INTEGER PRIMARY KEY REFERENCES categories(id) ON DELETE CASCADE,
+    topic_count INTEGER NOT NULL DEFAULT 0,
+    exam_count INTEGER NOT NULL DEFAULT 0,
+    score_count INTEGER NOT NULL DEFAULT 0,
+    score_sum FLOAT NOT NULL DEFAULT 0,
+    last_round VARCHAR(50),
+    last_round_number INTEGER,
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
 -- Assignments
 CREATE TABLE assignments (
     id SERIAL PRIMARY KEY,
-    type VARCHAR(20) CHECK (type IN ('목차과제', '셀프테스트')),
+    type VARCHAR(20) CHECK (type IN ('OUTLINE', 'SELF_TEST')),  -- models.AssignmentType names
     title VARCHAR(200),
     description TEXT,
     due_date TIMESTAMP,
@@ -87,6 +114,9 @@ CREATE TABLE submissions (
     assignment_id INTEGER REFERENCES assignments(id) ON DELETE CASCADE,
     user_id VARCHAR(100),
     file_path VARCHAR(500),
+    sha256 VARCHAR(64),
+    file_size INTEGER,
+    original_filename VARCHAR(255),
     submitted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     score FLOAT,
     feedback TEXT
@@ -108,7 +138,8 @@ CREATE TABLE weekly_exams (
     id SERIAL PRIMARY KEY,
     week_number INTEGER NOT NULL,
     category_id INTEGER REFERENCES categories(id) ON DELETE SET NULL,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
 -- Exam questions
@@ -118,23 +149,37 @@ CREATE TABLE exam_questions (
     session INTEGER NOT NULL,
     question_number INTEGER NOT NULL,
     question_text TEXT NOT NULL,
-    question_type VARCHAR(20) NOT NULL CHECK (question_type IN ('서론', '본론', '결론', '단답', '약술')),
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    question_type VARCHAR(20) NOT NULL CHECK (question_type IN ('SHORT_ANSWER', 'ESSAY')),  -- models.QuestionType names
+    topic_id INTEGER REFERENCES topics(id) ON DELETE SET NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
 -- Create indexes for better performance
 CREATE INDEX idx_topics_category ON topics(category);
 CREATE INDEX idx_topics_title ON topics(title);
+CREATE INDEX ix_topics_updated_at_id ON topics(updated_at, id);
+CREATE INDEX ix_topics_category_id_pk ON topics(category_id, id);
+CREATE INDEX ix_topics_modified_at_id ON topics((COALESCE(updated_at, created_at)), id);
+CREATE INDEX ix_topics_category_id_modified_at_id ON topics(category_id, (COALESCE(updated_at, created_at)), id);
 CREATE INDEX idx_topic_versions_topic_id ON topic_versions(topic_id);
+CREATE INDEX ix_topic_versions_topic_id_version ON topic_versions(topic_id, version);
 CREATE INDEX idx_keywords_topic_id ON keywords(topic_id);
 CREATE INDEX idx_keywords_keyword ON keywords(keyword);
 CREATE INDEX idx_mnemonics_topic_id ON mnemonics(topic_id);
 CREATE INDEX idx_mnemonics_mnemonic ON mnemonics(mnemonic);
 CREATE INDEX idx_exam_history_topic_id ON exam_history(topic_id);
+CREATE INDEX ix_topic_exam_stats_exam_count_topic_id ON topic_exam_stats(exam_count, topic_id);
+CREATE INDEX ix_topic_exam_stats_updated_at ON topic_exam_stats(updated_at);
 CREATE INDEX idx_submissions_assignment_id ON submissions(assignment_id);
+CREATE UNIQUE INDEX uq_submissions_assignment_id_user_id ON submissions(assignment_id, user_id);
+CREATE INDEX ix_submissions_sha256 ON submissions(sha256);
 CREATE INDEX idx_categories_parent_id ON categories(parent_id);
+CREATE INDEX ix_categories_path ON categories(path text_pattern_ops);
 CREATE INDEX idx_weekly_exams_category_id ON weekly_exams(category_id);
+CREATE INDEX ix_weekly_exams_week_number ON weekly_exams(week_number);
 CREATE INDEX idx_exam_questions_weekly_exam_id ON exam_questions(weekly_exam_id);
+CREATE INDEX ix_exam_questions_topic_id ON exam_questions(topic_id);
 
 -- Create updated_at trigger function
 CREATE OR REPLACE FUNCTION update_updated_at_column()
@@ -152,6 +197,12 @@ CREATE TRIGGER update_topics_updated_at BEFORE UPDATE ON topics
 CREATE TRIGGER update_templates_updated_at BEFORE UPDATE ON templates
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
+CREATE TRIGGER update_weekly_exams_updated_at BEFORE UPDATE ON weekly_exams
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+CREATE TRIGGER update_exam_questions_updated_at BEFORE UPDATE ON exam_questions
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
 -- Row Level Security (RLS) - Optional but recommended for Supabase
 -- Enable RLS on all tables
 ALTER TABLE topics ENABLE ROW LEVEL SECURITY;
@@ -159,6 +210,8 @@ ALTER TABLE topic_versions ENABLE ROW LEVEL SECURITY;
 ALTER TABLE keywords ENABLE ROW LEVEL SECURITY;
 ALTER TABLE mnemonics ENABLE ROW LEVEL SECURITY;
 ALTER TABLE exam_history ENABLE ROW LEVEL SECURITY;
+ALTER TABLE topic_exam_stats ENABLE ROW LEVEL SECURITY;
+ALTER TABLE category_exam_stats ENABLE ROW LEVEL SECURITY;
 ALTER TABLE assignments ENABLE ROW LEVEL SECURITY;
 ALTER TABLE submissions ENABLE ROW LEVEL SECURITY;
 ALTER TABLE categories ENABLE ROW LEVEL SECURITY;
@@ -183,6 +236,12 @@ CREATE POLICY "Enable all for authenticated users" ON mnemonics
 CREATE POLICY "Enable all for authenticated users" ON exam_history
     FOR ALL USING (true);
 
+CREATE POLICY "Enable all for authenticated users" ON topic_exam_stats
+    FOR ALL USING (true);
+
+CREATE POLICY "Enable all for authenticated users" ON category_exam_stats
+    FOR ALL USING (true);
+
 CREATE POLICY "Enable all for authenticated users" ON assignments
     FOR ALL USING (true);
 
@@ -257,6 +316,8 @@ COMMENT ON TABLE topic_versions IS '토픽 버전 이력 관리';
 COMMENT ON TABLE keywords IS '검색용 키워드';
 COMMENT ON TABLE mnemonics IS '암기법 관리';
 COMMENT ON TABLE exam_history IS '출제 이력';
+COMMENT ON TABLE topic_exam_stats IS '토픽별 출제 빈도 집계';
+COMMENT ON TABLE category_exam_stats IS '카테고리별 출제 빈도 집계';
 COMMENT ON TABLE assignments IS '과제 관리';
 COMMENT ON TABLE submissions IS '과제 제출';
 COMMENT ON TABLE categories IS '카테고리 관리';